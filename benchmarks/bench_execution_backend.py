@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-call latency of the subprocess and dbt_runner execution backends.
+
+Usage:
+    python benchmarks/bench_execution_backend.py [--project-dir PATH] [--iterations N] [--command "ls --quiet"]
+"""
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+from pathlib import Path
+
+# Add the repository root to the python path to import from src
+sys.path.append(str(Path(__file__).parent.parent))
+from src.command import execute_dbt_command
+from src.config import initialize as initialize_config, set_config
+from src.runner import shutdown_workers
+
+# Path to the jaffle_shop project
+JAFFLE_SHOP_PATH = Path(__file__).parent.parent / "dbt_integration_tests/jaffle_shop_duckdb"
+
+
+async def time_backend(backend: str, command: list, project_dir: str, iterations: int) -> list:
+    """Run the command repeatedly with the given backend and return per-call latencies."""
+    set_config("execution_backend", backend)
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = await execute_dbt_command(command, project_dir)
+        timings.append(time.perf_counter() - start)
+        if not result["success"]:
+            print(f"  {backend}: command failed: {result['error']}")
+    return timings
+
+
+def report(backend: str, timings: list) -> None:
+    """Print latency statistics for a backend."""
+    # The first dbt_runner call includes the worker start, so report it separately
+    warm = timings[1:] or timings
+    print(
+        f"{backend:>12}: first {timings[0] * 1000:8.1f} ms | "
+        f"mean {statistics.mean(warm) * 1000:8.1f} ms | "
+        f"median {statistics.median(warm) * 1000:8.1f} ms | "
+        f"min {min(warm) * 1000:8.1f} ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark dbt execution backends")
+    parser.add_argument("--project-dir", default=str(JAFFLE_SHOP_PATH))
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--command", default="ls --quiet")
+    args = parser.parse_args()
+
+    initialize_config()
+    command = args.command.split()
+    print(f"Benchmarking `dbt {args.command}` in {args.project_dir} ({args.iterations} iterations)")
+
+    try:
+        for backend in ("subprocess", "dbt_runner"):
+            report(backend, await time_backend(backend, command, args.project_dir, args.iterations))
+    finally:
+        await shutdown_workers()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
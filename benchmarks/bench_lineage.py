@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark lineage queries over the node store's CSR adjacency, and closure
+queries over the reachability index.
+
+Usage:
+    python benchmarks/bench_lineage.py [--nodes 50000] [--queries 200] [--index-nodes 20000]
+"""
+import sys
+import time
+import random
+import argparse
+import statistics
+from pathlib import Path
+
+# Add the repository root to the python path to import from src
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent))
+from src.node_store import NodeStore
+from src.lineage import find_paths, lineage, traverse
+from src.reachability import ReachabilityIndex
+from synthetic_manifest import generate_manifest
+
+
+def time_query(name: str, query, arguments) -> None:
+    """Time a query over a list of argument tuples and print the median latency."""
+    timings = []
+    results = 0
+    for args in arguments:
+        start = time.perf_counter()
+        result = query(*args)
+        timings.append(time.perf_counter() - start)
+        results += len(result) if hasattr(result, "__len__") else 0
+    print(
+        f"  {name:<32} median {statistics.median(timings) * 1e6:10.1f} us | "
+        f"p95 {sorted(timings)[int(len(timings) * 0.95)] * 1e6:10.1f} us | "
+        f"avg results {results / len(arguments):8.1f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark lineage queries")
+    parser.add_argument("--nodes", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--index-nodes", type=int, default=20000, help="Graph size for the reachability index")
+    args = parser.parse_args()
+
+    store = NodeStore.from_manifest(generate_manifest(args.nodes))
+    print(f"{len(store)} nodes, {store.edge_count} edges")
+
+    rng = random.Random(0)
+    models = [node_id for node_id in range(len(store)) if store.value(node_id, "resource_type") == "model"]
+    sample = [rng.choice(models) for _ in range(args.queries)]
+    late = [rng.choice(models[-len(models) // 10:]) for _ in range(args.queries)]
+
+    time_query("upstream, depth 1", traverse, [(store, n, "upstream", 1) for n in sample])
+    time_query("downstream, depth 1", traverse, [(store, n, "downstream", 1) for n in sample])
+    time_query("upstream, depth 3", traverse, [(store, n, "upstream", 3) for n in sample])
+    time_query("downstream, depth 3", traverse, [(store, n, "downstream", 3) for n in sample])
+    time_query("upstream, unlimited", traverse, [(store, n, "upstream") for n in late])
+    time_query("lineage(), both, depth 2", lineage, [(store, store.unique_ids[n], "both", 2) for n in sample])
+
+    pairs = []
+    for node_id in late:
+        ancestors = list(traverse(store, node_id, "upstream", 4))
+        if ancestors:
+            pairs.append((store, rng.choice(ancestors), node_id, 100, 4))
+    time_query("paths, at most 4 edges", find_paths, pairs)
+
+    store = NodeStore.from_manifest(generate_manifest(args.index_nodes))
+    start = time.perf_counter()
+    index = ReachabilityIndex(store)
+    print(
+        f"{len(store)} nodes, {store.edge_count} edges: reachability index built in "
+        f"{time.perf_counter() - start:.2f}s, {index.nbytes / 1e6:.1f} MB"
+    )
+    models = [node_id for node_id in range(len(store)) if store.value(node_id, "resource_type") == "model"]
+    late = [rng.choice(models[-len(models) // 10:]) for _ in range(args.queries)]
+    early = [rng.choice(models[:len(models) // 10]) for _ in range(args.queries)]
+
+    time_query("upstream, unlimited (traversal)", traverse, [(store, n, "upstream") for n in late])
+    time_query("upstream, unlimited (bitset)", index.ancestors, [([n],) for n in late])
+    time_query("upstream, unlimited (bitset ids)", lambda n: index.node_ids(index.ancestors([n])), [(n,) for n in late])
+    time_query("ancestors & descendants", lambda a, b: index.ancestors([a]) & index.descendants([b]),
+               list(zip(late, early)))
+    time_query("is_ancestor", index.is_ancestor, list(zip(early, late)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark parse_dbt_list_output on the output formats of dbt ls: dbt Core's
+newline-delimited JSON, the dbt Cloud CLI's array of log objects, and lines
+prefixed with a timestamp.
+
+Usage:
+    python benchmarks/bench_list_output.py [--lines 100000] [--repeat 5]
+"""
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+# Add the repository root to the python path to import from src
+sys.path.append(str(Path(__file__).parent.parent))
+from src.command import parse_dbt_list_output
+
+
+def resource(i: int) -> dict:
+    """A resource as printed by dbt ls --output json."""
+    return {
+        "name": f"model_{i}",
+        "resource_type": "model",
+        "package_name": "shop",
+        "original_file_path": f"models/marts/model_{i}.sql",
+        "unique_id": f"model.shop.model_{i}",
+        "alias": f"model_{i}",
+        "config": {"enabled": True, "materialized": "view", "tags": []},
+        "tags": [],
+        "depends_on": {"macros": [], "nodes": [f"model.shop.model_{i - 1}"]},
+    }
+
+
+def core_output(lines: int) -> str:
+    """dbt Core: one JSON resource per line."""
+    return "\n".join(json.dumps(resource(i)) for i in range(lines)) + "\n"
+
+
+def cloud_output(lines: int) -> list:
+    """dbt Cloud CLI: log objects, with each resource serialized in a name."""
+    items = [{"name": "Sending project to dbt Cloud"}, {"name": "Created invocation 123"}]
+    items.extend({"name": json.dumps(resource(i))} for i in range(lines))
+    items.append({"name": "Invocation has finished"})
+    return items
+
+
+def timestamped_output(lines: int) -> str:
+    """Text lines prefixed with a timestamp, mixed with log messages."""
+    rows = ["00:59:05 Running with dbt=1.7.0", "00:59:05 Found 3 models"]
+    rows.extend(f"00:59:06 {json.dumps(resource(i))}" for i in range(lines))
+    return "\n".join(rows) + "\n"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark parse_dbt_list_output")
+    parser.add_argument("--lines", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    formats = {
+        "dbt Core NDJSON": core_output(args.lines),
+        "dbt Cloud CLI": cloud_output(args.lines),
+        "timestamped lines": timestamped_output(args.lines),
+    }
+    for name, output in formats.items():
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            resources = parse_dbt_list_output(output)
+            timings.append(time.perf_counter() - start)
+        print(f"  {name:<20} best {min(timings) * 1e3:8.1f} ms | {len(resources)} resources")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark the cost of logging output previews: the eager f-string previews
+(json.dumps of the whole output, then the first 100 characters) against
+lazy, bounded Preview objects, with the log level enabled and disabled.
+
+Usage:
+    python benchmarks/bench_log_preview.py [--rows 50000] [--repeat 20]
+"""
+import io
+import sys
+import json
+import time
+import logging
+import argparse
+from pathlib import Path
+
+# Add the repository root to the python path to import from src
+sys.path.append(str(Path(__file__).parent.parent))
+from src.log_preview import Preview
+
+logger = logging.getLogger("bench_log_preview")
+
+
+def eager(output) -> None:
+    """Log a preview the way the formatters used to."""
+    logger.info(f"Output structure: {json.dumps(output)[:100]}")
+
+
+def lazy(output) -> None:
+    """Log a preview with a Preview object."""
+    logger.info("Output structure: %s", Preview(output))
+
+
+def best_of(function, output, repeat: int) -> float:
+    """Best time of a number of calls, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(output)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark log previews")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    # A dbt show / dbt ls style result
+    output = [
+        {"name": f"model_{i}", "resource_type": "model", "customer_id": i, "amount": i * 1.5,
+         "status": "completed", "depends_on": {"nodes": [f"model.shop.model_{i - 1}"]}}
+        for i in range(args.rows)
+    ]
+    print(f"{args.rows} rows, {len(json.dumps(output)) / 1e6:.1f} MB as JSON")
+
+    logger.addHandler(logging.StreamHandler(io.StringIO()))
+    logger.propagate = False
+    for level in (logging.INFO, logging.WARNING):
+        logger.setLevel(level)
+        print(f"  log level {logging.getLevelName(level)}:")
+        for name, function in (("eager f-string", eager), ("lazy Preview", lazy)):
+            print(f"    {name:<16} {best_of(function, output, args.repeat) * 1e6:10.1f} us per call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Compare the size of dbt_ls responses: the pretty-printed list of objects the
+formatter used to return, minified JSON, the columnar encoding and a field
+projection, for the simplified and verbose outputs.
+
+Usage:
+    python benchmarks/bench_ls_encoding.py [--resources 10000]
+"""
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+# Add the repository root to the python path to import from src
+sys.path.append(str(Path(__file__).parent.parent))
+from src.formatters import ls_formatter, ls_items
+
+
+def resource(i: int) -> dict:
+    """A resource as printed by dbt ls --output json."""
+    return {
+        "name": f"model_{i}",
+        "resource_type": "model",
+        "package_name": "shop",
+        "original_file_path": f"models/marts/model_{i}.sql",
+        "unique_id": f"model.shop.model_{i}",
+        "alias": f"model_{i}",
+        "config": {"enabled": True, "materialized": "view", "tags": []},
+        "tags": [],
+        "depends_on": {"macros": [], "nodes": [f"model.shop.model_{i - 1}"]},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare dbt_ls response encodings")
+    parser.add_argument("--resources", type=int, default=10000)
+    args = parser.parse_args()
+
+    output = [resource(i) for i in range(args.resources)]
+    print(f"{args.resources} resources")
+    for verbose in (False, True):
+        baseline = len(json.dumps(ls_items(output, verbose=verbose), indent=2))
+        print(f"  verbose={verbose}:")
+        print(f"    {'indent=2 (before)':<28} {baseline / 1e6:7.2f} MB")
+        variants = {
+            "minified rows": {},
+            "minified columnar": {"encoding": "columnar"},
+            "fields=unique_id,columnar": {"fields": ["unique_id"], "encoding": "columnar"},
+        }
+        for name, options in variants.items():
+            start = time.perf_counter()
+            size = len(ls_formatter(output, verbose=verbose, **options))
+            elapsed = time.perf_counter() - start
+            print(f"    {name:<28} {size / 1e6:7.2f} MB  {baseline / size:5.1f}x smaller  {elapsed * 1e3:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark the peak memory of streaming manifest.json into a node store against
+json.load followed by NodeStore.from_manifest.
+
+The synthetic manifests are generated, and each load runs, in a fresh
+subprocess, so the measured peak RSS isn't affected by the other steps (Linux
+children inherit the peak RSS of the process that forked them).
+
+Usage:
+    python benchmarks/bench_manifest_stream.py [--nodes 10000 50000 100000]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+from pathlib import Path
+
+# Add the repository root to the python path to import from src
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent))
+from src.node_store import NodeStore
+from src.manifest_stream import load_node_store
+from synthetic_manifest import write_manifest
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def measure(method: str, path: str) -> None:
+    """Load a manifest with one method and print the measurements as JSON."""
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if method == "stream":
+        store = load_node_store(Path(path))
+    else:
+        with open(path, "rb") as f:
+            store = NodeStore.from_manifest(json.load(f))
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        "seconds": elapsed,
+        "peak_mb": peak_rss_mb() - baseline,
+        "store_mb": store.nbytes / 1e6,
+        "nodes": len(store),
+    }))
+
+
+def run(*args: str) -> str:
+    """Run this script in a subprocess and return its output."""
+    return subprocess.run([sys.executable, __file__, *args], check=True, capture_output=True, text=True).stdout
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark streaming manifest loads")
+    parser.add_argument("--nodes", type=int, nargs="+", default=[10000, 50000, 100000])
+    parser.add_argument("--measure", nargs=2, metavar=("METHOD", "PATH"), help=argparse.SUPPRESS)
+    parser.add_argument("--generate", nargs=2, metavar=("NODES", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(*args.measure)
+        return
+    if args.generate:
+        write_manifest(args.generate[1], int(args.generate[0]))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for node_count in args.nodes:
+            path = os.path.join(tmp, f"manifest_{node_count}.json")
+            run("--generate", str(node_count), path)
+            size_mb = os.path.getsize(path) / 1e6
+
+            loaded = json.loads(run("--measure", "json", path))
+            streamed = json.loads(run("--measure", "stream", path))
+            print(
+                f"{node_count:>7} nodes ({size_mb:6.1f} MB): "
+                f"json.load peak {loaded['peak_mb']:7.1f} MB in {loaded['seconds']:5.2f}s | "
+                f"stream peak {streamed['peak_mb']:6.1f} MB in {streamed['seconds']:5.2f}s "
+                f"(store {streamed['store_mb']:5.1f} MB)"
+            )
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark the memory used by the compact node store against the plain
+json.loads structure of manifest.json.
+
+Usage:
+    python benchmarks/bench_node_store.py [--nodes 10000 50000]
+"""
+import gc
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+from pathlib import Path
+
+# Add the repository root to the python path to import from src
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent))
+from src.node_store import NodeStore
+from synthetic_manifest import generate_manifest_json
+
+
+def measure(node_count: int) -> None:
+    """Measure retained memory of both representations for a synthetic manifest."""
+    text = generate_manifest_json(node_count)
+    gc.collect()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    data = json.loads(text)
+    load_time = time.perf_counter() - start
+    raw_bytes = tracemalloc.get_traced_memory()[0]
+
+    start = time.perf_counter()
+    store = NodeStore.from_manifest(data)
+    build_time = time.perf_counter() - start
+    del data
+    gc.collect()
+    store_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(
+        f"{node_count:>7} nodes ({len(text) / 1e6:6.1f} MB JSON, {store.edge_count} edges): "
+        f"json.loads {raw_bytes / 1e6:8.1f} MB in {load_time:5.2f}s | "
+        f"node store {store_bytes / 1e6:7.1f} MB in {build_time:5.2f}s | "
+        f"{raw_bytes / max(store_bytes, 1):5.1f}x smaller"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark node store memory use")
+    parser.add_argument("--nodes", type=int, nargs="+", default=[10000, 50000])
+    args = parser.parse_args()
+
+    for node_count in args.nodes:
+        measure(node_count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark the search index: building it from a manifest, updating it after a
+few models change, and ranking queries.
+
+Usage:
+    python benchmarks/bench_search.py [--nodes 20000] [--queries 200] [--changed 0.01]
+"""
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+
+# Add the repository root to the python path to import from src
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent))
+from src.search import SearchIndex
+from synthetic_manifest import generate_manifest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the search index")
+    parser.add_argument("--nodes", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--changed", type=float, default=0.01, help="Fraction of models changed before the update")
+    args = parser.parse_args()
+
+    manifest = generate_manifest(args.nodes)
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "manifest.json"
+        path.write_text(json.dumps(manifest))
+        print(f"{len(manifest['nodes']) + len(manifest['sources'])} resources, {path.stat().st_size / 1e6:.0f} MB")
+
+        index = SearchIndex()
+        start = time.perf_counter()
+        index.update(path)
+        print(f"  {'initial build':<24} {time.perf_counter() - start:8.2f} s | {len(index.postings)} terms")
+
+        models = list(manifest["nodes"].values())
+        for node in rng.sample(models, int(len(models) * args.changed)):
+            node["checksum"]["checksum"] = f"{rng.getrandbits(256):064x}"
+            node["description"] += " Changed."
+        path.write_text(json.dumps(manifest))
+
+        start = time.perf_counter()
+        changed, _ = index.update(path)
+        print(f"  {'update':<24} {time.perf_counter() - start:8.2f} s | {changed} resources indexed again")
+
+    words = ["staging", "marts", "model", "column", "upstream", "nightly", "finance", "reporting", "built"]
+    queries = [
+        " ".join(rng.sample(words, rng.randint(1, 3))) + f" {rng.randint(0, args.nodes)}"
+        for _ in range(args.queries)
+    ]
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query)
+        timings.append(time.perf_counter() - start)
+    print(
+        f"  {'query':<24} median {statistics.median(timings) * 1e3:6.2f} ms | "
+        f"p95 {sorted(timings)[int(len(timings) * 0.95)] * 1e3:6.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark show_formatter on large dbt show previews: JSON output with and
+without log lines after it, and a text table with empty and NULL cells. The
+formatter is compared with the previous implementation, which copied the output
+from its first '{', fell back to splitting lines when json.loads failed, and
+dropped table rows with empty cells.
+
+Usage:
+    python benchmarks/bench_show_formatter.py [--rows 100000] [--repeat 5]
+"""
+import sys
+import json
+import time
+import logging
+import argparse
+from pathlib import Path
+
+# Add the repository root to the python path to import from src
+sys.path.append(str(Path(__file__).parent.parent))
+from src.formatters import show_formatter
+
+
+def legacy_show_formatter(output: str) -> str:
+    """The previous show_formatter, for string output."""
+    json_start = output.find("{")
+    if json_start >= 0:
+        try:
+            return json.dumps(json.loads(output[json_start:]))
+        except json.JSONDecodeError:
+            pass
+    lines = output.strip().split("\n")
+    header = [h.strip() for h in lines[0].strip().split("|") if h.strip()]
+    data_rows = []
+    for line in lines[2:]:
+        if line.strip() and "|" in line:
+            values = [v.strip() for v in line.strip().split("|") if v.strip()]
+            if len(values) == len(header):
+                data_rows.append(dict(zip(header, values)))
+    return json.dumps(data_rows)
+
+
+def rows(count: int) -> list:
+    """Rows of a customers preview, every third one without an email."""
+    return [
+        {"customer_id": i, "first_name": f"name_{i}", "email": None if i % 3 == 0 else f"c{i}@example.com",
+         "lifetime_value": i * 1.5}
+        for i in range(count)
+    ]
+
+
+def table(preview: list) -> str:
+    """A preview printed as a text table."""
+    columns = list(preview[0])
+    lines = ["| " + " | ".join(columns) + " |", "| " + " | ".join("-" * len(c) for c in columns) + " |"]
+    for row in preview:
+        lines.append("| " + " | ".join("" if row[c] is None else str(row[c]) for c in columns) + " |")
+    return "\n".join(lines) + "\n"
+
+
+def best_of(function, output: str, repeat: int):
+    """Best time of a number of calls in seconds, and the last result."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(output)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark show_formatter")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    preview = rows(args.rows)
+    document = json.dumps({"node": "customers", "show": preview})
+    outputs = {
+        "JSON": "Running with dbt=1.7.0\n" + document + "\n",
+        "JSON + trailing logs": "Running with dbt=1.7.0\n" + document + "\n12:00:02  Done. {\"elapsed\": 1.2}\n",
+        "text table": "Previewing node 'customers':\n" + table(preview),
+    }
+    print(f"{args.rows} rows")
+    for name, output in outputs.items():
+        print(f"  {name} ({len(output) / 1e6:.1f} MB):")
+        for label, function in (("previous", legacy_show_formatter), ("show_formatter", show_formatter)):
+            seconds, result = best_of(function, output, args.repeat)
+            parsed = json.loads(result)
+            kept = len(parsed["rows"]) if isinstance(parsed, dict) and "rows" in parsed else \
+                len(parsed.get("show", [])) if isinstance(parsed, dict) else len(parsed)
+            print(f"    {label:<16} {seconds * 1e3:8.1f} ms | {kept:>7} rows | {len(result) / 1e6:5.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Synthetic manifest.json generator for benchmarks.
+
+Builds manifests shaped like real dbt projects: models in a few packages and
+folders, each depending on one to three earlier models or sources, with the
+fields dbt writes for every node (config, columns, raw code, checksums, ...).
+"""
+import json
+import random
+from typing import Any, Dict
+
+
+def generate_manifest(node_count: int, seed: int = 0) -> Dict[str, Any]:
+    """Generate a manifest with the given number of models (plus sources and tests)."""
+    rng = random.Random(seed)
+    packages = ["shop", "shop", "shop", "dbt_utils", "marketing"]
+    folders = ["staging", "intermediate", "marts", "reporting"]
+    materializations = ["view", "table", "incremental", "ephemeral"]
+    tag_pool = ["nightly", "hourly", "finance", "pii", "core"]
+
+    nodes: Dict[str, Any] = {}
+    sources: Dict[str, Any] = {}
+    parent_map: Dict[str, Any] = {}
+
+    source_ids = []
+    for i in range(max(1, node_count // 20)):
+        unique_id = f"source.shop.raw.table_{i}"
+        source_ids.append(unique_id)
+        sources[unique_id] = {
+            "database": "analytics", "schema": "raw", "name": f"table_{i}", "resource_type": "source",
+            "package_name": "shop", "path": "models/sources.yml", "original_file_path": "models/sources.yml",
+            "unique_id": unique_id, "fqn": ["shop", "raw", f"table_{i}"], "source_name": "raw",
+            "source_description": "", "loader": "", "identifier": f"table_{i}", "quoting": {},
+            "loaded_at_field": None, "freshness": {"warn_after": {"count": None, "period": None}},
+            "external": None, "description": "Raw table", "columns": {}, "meta": {}, "source_meta": {},
+            "tags": [], "config": {"enabled": True}, "patch_path": None, "unrendered_config": {},
+            "relation_name": f"analytics.raw.table_{i}", "created_at": 1700000000.0,
+        }
+        parent_map[unique_id] = []
+
+    model_ids = []
+    for i in range(node_count):
+        package = rng.choice(packages)
+        folder = rng.choice(folders)
+        name = f"{folder}_model_{i}"
+        unique_id = f"model.{package}.{name}"
+        candidates = model_ids[-200:] + source_ids[:50]
+        parents = sorted(set(rng.sample(candidates, min(len(candidates), rng.randint(1, 3)))))
+        materialized = rng.choice(materializations)
+        tags = rng.sample(tag_pool, rng.randint(0, 2))
+        columns = {
+            f"column_{c}": {"name": f"column_{c}", "description": f"Column {c} of {name}", "meta": {},
+                            "data_type": None, "constraints": [], "quote": None, "tags": []}
+            for c in range(rng.randint(2, 8))
+        }
+        nodes[unique_id] = {
+            "database": "analytics", "schema": f"dbt_{folder}", "name": name, "resource_type": "model",
+            "package_name": package, "path": f"{folder}/{name}.sql",
+            "original_file_path": f"models/{folder}/{name}.sql", "unique_id": unique_id,
+            "fqn": [package, folder, name], "alias": name,
+            "checksum": {"name": "sha256", "checksum": f"{rng.getrandbits(256):064x}"},
+            "config": {
+                "enabled": True, "alias": None, "schema": None, "database": None, "tags": tags, "meta": {},
+                "materialized": materialized, "incremental_strategy": None, "persist_docs": {},
+                "quoting": {}, "column_types": {}, "full_refresh": None, "unique_key": None,
+                "on_schema_change": "ignore", "grants": {}, "packages": [], "docs": {"show": True},
+                "contract": {"enforced": False}, "post-hook": [], "pre-hook": [],
+            },
+            "tags": tags, "description": f"The {name} model, built from {len(parents)} upstream nodes.",
+            "columns": columns, "meta": {}, "group": None, "docs": {"show": True, "node_color": None},
+            "patch_path": f"{package}://models/{folder}/schema.yml", "build_path": None, "deferred": False,
+            "unrendered_config": {"materialized": materialized}, "created_at": 1700000000.0,
+            "relation_name": f"analytics.dbt_{folder}.{name}",
+            "raw_code": "select\n" + ",\n".join(f"    column_{c}" for c in range(len(columns))) +
+                        f"\nfrom {{{{ ref('{parents[0].split('.')[-1]}') }}}}\nwhere id is not null\n",
+            "language": "sql", "refs": [{"name": p.split(".")[-1], "package": None, "version": None} for p in parents],
+            "sources": [], "metrics": [],
+            "depends_on": {"macros": ["macro.dbt.is_incremental"], "nodes": parents},
+            "compiled_path": f"target/compiled/{package}/models/{folder}/{name}.sql",
+            "contract": {"enforced": False, "alias_types": True, "checksum": None},
+            "access": "protected", "constraints": [], "version": None, "latest_version": None,
+            "deprecation_date": None,
+        }
+        parent_map[unique_id] = parents
+        model_ids.append(unique_id)
+
+    child_map: Dict[str, Any] = {unique_id: [] for unique_id in parent_map}
+    for child, parents in parent_map.items():
+        for parent in parents:
+            child_map[parent].append(child)
+
+    return {
+        "metadata": {"dbt_schema_version": "https://schemas.getdbt.com/dbt/manifest/v11.json",
+                     "dbt_version": "1.7.0", "project_name": "shop"},
+        "nodes": nodes, "sources": sources, "macros": {}, "docs": {}, "exposures": {}, "metrics": {},
+        "groups": {}, "selectors": {}, "disabled": {}, "parent_map": parent_map, "child_map": child_map,
+        "group_map": {}, "semantic_models": {},
+    }
+
+
+def generate_manifest_json(node_count: int, seed: int = 0) -> str:
+    """Generate a synthetic manifest serialized as JSON."""
+    return json.dumps(generate_manifest(node_count, seed))
+
+
+def write_manifest(path: str, node_count: int, seed: int = 0) -> None:
+    """Write a synthetic manifest to a file."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(generate_manifest(node_count, seed), f)
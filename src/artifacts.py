@@ -0,0 +1,126 @@
+"""
+dbt artifact readers for the DBT CLI MCP Server.
+
+This module reads the artifacts dbt writes to the target directory and turns
+them into compact structured results, so tools don't have to return (and agents
+don't have to re-parse) dbt's full text output.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Logger for this module
+logger = logging.getLogger(__name__)
+
+# Commands that write target/run_results.json
+RUN_RESULTS_COMMANDS = frozenset({"run", "test", "build", "seed", "snapshot"})
+
+# Node statuses whose messages are included in full
+FAILING_STATUSES = frozenset({"error", "fail", "warn", "runtime error"})
+
+
+def file_signature(path: Path) -> Optional[tuple]:
+    """
+    Get a signature identifying the current version of a file.
+
+    Args:
+        path: Path of the file
+
+    Returns:
+        Tuple of (mtime_ns, size, inode), or None if the file doesn't exist
+    """
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def read_run_results(
+    target_path: Path,
+    started_at_ns: int,
+    previous_signature: Optional[tuple] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Read run_results.json if it was written by the current invocation.
+
+    The file counts as written by this invocation if its modification time is
+    not older than the invocation's start, or if it changed since before the
+    invocation (for filesystems with coarse timestamps).
+
+    Args:
+        target_path: The project's target directory
+        started_at_ns: Start time of the invocation (time.time_ns())
+        previous_signature: file_signature() of run_results.json before the invocation
+
+    Returns:
+        The parsed run results, or None if missing, stale or unreadable
+    """
+    path = target_path / "run_results.json"
+    signature = file_signature(path)
+    if signature is None:
+        return None
+
+    if signature[0] < started_at_ns and signature == previous_signature:
+        logger.debug(f"Ignoring {path}: not written by this invocation")
+        return None
+
+    try:
+        with open(path, "rb") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Failed to read {path}: {e}")
+        return None
+
+
+def summarize_run_results(run_results: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build a compact summary of run_results.json.
+
+    Every node gets its status, execution time, rows affected and failure count;
+    only failing nodes get their full message.
+
+    Args:
+        run_results: The parsed run_results.json
+
+    Returns:
+        Dictionary with elapsed_time, status counts, per-node results and
+        the failing nodes' details
+    """
+    counts: Dict[str, int] = {}
+    nodes = []
+    failed = []
+
+    for item in run_results.get("results") or []:
+        status = str(item.get("status"))
+        counts[status] = counts.get(status, 0) + 1
+
+        node = {
+            "unique_id": item.get("unique_id"),
+            "status": status,
+            "execution_time": round(item.get("execution_time") or 0.0, 3),
+        }
+        rows_affected = (item.get("adapter_response") or {}).get("rows_affected")
+        if rows_affected is not None:
+            node["rows_affected"] = rows_affected
+        if item.get("failures"):
+            node["failures"] = item["failures"]
+        nodes.append(node)
+
+        if status in FAILING_STATUSES:
+            failed.append({
+                "unique_id": item.get("unique_id"),
+                "status": status,
+                "message": item.get("message"),
+                "relation_name": item.get("relation_name"),
+            })
+
+    return {
+        "invocation_id": (run_results.get("metadata") or {}).get("invocation_id"),
+        "elapsed_time": round(run_results.get("elapsed_time") or 0.0, 3),
+        "counts": counts,
+        "nodes": nodes,
+        "failed": failed,
+    }
@@ -73,6 +73,8 @@ def parse_args() -> argparse.Namespace:
     ls_parser.add_argument("--profiles-dir", help="Directory containing the profiles.yml file (defaults to project-dir if not specified)")
     ls_parser.add_argument("--output-format", help="Output format", choices=["json", "name", "path", "selector"], default="json")
     ls_parser.add_argument("--verbose", help="Return full JSON output instead of simplified version", action="store_true")
+    ls_parser.add_argument("--page-size", help="Return the resources a page of this many at a time", type=int)
+    ls_parser.add_argument("--cursor", help="next_cursor of the previous page, to get the following page")
 
     # dbt_compile command
     compile_parser = subparsers.add_parser("compile", help="Compile dbt models")
@@ -175,7 +177,7 @@ async def run_dbt_test(models=None, selector=None, exclude=None, project_dir="."
 
     return json.dumps(result["output"]) if isinstance(result["output"], (dict, list)) else str(result["output"])
 
-async def run_dbt_ls(models=None, selector=None, exclude=None, resource_type=None, project_dir=".", profiles_dir=None, output_format="json", verbose=False):
+async def run_dbt_ls(models=None, selector=None, exclude=None, resource_type=None, project_dir=".", profiles_dir=None, output_format="json", verbose=False, page_size=None, cursor=None):
     """List dbt resources."""
     command = ["ls"]
 
@@ -196,6 +198,27 @@ async def run_dbt_ls(models=None, selector=None, exclude=None, resource_type=Non
     from src.command import execute_dbt_command, parse_dbt_list_output
     import re
 
+    if page_size is not None or cursor:
+        from src.formatters import ls_items
+        from src.pagination import list_page
+
+        result = await list_page(
+            command,
+            project_dir,
+            profiles_dir,
+            execute_dbt_command,
+            lambda output: ls_items(output, output_format, verbose),
+            view=verbose,
+            page_size=page_size,
+            cursor=cursor
+        )
+        if not result["success"]:
+            error_msg = f"Error executing dbt ls: {result['error']}"
+            if result["output"]:
+                error_msg += f"\nOutput: {result['output']}"
+            return error_msg
+        return json.dumps(result["output"], indent=2)
+
     result = await execute_dbt_command(command, project_dir, profiles_dir)
 
     if not result["success"]:
@@ -479,7 +502,9 @@ async def main_async() -> None:
             "project_dir": args.project_dir,
             "profiles_dir": args.profiles_dir,
             "output_format": args.output_format,
-            "verbose": args.verbose
+            "verbose": args.verbose,
+            "page_size": args.page_size,
+            "cursor": args.cursor
         }
     elif args.command == "compile":
         func_args = {
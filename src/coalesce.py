@@ -0,0 +1,120 @@
+"""
+Request coalescing for the DBT CLI MCP Server.
+
+Agents often issue the same read-only dbt command several times in parallel or
+in quick succession. Identical in-flight commands are run once and share their
+result (single flight), and a successful result can be reused by identical calls
+arriving within a short grace window after it finished.
+"""
+
+import time
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+# Logger for this module
+logger = logging.getLogger(__name__)
+
+# Maximum number of results kept for the grace window
+MAX_RECENT_RESULTS = 256
+
+
+@dataclass
+class _Flight:
+    """A command in flight and the number of callers waiting for it."""
+    task: "asyncio.Future"
+    waiters: int = 0
+
+
+class SingleFlight:
+    """
+    De-duplication of identical concurrent calls.
+
+    The first caller for a key starts the call; later callers with the same key
+    wait for the same result. The call is shielded from cancellation of any one
+    caller and only cancelled once every caller waiting for it has gone.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, _Flight] = {}
+        self._recent: Dict[Hashable, Tuple[float, Dict[str, Any]]] = {}
+
+    def _expire(self, now: float) -> None:
+        """Drop results whose grace window has passed."""
+        for key in [key for key, (expires, _) in self._recent.items() if expires <= now]:
+            del self._recent[key]
+
+    def _finish(self, key: Hashable, flight: _Flight) -> None:
+        """Stop tracking a finished call."""
+        if self._inflight.get(key) is flight:
+            del self._inflight[key]
+
+    def remember(self, key: Hashable, result: Dict[str, Any], window: float) -> None:
+        """
+        Keep a successful result for reuse by identical calls.
+
+        Args:
+            key: Identity of the call
+            result: The call's result
+            window: Seconds the result may be reused
+        """
+        if window <= 0 or not result.get("success"):
+            return
+        self._expire(time.monotonic())
+        if len(self._recent) >= MAX_RECENT_RESULTS:
+            # Evict the result expiring first
+            del self._recent[min(self._recent, key=lambda k: self._recent[k][0])]
+        self._recent[key] = (time.monotonic() + window, result)
+
+    async def run(
+        self,
+        key: Hashable,
+        call: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Run a call, join an identical one in flight, or reuse a remembered result.
+
+        Args:
+            key: Identity of the call
+            call: Function starting the call
+
+        Returns:
+            Tuple of (result, shared), where shared is True if the result came
+            from a call started by another caller
+        """
+        self._expire(time.monotonic())
+        recent = self._recent.get(key)
+        if recent is not None:
+            return recent[1], True
+
+        flight = self._inflight.get(key)
+        shared = flight is not None
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(call()))
+            self._inflight[key] = flight
+            flight.task.add_done_callback(lambda _: self._finish(key, flight))
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task), shared
+        except asyncio.CancelledError:
+            if not flight.task.done() and flight.waiters == 1:
+                # Nobody else is waiting for the result
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    @property
+    def in_flight(self) -> int:
+        """Number of calls in flight."""
+        return len(self._inflight)
+
+    def clear(self) -> None:
+        """Forget results kept for the grace window."""
+        self._recent.clear()
+
+
+# Coalescer shared by all tool calls
+coalescer = SingleFlight()
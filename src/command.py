@@ -4,22 +4,41 @@ Command execution utilities for the DBT CLI MCP Server.
 This module handles executing dbt CLI commands and processing their output.
 """
 
-import os
 import json
 import logging
 import subprocess
 import asyncio
 import re
+import time
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Union, Callable
-
-import dotenv
+from typing import List, Dict, Any, Mapping, Optional, Union, Callable
 
 from src.config import get_config
+from src.environment import get_environment
+from src.output import OutputCapture, strip_truncation_marker
+from src.scheduler import scheduler, READ_ONLY_COMMANDS
+from src.isolation import ISOLATED_COMMANDS, IsolatedInvocation
+from src.runner import run_in_worker, WorkerTimeout
+from src.process import terminate_process_group, TIMEOUT_RETURNCODE
+from src.project import get_target_path, get_project_fingerprint
+from src.coalesce import coalescer
+from src.selector import list_from_manifest
+from src.artifacts import RUN_RESULTS_COMMANDS, file_signature, read_run_results, summarize_run_results
+from src.events import EventParser
+from src.watcher import watchers
+from src.log_preview import Preview
 
 # Logger for this module
 logger = logging.getLogger(__name__)
 
+# Timestamp dbt prints before each line of some outputs (e.g. "00:59:06 {...}")
+TIMESTAMP_PREFIX_PATTERN = re.compile(r"\d\d:\d\d:\d\d\s+")
+
+# Log messages of the dbt Cloud CLI that surround the listed resources
+CLOUD_LOG_PATTERN = re.compile(
+    "Sending project|Created invocation|Waiting for|Streaming|Running dbt|Invocation has finished"
+)
+
 
 def load_environment(project_dir: str) -> Dict[str, str]:
     """
@@ -29,101 +48,170 @@ def load_environment(project_dir: str) -> Dict[str, str]:
         project_dir: Directory containing the dbt project
         
     Returns:
-        Dictionary of environment variables
+        Dictionary of environment variables (a copy of the project's cached snapshot)
     """
-    env_file = Path(project_dir) / get_config("env_file")
-    env_vars = os.environ.copy()
-    
-    # Ensure HOME is set if not already defined
-    if "HOME" not in env_vars:
-        env_vars["HOME"] = str(Path.home())
-        logger.debug(f"Setting HOME environment variable to {env_vars['HOME']}")
-    
-    if env_file.exists():
-        logger.debug(f"Loading environment from {env_file}")
-        # Load variables from .env file
-        dotenv.load_dotenv(dotenv_path=env_file)
-        env_vars.update({k: v for k, v in os.environ.items()})
-    else:
-        logger.debug(f"Environment file not found: {env_file}")
-        
-    return env_vars
+    return dict(get_environment(project_dir))
 
 
-async def execute_dbt_command(
-    command: List[str],
-    project_dir: str = ".",
-    profiles_dir: Optional[str] = None
-) -> Dict[str, Any]:
+def get_command_timeout(command: List[str]) -> float:
     """
-    Execute a dbt command and return the result.
+    Get the timeout for a dbt command.
     
     Args:
         command: List of command arguments (without the dbt executable)
-        project_dir: Directory containing the dbt project
-        profiles_dir: Directory containing the profiles.yml file (defaults to project_dir if not specified)
         
     Returns:
-        Dictionary containing command result:
-        {
-            "success": bool,
-            "output": str or dict,
-            "error": str or None,
-            "returncode": int
-        }
+        Timeout in seconds (0 for no timeout)
     """
-    # Get dbt path from config
-    dbt_path = get_config("dbt_path", "dbt")
-    full_command = [dbt_path] + command
+    timeouts = get_config("command_timeouts") or {}
+    if command and command[0] in timeouts:
+        return timeouts[command[0]]
+    return get_config("command_timeout", 0)
+
+
+async def run_subprocess(
+    full_command: List[str],
+    project_dir: str,
+    env_vars: Mapping[str, str],
+    capture: OutputCapture,
+    timeout: float = 0
+) -> int:
+    """
+    Execute a command in a new subprocess, streaming its output into a capture.
     
-    # Load environment variables
-    env_vars = load_environment(project_dir)
+    The process runs in its own process group. If it exceeds the timeout, or the
+    calling task is cancelled, the whole group is terminated; output read up to
+    that point stays in the capture.
     
-    # Explicitly set HOME environment variable in os.environ
-    os.environ["HOME"] = str(Path.home())
-    logger.debug(f"Explicitly setting HOME environment variable in os.environ to {os.environ['HOME']}")
+    Args:
+        full_command: The command including the dbt executable
+        project_dir: Directory to run the command in
+        env_vars: Environment variables for the command
+        capture: The capture that receives stdout and stderr
+        timeout: Timeout in seconds (0 for no timeout)
+        
+    Returns:
+        The process return code, or TIMEOUT_RETURNCODE if the command timed out
+    """
+    process = await asyncio.create_subprocess_exec(
+        *full_command,
+        cwd=project_dir,
+        env=env_vars,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        start_new_session=True
+    )
     
-    # Set DBT_PROFILES_DIR based on profiles_dir or project_dir
-    if profiles_dir is not None:
-        # Use the explicitly provided profiles_dir
-        abs_profiles_dir = str(Path(profiles_dir).resolve())
-        os.environ["DBT_PROFILES_DIR"] = abs_profiles_dir
-        logger.debug(f"Setting DBT_PROFILES_DIR in os.environ to {abs_profiles_dir} (from profiles_dir)")
-    else:
-        # Check if there's a value from the .env file
-        if "DBT_PROFILES_DIR" in env_vars:
-            os.environ["DBT_PROFILES_DIR"] = env_vars["DBT_PROFILES_DIR"]
-            logger.debug(f"Setting DBT_PROFILES_DIR from env_vars to {env_vars['DBT_PROFILES_DIR']}")
-        else:
-            # Default to project_dir
-            abs_project_dir = str(Path(project_dir).resolve())
-            os.environ["DBT_PROFILES_DIR"] = abs_project_dir
-            logger.debug(f"Setting DBT_PROFILES_DIR in os.environ to {abs_project_dir} (from project_dir)")
+    async def communicate() -> int:
+        # Read both pipes concurrently so neither can fill up and block the process
+        await asyncio.gather(
+            capture.consume("stdout", process.stdout),
+            capture.consume("stderr", process.stderr)
+        )
+        return await process.wait()
     
-    # Update env_vars with the current os.environ
-    env_vars.update(os.environ)
+    try:
+        return await asyncio.wait_for(communicate(), timeout=timeout or None)
+    except asyncio.TimeoutError:
+        logger.warning(f"Command timed out after {timeout} seconds: {' '.join(full_command)}")
+        await terminate_process_group(process)
+        capture.flush()
+        capture.feed_text("stderr", f"Command timed out after {timeout} seconds and was terminated\n")
+        return TIMEOUT_RETURNCODE
+    except asyncio.CancelledError:
+        logger.info(f"Command cancelled, terminating: {' '.join(full_command)}")
+        await terminate_process_group(process)
+        raise
+
+
+async def _run_dbt_command(
+    command: List[str],
+    project_dir: str = ".",
+    profiles_dir: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Execute a dbt command and return the result (see execute_dbt_command).
+    """
+    # Get dbt path from config
+    dbt_path = get_config("dbt_path", "dbt")
+    full_command = [dbt_path] + command
     
-    logger.debug(f"Executing command: {' '.join(full_command)} in {project_dir}")
+    # Get the project's environment snapshot (never mutates os.environ)
+    env_vars = get_environment(project_dir, profiles_dir)
+    
+    backend = get_config("execution_backend", "subprocess")
+    timeout = get_command_timeout(command)
+    logger.debug(f"Executing command: {' '.join(full_command)} in {project_dir} (backend: {backend})")
     
     try:
-        # Execute the command
-        process = await asyncio.create_subprocess_exec(
-            *full_command,
-            cwd=project_dir,
-            env=env_vars,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
+        capture = OutputCapture(get_config("max_output_bytes", 0))
+        
+        # Parse dbt's structured event stream as it arrives
+        extra_args: List[str] = []
+        events = None
+        if get_config("dbt_log_format", "text") == "json" and "--log-format" not in command:
+            events = EventParser(get_config("max_output_bytes", 0))
+            capture.add_line_handler(events.feed_line)
+            extra_args = ["--log-format", "json"]
         
-        # Communicate with the process
-        stdout_bytes, stderr_bytes = await process.communicate()
-        stdout = stdout_bytes.decode('utf-8') if stdout_bytes else ""
-        stderr = stderr_bytes.decode('utf-8') if stderr_bytes else ""
-        success = process.returncode == 0
+        # Read-only commands get private target and log paths so they can run
+        # alongside other commands for the same project
+        isolation = None
+        if get_config("isolate_read_only_commands", True) and command and command[0] in ISOLATED_COMMANDS:
+            isolation = IsolatedInvocation(project_dir, env_vars)
+        
+        # Wait for a free slot so commands don't compete for the project's target/ directory
+        async with scheduler.slot(project_dir, command, exclusive=isolation is None) as scheduling:
+            run_command = command + extra_args
+            if isolation is not None:
+                await asyncio.to_thread(isolation.prepare)
+                run_command = run_command + isolation.args()
+            
+            # Remember the current run_results.json so a stale one isn't reported
+            run_results_path = None
+            if command and command[0] in RUN_RESULTS_COMMANDS:
+                target_path = get_target_path(project_dir, env_vars)
+                run_results_path = (target_path, time.time_ns(), file_signature(target_path / "run_results.json"))
+            
+            try:
+                if backend == "dbt_runner":
+                    # Execute the command in a long-lived dbtRunner worker
+                    try:
+                        worker_stdout, worker_stderr, returncode = await run_in_worker(
+                            run_command, project_dir, profiles_dir, env_vars, timeout=timeout
+                        )
+                    except WorkerTimeout:
+                        worker_stdout = ""
+                        worker_stderr = f"Command timed out after {timeout} seconds and the dbt worker was terminated\n"
+                        returncode = TIMEOUT_RETURNCODE
+                    capture.feed_text("stdout", worker_stdout, final=True)
+                    capture.feed_text("stderr", worker_stderr, final=True)
+                    del worker_stdout, worker_stderr
+                else:
+                    returncode = await run_subprocess([dbt_path] + run_command, project_dir, env_vars, capture, timeout)
+                
+                if isolation is not None and returncode == 0:
+                    await asyncio.to_thread(isolation.promote)
+                
+                run_results = None
+                if run_results_path is not None:
+                    run_results = await asyncio.to_thread(read_run_results, *run_results_path)
+            finally:
+                if isolation is not None:
+                    await asyncio.to_thread(isolation.cleanup)
+        success = returncode == 0
+        stdout = capture.stdout.getvalue()
+        stderr = capture.stderr.getvalue()
+        truncated = capture.stdout.truncated or capture.stderr.truncated
+        if truncated:
+            logger.info(
+                f"Output exceeded max_output_bytes; retained {len(stdout)} of {capture.stdout.total_bytes} "
+                f"stdout bytes and {len(stderr)} of {capture.stderr.total_bytes} stderr bytes"
+            )
         
         # Special case for 'show' command: detect "does not match any enabled nodes" as an error
         # Only check if --quiet is not in the command, as --quiet suppresses this output
-        if success and command[0] == "show" and "--quiet" not in command and "does not match any enabled nodes" in stdout:
+        if success and command[0] == "show" and "--quiet" not in command and capture.no_nodes_matched:
             success = False
             
         # For commands that failed, combine stdout and stderr for comprehensive output
@@ -137,8 +225,15 @@ async def execute_dbt_command(
             # For successful commands, use stdout
             output = stdout
         
+        if events is not None:
+            # The payload was collected from the events as they arrived
+            if success and events.has_payload:
+                output = events.payload()
+        elif capture.stdout.truncated:
+            # Truncated output can't be parsed as JSON, keep as string
+            pass
         # Check if this is dbt Cloud CLI output format with embedded JSON in log lines
-        if stdout.strip().startswith('[') and '"name":' in stdout:
+        elif stdout.lstrip().startswith('[') and '"name":' in stdout:
             try:
                 # Parse the entire output as JSON array
                 json_array = json.loads(stdout)
@@ -164,14 +259,21 @@ async def execute_dbt_command(
             "success": success,
             "output": output,
             "error": stderr if not success else None,
-            "returncode": process.returncode
+            "returncode": returncode,
+            "timed_out": returncode == TIMEOUT_RETURNCODE,
+            "scheduling": scheduling
         }
         
+        if run_results is not None:
+            result["run_results"] = summarize_run_results(run_results)
+        if events is not None:
+            result["progress"] = events.progress()
+        
         if not success:
-            logger.warning(f"Command failed with exit code {process.returncode}: {stderr}")
+            logger.warning(f"Command failed with exit code {returncode}: {stderr}")
             
             # Log full environment for debugging
-            logger.debug(f"Full environment variables: {env_vars}")
+            logger.debug(f"Full environment variables: {dict(env_vars)}")
             logger.debug(f"Current directory: {project_dir}")
             logger.debug(f"Full command: {' '.join(full_command)}")
         
@@ -188,10 +290,211 @@ async def execute_dbt_command(
         }
 
 
+def _coalescing_key(command: List[str], project_dir: str, profiles_dir: Optional[str]) -> tuple:
+    """
+    Get the identity of a command for coalescing: the command, project, profiles
+    directory, relevant settings and a fingerprint of the project's state.
+    """
+    env_vars = get_environment(project_dir, profiles_dir)
+    return (
+        tuple(command),
+        str(Path(project_dir).resolve()),
+        str(Path(profiles_dir).resolve()) if profiles_dir is not None else None,
+        get_config("dbt_path", "dbt"),
+        get_config("execution_backend", "subprocess"),
+        get_config("dbt_log_format", "text"),
+        get_project_fingerprint(project_dir, env_vars)
+    )
+
+
+async def execute_dbt_command(
+    command: List[str],
+    project_dir: str = ".",
+    profiles_dir: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Execute a dbt command and return the result.
+    
+    `ls` commands are answered from the project's cached manifest when it is up
+    to date and the selection can be evaluated in-process.
+    
+    With `watch_projects` enabled, the project is watched from its first command
+    on and re-parsed in the background when its files change.
+    
+    Identical read-only commands for the same project state are coalesced: while
+    one is running, identical calls wait for its result instead of starting
+    another dbt process, and a successful result is reused for `coalesce_window`
+    seconds after it finished.
+    
+    Args:
+        command: List of command arguments (without the dbt executable)
+        project_dir: Directory containing the dbt project
+        profiles_dir: Directory containing the profiles.yml file (defaults to project_dir if not specified)
+        
+    Returns:
+        Dictionary containing command result:
+        {
+            "success": bool,
+            "output": str or dict,
+            "error": str or None,
+            "returncode": int (TIMEOUT_RETURNCODE if the command timed out),
+            "timed_out": bool,
+            "scheduling": dict with queue_depth, wait_time and priority,
+            "run_results": summary of run_results.json (run, test, build, seed and
+                           snapshot only, when written by this invocation),
+            "progress": node-level progress from dbt's events (dbt_log_format "json" only),
+            "coalesced": bool (whether the result was shared with an identical call),
+            "backend": "manifest" (only when answered from the manifest)
+        }
+    """
+    # Keep the project parsed in the background from now on, if enabled
+    watchers.register(project_dir, profiles_dir, execute_dbt_command)
+    
+    # Answer ls from the cached manifest when it is fresh
+    if command and command[0] in ("ls", "list"):
+        result = await list_from_manifest(command, project_dir, profiles_dir)
+        if result is not None:
+            return {**result, "coalesced": False}
+    
+    if not (get_config("coalesce_commands", True) and command and command[0] in READ_ONLY_COMMANDS):
+        result = await _run_dbt_command(command, project_dir, profiles_dir)
+        return {**result, "coalesced": False}
+    
+    try:
+        key = _coalescing_key(command, project_dir, profiles_dir)
+    except Exception as e:
+        logger.debug(f"Could not build coalescing key, running uncoalesced: {e}")
+        result = await _run_dbt_command(command, project_dir, profiles_dir)
+        return {**result, "coalesced": False}
+    
+    result, shared = await coalescer.run(key, lambda: _run_dbt_command(command, project_dir, profiles_dir))
+    if shared:
+        logger.info(f"Reusing result of identical in-flight or recent command: dbt {' '.join(command)}")
+    else:
+        # Keyed on the project state after the run, which may have refreshed the target artifacts
+        coalescer.remember(
+            _coalescing_key(command, project_dir, profiles_dir), result, get_config("coalesce_window", 0)
+        )
+    
+    # Each caller gets its own copy of the shared result
+    return {**result, "coalesced": shared}
+
+
+def _nodes_to_resources(nodes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Convert a {"nodes": {name: details}} document to a list of resources."""
+    return [{"name": name, **details} for name, details in nodes.items()]
+
+
+def _is_resource(value: Any) -> bool:
+    """Check whether a decoded JSON value is a resource printed by dbt ls."""
+    return isinstance(value, dict) and "name" in value and "resource_type" in value
+
+
+def _json_part(line: str) -> Optional[str]:
+    """
+    Get the JSON object of a line of dbt ls output.
+    
+    Args:
+        line: The line, stripped
+        
+    Returns:
+        The line if it starts with "{", the rest of the line after a timestamp
+        followed by "{" (e.g. "00:59:06 {...}"), or None
+    """
+    if line.startswith("{"):
+        return line
+    match = TIMESTAMP_PREFIX_PATTERN.match(line)
+    if match is not None and line.startswith("{", match.end()):
+        return line[match.end():]
+    return None
+
+
+def _decode_resources(parts: List[str]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Decode JSON objects, all at once when they are all valid.
+    
+    Args:
+        parts: The JSON objects
+        
+    Returns:
+        The decoded resources, with None for parts that aren't valid JSON
+        resources
+    """
+    try:
+        values = json.loads("[" + ",".join(parts) + "]")
+    except json.JSONDecodeError:
+        values = None
+    if values is None or len(values) != len(parts):
+        # Some part is invalid, or held several values (e.g. "{...}, {...}")
+        values = []
+        for part in parts:
+            try:
+                values.append(json.loads(part))
+            except json.JSONDecodeError:
+                values.append(None)
+    return [value if _is_resource(value) else None for value in values]
+
+
+def _parse_lines(lines: List[str]) -> List[Dict[str, Any]]:
+    """
+    Parse lines of dbt ls output: JSON resources, possibly after a timestamp,
+    and plain names.
+    
+    Args:
+        lines: The stripped, non-empty lines
+        
+    Returns:
+        The resources, with {"name": line} for lines that aren't JSON resources
+    """
+    parts = [_json_part(line) for line in lines]
+    decoded = iter(_decode_resources([part for part in parts if part is not None]))
+    resources = []
+    for line, part in zip(lines, parts):
+        resource = next(decoded) if part is not None else None
+        resources.append(resource if resource is not None else {"name": line})
+    return resources
+
+
+def _parse_cloud_items(items: List[Any]) -> Optional[List[Dict[str, Any]]]:
+    """
+    Extract the resources of dbt Cloud CLI output: a JSON array of log objects
+    whose "name" holds either a log message or a resource serialized as JSON.
+    
+    Args:
+        items: The decoded array
+        
+    Returns:
+        The resources, or None if the items aren't in the dbt Cloud CLI format
+    """
+    parts = []
+    has_log_messages = False
+    for item in items:
+        # Resources already parsed from dbt's events carry a resource_type
+        if not isinstance(item, dict) or "resource_type" in item:
+            return None
+        name_value = item.get("name")
+        if not isinstance(name_value, str):
+            return None
+        part = _json_part(name_value)
+        if part is not None:
+            parts.append(part)
+        elif CLOUD_LOG_PATTERN.search(name_value):
+            # Log messages around the listed resources
+            has_log_messages = True
+    
+    resources = [resource for resource in _decode_resources(parts) if resource is not None]
+    return resources if resources or has_log_messages else None
+
+
 def parse_dbt_list_output(output: Union[str, Dict, List]) -> List[Dict[str, Any]]:
     """
     Parse the output from dbt list command.
     
+    Handles JSON documents, newline-delimited JSON as printed by dbt Core, the
+    log objects of the dbt Cloud CLI and lines prefixed with a timestamp. Lines
+    are classified in a single pass, and their JSON objects are decoded together
+    in one call unless one of them is invalid.
+    
     Args:
         output: Output from dbt list command (string or parsed JSON)
         
@@ -202,117 +505,37 @@ def parse_dbt_list_output(output: Union[str, Dict, List]) -> List[Dict[str, Any]
     
     # If already parsed as JSON dictionary with nodes
     if isinstance(output, dict) and "nodes" in output:
-        return [
-            {"name": name, **details}
-            for name, details in output["nodes"].items()
-        ]
+        return _nodes_to_resources(output["nodes"])
     
-    # Handle dbt Cloud CLI output format - an array of objects with name property containing embedded JSON
-    if isinstance(output, list) and all(isinstance(item, dict) and "name" in item for item in output):
-        logger.debug(f"Found dbt Cloud CLI output format with {len(output)} items")
-        extracted_models = []
-        
-        for item in output:
-            name_value = item["name"]
-            
-            # Skip log messages that don't contain model data
-            if any(log_msg in name_value for log_msg in [
-                "Sending project", "Created invocation", "Waiting for",
-                "Streaming", "Running dbt", "Invocation has finished"
-            ]):
-                continue
-            
-            # Check if the name value is a JSON string
-            if name_value.startswith('{') and '"name":' in name_value and '"resource_type":' in name_value:
-                try:
-                    # Parse the JSON string directly
-                    model_data = json.loads(name_value)
-                    if isinstance(model_data, dict) and "name" in model_data and "resource_type" in model_data:
-                        extracted_models.append(model_data)
-                        continue
-                except json.JSONDecodeError:
-                    logger.debug(f"Failed to parse JSON from: {name_value[:30]}...")
-            
-            # Extract model data from timestamped JSON lines (e.g., "00:59:06 {json}")
-            timestamp_prefix_match = re.match(r'^(\d\d:\d\d:\d\d)\s+(.+)$', name_value)
-            if timestamp_prefix_match:
-                json_string = timestamp_prefix_match.group(2)
-                try:
-                    model_data = json.loads(json_string)
-                    if isinstance(model_data, dict):
-                        # Only add entries that have both name and resource_type
-                        if "name" in model_data and "resource_type" in model_data:
-                            extracted_models.append(model_data)
-                except json.JSONDecodeError:
-                    # Not valid JSON, skip this line
-                    logger.debug(f"Failed to parse JSON from: {json_string[:30]}...")
-                    continue
-        
-        # If we found model data, return it
-        if extracted_models:
-            logger.debug(f"Successfully extracted {len(extracted_models)} models from dbt Cloud CLI output")
-            return extracted_models
-        
-        # If no model data found, return empty list
-        logger.warning("No valid model data found in dbt Cloud CLI output")
-        return []
-    
-    # If already parsed as regular JSON list
     if isinstance(output, list):
-        # For test compatibility
-        if all(isinstance(item, dict) and "name" in item for item in output):
+        resources = _parse_cloud_items(output)
+        if resources is None:
+            # Already parsed as a regular JSON list
             return output
-        # For empty lists or other list types, return as is
-        return output
+        logger.debug(f"Found dbt Cloud CLI output format with {len(output)} items")
+        if not resources:
+            logger.warning("No valid model data found in dbt Cloud CLI output")
+        return resources
     
-    # If string, try to parse as JSON
-    if isinstance(output, str):
+    if not isinstance(output, str):
+        logger.warning("Could not parse dbt list output in any recognized format")
+        return []
+    
+    # Output truncated by max_output_bytes has a marker line in place of the dropped lines
+    stripped = strip_truncation_marker(output).strip()
+    if stripped.startswith(("{", "[")):
         try:
-            parsed = json.loads(output)
-            if isinstance(parsed, dict) and "nodes" in parsed:
-                return [
-                    {"name": name, **details}
-                    for name, details in parsed["nodes"].items()
-                ]
-            elif isinstance(parsed, list):
-                return parsed
+            parsed = json.loads(stripped)
         except json.JSONDecodeError:
-            # Not JSON, parse text format (simplified)
-            models = []
-            for line in output.splitlines():
-                line = line.strip()
-                if not line:
-                    continue
-                    
-                # Check if the line is a JSON string
-                if line.startswith('{') and '"name":' in line and '"resource_type":' in line:
-                    try:
-                        model_data = json.loads(line)
-                        if isinstance(model_data, dict) and "name" in model_data and "resource_type" in model_data:
-                            models.append(model_data)
-                            continue
-                    except json.JSONDecodeError:
-                        pass
-                
-                # Check for dbt Cloud CLI format with timestamps (e.g., "00:59:06 {json}")
-                timestamp_match = re.match(r'^(\d\d:\d\d:\d\d)\s+(.+)$', line)
-                if timestamp_match:
-                    json_part = timestamp_match.group(2)
-                    try:
-                        model_data = json.loads(json_part)
-                        if isinstance(model_data, dict) and "name" in model_data and "resource_type" in model_data:
-                            models.append(model_data)
-                            continue
-                    except json.JSONDecodeError:
-                        pass
-                
-                # Fall back to simple name-only format
-                models.append({"name": line})
-            return models
+            # Several JSON lines, or not JSON
+            parsed = None
+        if isinstance(parsed, dict) and "nodes" in parsed:
+            return _nodes_to_resources(parsed["nodes"])
+        if isinstance(parsed, list):
+            return parsed
     
-    # Fallback: return empty list
-    logger.warning("Could not parse dbt list output in any recognized format")
-    return []
+    lines = [line for line in (line.strip() for line in stripped.splitlines()) if line]
+    return _parse_lines(lines)
 
 
 async def process_command_result(
@@ -336,14 +559,20 @@ async def process_command_result(
     logger.info(f"Processing command result for {command_name}")
     logger.info(f"Result success: {result['success']}, returncode: {result.get('returncode')}")
     
+    # Prefer the structured summary from run_results.json over dbt's text output
+    if result.get("run_results") and not output_formatter:
+        logger.info(f"Returning run_results summary for {command_name}")
+        return json.dumps({"success": result["success"], **result["run_results"]})
+    
+    # Without run results, fall back to the progress reported by dbt's events
+    progress = result.get("progress")
+    if progress and progress["nodes"] and command_name in RUN_RESULTS_COMMANDS and not output_formatter:
+        logger.info(f"Returning event progress for {command_name}")
+        return json.dumps({"success": result["success"], **progress})
+    
     # Log the output type and a sample
     if "output" in result:
-        if isinstance(result["output"], str):
-            logger.info(f"Output type: str, first 100 chars: {result['output'][:100]}")
-        elif isinstance(result["output"], (dict, list)):
-            logger.info(f"Output type: {type(result['output'])}, sample: {json.dumps(result['output'])[:100]}")
-        else:
-            logger.info(f"Output type: {type(result['output'])}")
+        logger.info("Output type: %s, sample: %s", type(result["output"]).__name__, Preview(result["output"]))
     
     # For errors, simply return the raw command output if available
     if not result["success"]:
@@ -351,12 +580,12 @@ async def process_command_result(
         
         # If we have command output, return it directly
         if "output" in result and result["output"]:
-            logger.info(f"Returning error output: {str(result['output'])[:100]}...")
+            logger.info("Returning error output: %s...", Preview(result["output"]))
             return str(result["output"])
         
         # If no command output, return the error message
         if result["error"]:
-            logger.info(f"Returning error message: {str(result['error'])[:100]}...")
+            logger.info("Returning error message: %s...", Preview(result["error"]))
             return str(result["error"])
             
         # If neither output nor error is available, return a generic message
@@ -367,16 +596,16 @@ async def process_command_result(
     if output_formatter:
         logger.info(f"Using custom formatter for {command_name}")
         formatted_result = output_formatter(result["output"])
-        logger.info(f"Formatted result type: {type(formatted_result)}, first 100 chars: {str(formatted_result)[:100]}")
+        logger.info("Formatted result type: %s, first 100 chars: %s", type(formatted_result).__name__, Preview(formatted_result))
         return formatted_result
     
     # Default output formatting
     logger.info(f"Using default formatting for {command_name}")
     if isinstance(result["output"], (dict, list)):
         json_result = json.dumps(result["output"])
-        logger.info(f"JSON result length: {len(json_result)}, first 100 chars: {json_result[:100]}")
+        logger.info("JSON result length: %d, first 100 chars: %s", len(json_result), Preview(json_result))
         return json_result
     else:
         str_result = str(result["output"])
-        logger.info(f"String result length: {len(str_result)}, first 100 chars: {str_result[:100]}")
+        logger.info("String result length: %d, first 100 chars: %s", len(str_result), Preview(str_result))
         return str_result
\ No newline at end of file
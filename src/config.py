@@ -15,6 +15,36 @@ DEFAULT_CONFIG = {
     "dbt_path": "dbt",  # Default to dbt in PATH
     "env_file": ".env",
     "log_level": "INFO",
+    "execution_backend": "subprocess",  # "subprocess" or "dbt_runner"
+    "dbt_python": None,  # Interpreter with dbt-core installed (dbt_runner backend)
+    "worker_pool_size": 2,  # Max dbt workers per (project_dir, profiles_dir, dbt_path)
+    "worker_idle_timeout": 300,  # Seconds before an idle worker is stopped
+    "worker_max_commands": 100,  # Recycle a worker after this many commands
+    "worker_max_rss_mb": 2048,  # Recycle a worker once its RSS exceeds this many MB
+    "max_output_bytes": 32 * 1024 * 1024,  # Retained stdout/stderr bytes per command (0 for unlimited)
+    "max_concurrent_commands": 4,  # dbt commands running at once across all projects (0 for unlimited)
+    "max_concurrent_per_project": 4,  # dbt commands running at once per project (0 for unlimited)
+    "isolate_read_only_commands": True,  # Run ls/show with private target and log paths
+    "command_timeout": 0.0,  # Seconds before a dbt command is terminated (0 for no timeout)
+    "command_timeouts": {  # Per-command overrides of command_timeout, for the read-only commands by default
+        "ls": 300.0,
+        "list": 300.0,
+        "show": 600.0,
+        "compile": 600.0,
+        "debug": 300.0,
+        "deps": 600.0,
+    },
+    "kill_grace_period": 10.0,  # Seconds between SIGTERM and SIGKILL when terminating a command
+    "coalesce_commands": True,  # Share one run between identical concurrent read-only commands
+    "coalesce_window": 2.0,  # Seconds a read-only command's result is reused by identical calls
+    "manifest_cache_max_mb": 512,  # Combined size of the cached manifests (0 for unlimited)
+    "manifest_selection": True,  # Answer dbt ls from the cached manifest when it is fresh
+    "manifest_index": True,  # Keep an SQLite index of the manifest in the target directory
+    "reachability_max_nodes": 20000,  # Largest graph given a precomputed reachability index (0 to disable)
+    "dbt_log_format": "text",  # dbt's --log-format; "json" parses the structured event stream
+    "watch_projects": False,  # Re-parse projects in the background when their files change
+    "watch_debounce": 1.0,  # Seconds without further changes before the background parse starts
+    "watch_poll_interval": 2.0,  # Seconds between scans when inotify isn't available
 }
 
 # Current configuration (initialized with defaults)
@@ -34,6 +64,29 @@ def load_from_env() -> None:
         "DBT_PATH": "dbt_path",
         "ENV_FILE": "env_file",
         "LOG_LEVEL": "log_level",
+        "EXECUTION_BACKEND": "execution_backend",
+        "DBT_PYTHON": "dbt_python",
+        "WORKER_POOL_SIZE": "worker_pool_size",
+        "WORKER_IDLE_TIMEOUT": "worker_idle_timeout",
+        "WORKER_MAX_COMMANDS": "worker_max_commands",
+        "WORKER_MAX_RSS_MB": "worker_max_rss_mb",
+        "MAX_OUTPUT_BYTES": "max_output_bytes",
+        "MAX_CONCURRENT_COMMANDS": "max_concurrent_commands",
+        "MAX_CONCURRENT_PER_PROJECT": "max_concurrent_per_project",
+        "ISOLATE_READ_ONLY_COMMANDS": "isolate_read_only_commands",
+        "COMMAND_TIMEOUT": "command_timeout",
+        "COMMAND_TIMEOUTS": "command_timeouts",
+        "KILL_GRACE_PERIOD": "kill_grace_period",
+        "COALESCE_COMMANDS": "coalesce_commands",
+        "COALESCE_WINDOW": "coalesce_window",
+        "MANIFEST_CACHE_MAX_MB": "manifest_cache_max_mb",
+        "MANIFEST_SELECTION": "manifest_selection",
+        "MANIFEST_INDEX": "manifest_index",
+        "REACHABILITY_MAX_NODES": "reachability_max_nodes",
+        "DBT_LOG_FORMAT": "dbt_log_format",
+        "WATCH_PROJECTS": "watch_projects",
+        "WATCH_DEBOUNCE": "watch_debounce",
+        "WATCH_POLL_INTERVAL": "watch_poll_interval",
     }
     
     for env_var, config_key in env_mapping.items():
@@ -43,6 +96,21 @@ def load_from_env() -> None:
             # Convert string boolean values
             if value.lower() in ("true", "false") and config_key == "mock_mode":
                 value = value.lower() == "true"
+
+            # Convert boolean and numeric values to the type of their default
+            default = DEFAULT_CONFIG.get(config_key)
+            try:
+                if isinstance(default, bool):
+                    value = value.lower() in ("true", "1", "yes")
+                elif isinstance(default, (int, float)):
+                    value = type(default)(value)
+                elif isinstance(default, dict):
+                    # Parse "key=value,key=value", merged over the defaults
+                    overrides = dict(item.split("=", 1) for item in value.split(",") if item.strip())
+                    value = {**default, **{k.strip(): float(v) for k, v in overrides.items()}}
+            except ValueError:
+                logger.warning(f"Invalid value for {env_var}: {value}")
+                continue
                 
             config[config_key] = value
             logger.debug(f"Loaded config from environment: {config_key}={value}")
@@ -87,6 +155,14 @@ def validate_config() -> bool:
     if os.path.isabs(dbt_path) and not os.path.isfile(dbt_path):
         logger.warning(f"dbt executable not found at {dbt_path}")
         return False
+
+    if config["execution_backend"] not in ("subprocess", "dbt_runner"):
+        logger.warning(f"Unknown execution backend: {config['execution_backend']}")
+        return False
+
+    if config["dbt_log_format"] not in ("default", "text", "json", "debug"):
+        logger.warning(f"Unknown dbt log format: {config['dbt_log_format']}")
+        return False
         
     return True
 
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Long-lived dbt worker process for the DBT CLI MCP Server.
+
+This script is launched with the Python interpreter that has dbt-core installed
+and executes dbt commands in-process through dbt's programmatic ``dbtRunner``,
+so the interpreter startup, dbt import and adapter plugin loading are paid once
+per worker instead of once per command.
+
+It deliberately only depends on the standard library and dbt, because the dbt
+interpreter is not guaranteed to have this package (or its dependencies) installed.
+
+Protocol (one JSON document per line):
+    worker -> server: {"ready": true, "pid": int}
+    server -> worker: {"id": int, "args": [...], "cwd": str, "env": {...}}
+    worker -> server: {"id": int, "stdout": str, "stderr": str, "returncode": int, "rss": int}
+"""
+
+import io
+import os
+import sys
+import json
+import traceback
+from contextlib import redirect_stdout, redirect_stderr
+
+
+def get_rss_bytes() -> int:
+    """
+    Get the current resident set size of this process.
+
+    Returns:
+        The RSS in bytes, or 0 if it cannot be determined
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        import resource
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+    except (ImportError, OSError):
+        return 0
+
+
+def run_command(runner_class, request: dict) -> dict:
+    """
+    Execute a single dbt command with dbtRunner.
+
+    Args:
+        runner_class: The dbtRunner class
+        request: The decoded request
+
+    Returns:
+        The response to send back to the server
+    """
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    original_cwd = os.getcwd()
+    original_env = dict(os.environ)
+
+    try:
+        os.chdir(request.get("cwd") or original_cwd)
+        if request.get("env") is not None:
+            os.environ.clear()
+            os.environ.update(request["env"])
+
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            result = runner_class().invoke(list(request["args"]))
+
+        # Mirror the exit codes of the dbt CLI
+        if result.success:
+            returncode = 0
+        elif result.exception is None:
+            returncode = 1
+        else:
+            returncode = 2
+            stderr.write(f"{type(result.exception).__name__}: {result.exception}\n")
+    except BaseException:
+        returncode = 2
+        stderr.write(traceback.format_exc())
+    finally:
+        os.environ.clear()
+        os.environ.update(original_env)
+        os.chdir(original_cwd)
+
+    return {
+        "id": request.get("id"),
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+        "returncode": returncode,
+        "rss": get_rss_bytes()
+    }
+
+
+def serve() -> None:
+    """
+    Serve requests from stdin until it is closed.
+    """
+    # Keep a private handle on the real stdout for the protocol, and point fd 1
+    # at stderr so nothing dbt prints can corrupt the response stream.
+    protocol = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    from dbt.cli.main import dbtRunner
+
+    protocol.write(json.dumps({"ready": True, "pid": os.getpid()}) + "\n")
+    protocol.flush()
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            response = {"id": None, "stdout": "", "stderr": f"Invalid request: {e}", "returncode": 2, "rss": get_rss_bytes()}
+        else:
+            response = run_command(dbtRunner, request)
+
+        protocol.write(json.dumps(response) + "\n")
+        protocol.flush()
+
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,106 @@
+"""
+Per-project environment snapshots for the DBT CLI MCP Server.
+
+Each (project_dir, profiles_dir) pair gets an immutable environment built once
+from the server's environment, the project's .env file and the profiles
+directory, and cached until the .env file changes. The global os.environ is
+never modified, so concurrent commands for different projects can't leak
+variables into each other.
+"""
+
+import os
+import logging
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+
+import dotenv
+
+from src.config import get_config
+
+# Logger for this module
+logger = logging.getLogger(__name__)
+
+# Cached snapshots keyed by (project_dir, profiles_dir, env_file), with the
+# signature of the .env file they were built from
+_snapshots: Dict[Tuple[str, Optional[str], str], Tuple[Optional[tuple], Mapping[str, str]]] = {}
+
+
+def _file_signature(path: Path) -> Optional[tuple]:
+    """Get the (mtime, size) of a file, or None if it doesn't exist."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _build_environment(project_dir: str, profiles_dir: Optional[str], env_file: Path) -> Dict[str, str]:
+    """
+    Build the environment for a project.
+
+    Variables already set in the server's environment take precedence over the
+    .env file. DBT_PROFILES_DIR is taken from profiles_dir if given, then from
+    the environment or .env file, and defaults to the project directory.
+    """
+    env_vars = dict(os.environ)
+
+    # Ensure HOME is set if not already defined
+    if "HOME" not in env_vars:
+        env_vars["HOME"] = str(Path.home())
+        logger.debug(f"Setting HOME environment variable to {env_vars['HOME']}")
+
+    if env_file.exists():
+        logger.debug(f"Loading environment from {env_file}")
+        for key, value in dotenv.dotenv_values(env_file).items():
+            if value is not None and key not in env_vars:
+                env_vars[key] = value
+    else:
+        logger.debug(f"Environment file not found: {env_file}")
+
+    if profiles_dir is not None:
+        env_vars["DBT_PROFILES_DIR"] = str(Path(profiles_dir).resolve())
+        logger.debug(f"Setting DBT_PROFILES_DIR to {env_vars['DBT_PROFILES_DIR']} (from profiles_dir)")
+    elif "DBT_PROFILES_DIR" not in env_vars:
+        env_vars["DBT_PROFILES_DIR"] = str(Path(project_dir).resolve())
+        logger.debug(f"Setting DBT_PROFILES_DIR to {env_vars['DBT_PROFILES_DIR']} (from project_dir)")
+
+    return env_vars
+
+
+def get_environment(project_dir: str, profiles_dir: Optional[str] = None) -> Mapping[str, str]:
+    """
+    Get the environment dbt commands for a project run with.
+
+    The snapshot is cached and rebuilt when the project's .env file changes
+    (by modification time or size).
+
+    Args:
+        project_dir: Directory containing the dbt project
+        profiles_dir: Directory containing the profiles.yml file (defaults to project_dir if not specified)
+
+    Returns:
+        Read-only mapping of environment variables
+    """
+    env_file = Path(project_dir) / get_config("env_file")
+    key = (
+        str(Path(project_dir).resolve()),
+        str(Path(profiles_dir).resolve()) if profiles_dir is not None else None,
+        str(env_file)
+    )
+    signature = _file_signature(env_file)
+
+    cached = _snapshots.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    snapshot = MappingProxyType(_build_environment(project_dir, profiles_dir, env_file))
+    _snapshots[key] = (signature, snapshot)
+    return snapshot
+
+
+def clear_environment_cache() -> None:
+    """
+    Drop all cached snapshots, e.g. after the server's own environment changed.
+    """
+    _snapshots.clear()
@@ -0,0 +1,174 @@
+"""
+Structured event parsing for the DBT CLI MCP Server.
+
+With `--log-format json`, dbt writes one JSON event per line. This module parses
+that stream incrementally, as the lines arrive, into node-level progress and the
+command's payload (the resources printed by `ls`, the preview printed by `show`),
+so results never have to be recovered by parsing the whole output at the end.
+"""
+
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from src.artifacts import FAILING_STATUSES
+
+# Logger for this module
+logger = logging.getLogger(__name__)
+
+# Events whose payload is the output of the command
+LIST_EVENT = "ListCmdOut"
+SHOW_EVENT = "ShowNode"
+
+
+class EventParser:
+    """
+    Incremental parser for dbt's JSON log events.
+
+    Register `feed_line` as an OutputCapture line handler. Each event line is
+    replaced in the captured output by its human-readable message.
+    """
+
+    def __init__(self, max_payload_bytes: int = 0):
+        """
+        Args:
+            max_payload_bytes: Maximum size of the collected payload (0 for unlimited);
+                               payloads exceeding it are dropped
+        """
+        self.max_payload_bytes = max_payload_bytes
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.errors: List[str] = []
+        self.list_items: List[Any] = []
+        self.previews: List[Any] = []
+        self.event_count = 0
+        self.payload_bytes = 0
+        self.payload_truncated = False
+
+    def _add_payload(self, items: List[Any], item: Any, size: int) -> None:
+        """Collect a payload item within the byte budget."""
+        self.payload_bytes += size
+        if self.max_payload_bytes and self.payload_bytes > self.max_payload_bytes:
+            if not self.payload_truncated:
+                logger.info("Event payload exceeded max_output_bytes, falling back to text output")
+            self.payload_truncated = True
+            self.list_items.clear()
+            self.previews.clear()
+            return
+        items.append(item)
+
+    def _update_node(self, data: Dict[str, Any]) -> None:
+        """Record the progress carried by an event's node_info and run_result."""
+        node_info = data.get("node_info") or {}
+        unique_id = node_info.get("unique_id")
+        if not unique_id:
+            return
+
+        node = self.nodes.setdefault(unique_id, {"unique_id": unique_id})
+        if node_info.get("resource_type"):
+            node["resource_type"] = node_info["resource_type"]
+        if node_info.get("node_status"):
+            node["status"] = node_info["node_status"]
+        if node_info.get("node_started_at"):
+            node["started_at"] = node_info["node_started_at"]
+        if node_info.get("node_finished_at"):
+            node["finished_at"] = node_info["node_finished_at"]
+
+        run_result = data.get("run_result") or {}
+        if run_result.get("status"):
+            node["status"] = str(run_result["status"])
+        if run_result.get("execution_time") is not None:
+            node["execution_time"] = round(run_result["execution_time"], 3)
+        if node.get("status") in FAILING_STATUSES and run_result.get("message"):
+            node["message"] = run_result["message"]
+
+    def feed_line(self, stream_name: str, line: str) -> Optional[str]:
+        """
+        Parse one line of output.
+
+        Args:
+            stream_name: "stdout" or "stderr"
+            line: The line, including its line terminator
+
+        Returns:
+            The event's message (to be stored instead of the raw event), or None
+            if the line is not an event
+        """
+        if not line.startswith("{"):
+            return None
+        try:
+            event = json.loads(line)
+            info = event["info"]
+        except (ValueError, KeyError, TypeError):
+            return None
+
+        self.event_count += 1
+        name = info.get("name")
+        data = event.get("data") or {}
+        message = info.get("msg") or ""
+
+        if "node_info" in data:
+            self._update_node(data)
+
+        if info.get("level") == "error" and message:
+            self.errors.append(message)
+
+        if name == LIST_EVENT:
+            item = data.get("msg", message)
+            if item.startswith("{"):
+                try:
+                    item = json.loads(item)
+                except ValueError:
+                    pass
+            self._add_payload(self.list_items, item, len(line))
+        elif name == SHOW_EVENT:
+            preview = data.get("preview", "")
+            if data.get("output_format") == "json":
+                try:
+                    rows = json.loads(preview)
+                    preview = {"show": rows} if data.get("is_inline") else {"node": data.get("node_name"), "show": rows}
+                except ValueError:
+                    pass
+            self._add_payload(self.previews, preview, len(line))
+
+        return message + "\n"
+
+    @property
+    def has_payload(self) -> bool:
+        """Whether the command printed a complete payload."""
+        return not self.payload_truncated and bool(self.list_items or self.previews)
+
+    def payload(self) -> Any:
+        """
+        Get the command's payload.
+
+        Returns:
+            For `ls`, the listed resources (dictionaries with `--output json`,
+            otherwise one name, path or selector per line); for `show`, the
+            preview, or a list of previews if several nodes were shown
+        """
+        if self.list_items:
+            if all(isinstance(item, dict) for item in self.list_items):
+                return list(self.list_items)
+            return "\n".join(str(item) for item in self.list_items)
+        if len(self.previews) == 1:
+            return self.previews[0]
+        return list(self.previews)
+
+    def progress(self) -> Dict[str, Any]:
+        """
+        Get the node-level progress seen so far.
+
+        Returns:
+            Dictionary with status counts, per-node progress (status, start and
+            finish times, execution time, and the message of failing nodes) and
+            error messages
+        """
+        counts: Dict[str, int] = {}
+        for node in self.nodes.values():
+            status = node.get("status", "unknown")
+            counts[status] = counts.get(status, 0) + 1
+        return {
+            "counts": counts,
+            "nodes": list(self.nodes.values()),
+            "errors": list(self.errors),
+        }
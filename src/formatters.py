@@ -8,13 +8,34 @@ in different ways based on the command type and output format.
 import json
 import logging
 import re
-from typing import Any, Dict, List, Union
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 from src.command import parse_dbt_list_output
+from src.log_preview import Preview
 
 # Logger for this module
 logger = logging.getLogger(__name__)
 
+# Fields of each resource in the simplified (non-verbose) dbt ls output
+DEFAULT_LS_FIELDS = ("name", "resource_type", "depends_on.nodes")
+
+# Encodings of dbt ls resources: a list of objects, or {columns, rows}
+LS_ENCODINGS = ("rows", "columnar")
+
+# json.dumps separators without whitespace
+COMPACT_SEPARATORS = (",", ":")
+
+# Separator line under the header of a pipe-delimited table
+TABLE_SEPARATOR_PATTERN = re.compile(r"^\s*\|?[\s|:]*-[-\s|:+]*$")
+
+# Cells of a text table standing for a NULL value
+NULL_CELLS = ("NULL", "None")
+
+# Decoder for JSON documents embedded in command output
+_decoder = json.JSONDecoder()
+
 
 def default_formatter(output: Any) -> str:
     """
@@ -29,30 +50,135 @@ def default_formatter(output: Any) -> str:
     return json.dumps(output) if isinstance(output, (dict, list)) else str(output)
 
 
-def ls_formatter(output: Any, output_format: str = "json", verbose: bool = False) -> str:
+def get_field(item: Dict[str, Any], path: str) -> Any:
     """
-    Formatter for dbt ls command output.
+    Get a field of a resource by its dotted path, e.g. "config.materialized".
+
+    Args:
+        item: The resource
+        path: Dotted path of the field
+
+    Returns:
+        The field's value, or None if the resource doesn't have it
+    """
+    value: Any = item
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def project_fields(item: Dict[str, Any], fields: Sequence[str]) -> Dict[str, Any]:
+    """
+    Keep only some fields of a resource, nesting dotted paths as in the resource.
+
+    Args:
+        item: The resource
+        fields: Dotted paths of the fields to keep
+
+    Returns:
+        The resource with only those fields; missing fields are None
+    """
+    projected: Dict[str, Any] = {}
+    for path in fields:
+        *parents, leaf = path.split(".")
+        target = projected
+        for key in parents:
+            target = target.setdefault(key, {})
+        target[leaf] = get_field(item, path)
+    return projected
+
+
+def conflicting_fields(fields: Sequence[str]) -> Optional[Tuple[str, str]]:
+    """
+    Find two fields that can't be projected together because one is nested in
+    the other, e.g. "config" and "config.materialized".
+
+    Args:
+        fields: Dotted paths of the fields
+
+    Returns:
+        The enclosing field and the nested one, or None if there is no conflict
+    """
+    paths = set(fields)
+    for path in fields:
+        parts = path.split(".")
+        for end in range(1, len(parts)):
+            parent = ".".join(parts[:end])
+            if parent in paths:
+                return parent, path
+    return None
+
+
+def ls_columns(items: List[Any], verbose: bool = False, fields: Optional[Sequence[str]] = None) -> List[str]:
+    """
+    Get the columns of the columnar encoding of dbt ls resources.
+
+    Args:
+        items: The resources, as returned by ls_items()
+        verbose: Whether the resources have every field
+        fields: Dotted paths of the fields the resources were projected on
+
+    Returns:
+        The requested fields, the simplified fields, or for verbose listings
+        every top-level key in order of first appearance
+    """
+    if fields:
+        return list(fields)
+    if not verbose:
+        return list(DEFAULT_LS_FIELDS)
+    columns: Dict[str, None] = {}
+    for item in items:
+        if isinstance(item, dict):
+            columns.update(dict.fromkeys(item))
+    return list(columns)
+
+
+def encode_columnar(items: List[Any], columns: List[str]) -> Dict[str, Any]:
+    """
+    Encode resources as a list of columns and one row of values per resource,
+    so repeated keys are only written once.
+
+    Args:
+        items: The resources
+        columns: Dotted paths of the fields to encode
+
+    Returns:
+        Dictionary with `columns` and `rows`
+    """
+    return {
+        "columns": columns,
+        "rows": [[get_field(item, column) for column in columns] if isinstance(item, dict) else [item] for item in items]
+    }
+
+
+def ls_items(
+    output: Any,
+    output_format: str = "json",
+    verbose: bool = False,
+    fields: Optional[Sequence[str]] = None
+) -> List[Any]:
+    """
+    Get the resources listed by dbt ls, in the order they are returned.
 
     Args:
         output: The command output
         output_format: The output format (json, name, path, or selector)
-        verbose: Whether to return full JSON output (True) or simplified version (False)
+        verbose: Whether to keep every field of each resource (True) or a simplified version (False)
+        fields: Dotted paths of the fields to keep, overriding verbose
 
     Returns:
-        Formatted output string
+        For the json format, the resources sorted by resource_type and name; for
+        the other formats, the non-empty lines of the output
     """
-    # For name, path, or selector formats, return the raw output as string
     if output_format != "json":
-        logger.info(f"Returning raw output as string for format: {output_format}")
-        return str(output)
+        return [line for line in str(output).splitlines() if line.strip()]
 
-    # For json format, parse the output and return as JSON
-    logger.info("Parsing dbt ls output as JSON")
-
-    # Return raw output if it's an empty string or None
+    # Return nothing if it's an empty string or None
     if not output:
         logger.warning("dbt ls returned empty output")
-        return "[]"
+        return []
 
     # Parse the output
     parsed = parse_dbt_list_output(output)
@@ -67,9 +193,13 @@ def ls_formatter(output: Any, output_format: str = "json", verbose: bool = False
     # Return full parsed output if filtering removed everything
     if not filtered_parsed and parsed:
         logger.warning("Filtering removed all items, returning original parsed output")
-        json_output = json.dumps(parsed, indent=2)
-        logger.info(f"Final JSON output length: {len(json_output)}")
-        return json_output
+        if fields:
+            return [project_fields(item, fields) if isinstance(item, dict) else item for item in parsed]
+        return parsed
+
+    if fields:
+        logger.info(f"Projecting output on fields: {', '.join(fields)}")
+        return [project_fields(item, fields) for item in filtered_parsed]
 
     # If not verbose, simplify the output to only include name, resource_type, and depends_on.nodes
     if not verbose and filtered_parsed:
@@ -85,15 +215,185 @@ def ls_formatter(output: Any, output_format: str = "json", verbose: bool = False
             })
         filtered_parsed = simplified
 
-    json_output = json.dumps(filtered_parsed, indent=2)
+    return filtered_parsed
+
+
+def ls_formatter(
+    output: Any,
+    output_format: str = "json",
+    verbose: bool = False,
+    fields: Optional[Sequence[str]] = None,
+    encoding: str = "rows"
+) -> str:
+    """
+    Formatter for dbt ls command output.
+
+    Args:
+        output: The command output
+        output_format: The output format (json, name, path, or selector)
+        verbose: Whether to return full JSON output (True) or simplified version (False)
+        fields: Dotted paths of the fields to return, overriding verbose
+        encoding: "rows" for a list of objects, or "columnar" for {columns, rows}
+
+    Returns:
+        Formatted output string, as minified JSON for the json format
+    """
+    # For name, path, or selector formats, return the raw output as string
+    if output_format != "json":
+        logger.info(f"Returning raw output as string for format: {output_format}")
+        return str(output)
+
+    # For json format, parse the output and return as JSON
+    logger.info("Parsing dbt ls output as JSON")
+    items = ls_items(output, output_format, verbose, fields)
+    if encoding == "columnar":
+        items = encode_columnar(items, ls_columns(items, verbose, fields))
+    json_output = json.dumps(items, separators=COMPACT_SEPARATORS)
     logger.info(f"Final JSON output length: {len(json_output)}")
     return json_output
 
 
+def ls_page_formatter(
+    page: Dict[str, Any],
+    output_format: str = "json",
+    verbose: bool = False,
+    fields: Optional[Sequence[str]] = None,
+    encoding: str = "rows"
+) -> str:
+    """
+    Formatter for a page of dbt ls resources, as returned by list_page().
+
+    Args:
+        page: The page
+        output_format: The output format (json, name, path, or selector)
+        verbose: Whether the resources have every field
+        fields: Dotted paths of the fields the resources were projected on
+        encoding: "rows" for a list of objects, or "columnar" for {columns, rows}
+
+    Returns:
+        The page as minified JSON
+    """
+    if output_format == "json" and encoding == "columnar":
+        page = {**page, "items": encode_columnar(page["items"], ls_columns(page["items"], verbose, fields))}
+    return json.dumps(page, separators=COMPACT_SEPARATORS)
+
+
+def find_json_document(text: str) -> Any:
+    """
+    Decode the first complete JSON object in a text, such as dbt's output with
+    log lines before or after it.
+
+    Each '{' is tried in turn with JSONDecoder.raw_decode, which decodes in
+    place from that position and stops at the end of the object, so the text is
+    never copied and whatever follows the object is ignored.
+
+    Args:
+        text: The text
+
+    Returns:
+        The decoded object, or None if the text doesn't contain one
+    """
+    position = text.find("{")
+    while position >= 0:
+        try:
+            document, _ = _decoder.raw_decode(text, position)
+            return document
+        except json.JSONDecodeError:
+            position = text.find("{", position + 1)
+    return None
+
+
+def parse_table(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse a pipe-delimited table, as printed by dbt show --output text.
+
+    The table starts at the first line containing a '|' that is followed by a
+    separator line made of dashes. Lines before it are ignored, and it ends at
+    the first line without a '|'. Empty cells are kept as empty strings and
+    NULL cells become None, so each row keeps its values in the header's order.
+
+    Args:
+        text: The text
+
+    Returns:
+        Dictionary with `columns` and `rows`, or None if the text has no table
+    """
+    lines = text.splitlines()
+    for index in range(len(lines) - 1):
+        if "|" in lines[index] and TABLE_SEPARATOR_PATTERN.match(lines[index + 1]):
+            break
+    else:
+        return None
+
+    # Drop the empty strings outside the outer pipes, if the table has them
+    header = lines[index].strip()
+    first = 1 if header.startswith("|") else 0
+    last = -1 if header.endswith("|") else None
+    columns = [cell.strip() for cell in header.split("|")[first:last]]
+
+    rows = []
+    for line in islice(lines, index + 2, None):
+        if "|" not in line:
+            break
+        cells = list(map(str.strip, line.split("|")[first:last]))
+        if len(cells) != len(columns):
+            logger.warning(f"Skipping table row with {len(cells)} cells instead of {len(columns)}")
+            continue
+        if any(null in cells for null in NULL_CELLS):
+            cells = [None if cell in NULL_CELLS else cell for cell in cells]
+        rows.append(cells)
+    return {"columns": columns, "rows": rows}
+
+
+def show_columnar(preview: Any) -> Any:
+    """
+    Convert a dbt show preview to the columnar shape.
+
+    Args:
+        preview: A preview, as printed by dbt show: {"node": ..., "show": [rows]},
+            a list of row objects, a text table, or a list of previews
+
+    Returns:
+        {"node": ..., "columns": [...], "rows": [[...], ...]} ("node" only if
+        the preview has one), a list of those, or the preview unchanged if it
+        isn't a preview
+    """
+    if isinstance(preview, str):
+        table = parse_table(preview)
+        return table if table is not None else preview
+
+    if isinstance(preview, dict) and isinstance(preview.get("show"), list):
+        table = show_columnar(preview["show"])
+        if not isinstance(table, dict):
+            return preview
+        return {**({"node": preview["node"]} if "node" in preview else {}), **table}
+
+    if isinstance(preview, list):
+        if not all(isinstance(row, dict) and "show" not in row for row in preview):
+            return [show_columnar(item) for item in preview]
+        if not preview:
+            return {"columns": [], "rows": []}
+        # Rows printed by dbt all have the same columns, so their values are
+        # fetched with a single itemgetter; otherwise columns are merged
+        keys = preview[0].keys()
+        if len(keys) > 1 and all(row.keys() == keys for row in preview):
+            columns = list(keys)
+            return {"columns": columns, "rows": list(map(itemgetter(*columns), preview))}
+        merged: Dict[str, None] = {}
+        for row in preview:
+            merged.update(dict.fromkeys(row))
+        return {"columns": list(merged), "rows": [[row.get(column) for column in merged] for row in preview]}
+
+    return preview
+
+
 def show_formatter(output: Any) -> str:
     """
     Formatter for dbt show command output.
 
+    Previews are returned in the columnar shape of show_columnar(), from dbt's
+    JSON output, or from its text table when no JSON document is found.
+
     Args:
         output: The command output
 
@@ -101,62 +401,30 @@ def show_formatter(output: Any) -> str:
         Formatted output string
     """
     # Log the type and content of the output for debugging
-    logger.info(f"show_formatter received output of type: {type(output)}")
-    if isinstance(output, str):
-        logger.info(f"Output string (first 100 chars): {output[:100]}")
-    elif isinstance(output, (dict, list)):
-        logger.info(f"Output structure: {json.dumps(output)[:100]}")
+    logger.info("show_formatter received output of type: %s", type(output).__name__)
+    logger.info("Output (first 100 chars): %s", Preview(output))
 
-    # If output is already a dict or list, just return it as JSON
+    # Previews collected from dbt's JSON events
     if isinstance(output, (dict, list)):
-        return json.dumps(output)
+        converted = show_columnar(output)
+        if converted is output:
+            return json.dumps(output)
+        return json.dumps(converted, separators=COMPACT_SEPARATORS)
 
-    # For string output, try to extract the JSON part
-    if isinstance(output, str):
-        try:
-            # Look for JSON object in the output
-            json_start = output.find('{')
-            if json_start >= 0:
-                # Extract everything from the first { to the end
-                json_str = output[json_start:]
-                logger.info(f"Extracted potential JSON: {json_str[:100]}...")
-
-                # Try to parse it as JSON
-                parsed_json = json.loads(json_str)
-                logger.info(f"Successfully parsed JSON from output")
-
-                # Return the parsed JSON
-                return json.dumps(parsed_json)
-        except json.JSONDecodeError as e:
-            logger.warning(f"Failed to parse JSON from output: {e}")
-
-    # Try to convert tabular output to JSON if possible
-    try:
-        # Simple conversion of tabular data to JSON
-        lines = str(output).strip().split("\n")
-        logger.info(f"Number of lines in output: {len(lines)}")
-        if len(lines) > 2:  # Need at least header and one data row
-            # Extract header row (assuming it's the first row)
-            header = lines[0].strip().split("|")
-            header = [h.strip() for h in header if h.strip()]
-            logger.info(f"Extracted header: {header}")
-
-            # Extract data rows (skip header and separator row)
-            data_rows = []
-            for line in lines[2:]:
-                if line.strip() and "|" in line:
-                    values = line.strip().split("|")
-                    values = [v.strip() for v in values if v.strip()]
-                    if len(values) == len(header):
-                        row_dict = dict(zip(header, values))
-                        data_rows.append(row_dict)
-
-            logger.info(f"Extracted {len(data_rows)} data rows")
-            return json.dumps(data_rows)
-    except Exception as e:
-        logger.warning(f"Failed to convert tabular output to JSON: {e}")
-        import traceback
-        logger.warning(f"Traceback: {traceback.format_exc()}")
+    output = str(output)
+
+    # Look for the first complete JSON document in the output
+    document = find_json_document(output)
+    if document is not None:
+        logger.info("Extracted JSON document: %s", Preview(document))
+        return json.dumps(show_columnar(document), separators=COMPACT_SEPARATORS)
+
+    # Fall back to a text table
+    table = parse_table(output)
+    if table is not None:
+        logger.info(f"Extracted {len(table['rows'])} rows from text table")
+        return json.dumps(table, separators=COMPACT_SEPARATORS)
 
     # Default to string output if conversion fails
-    return str(output)
\ No newline at end of file
+    logger.warning("No JSON document or table found in dbt show output")
+    return output
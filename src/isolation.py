@@ -0,0 +1,124 @@
+"""
+Per-invocation target and log directories for the DBT CLI MCP Server.
+
+Read-only commands run with their own --target-path and --log-path so they can
+run concurrently with each other and with builds. Each invocation directory is
+seeded from the project's latest manifest and partial parse cache so dbt can
+still parse incrementally, and the refreshed artifacts are promoted back to the
+canonical target/ directory when the command succeeds.
+"""
+
+import os
+import uuid
+import shutil
+import logging
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional
+
+from src.project import get_target_path
+
+# Logger for this module
+logger = logging.getLogger(__name__)
+
+# Commands run with private target and log paths. compile is not one of them:
+# its compiled SQL under target/compiled/ and target/run/ is part of its result
+ISOLATED_COMMANDS = frozenset({"ls", "list", "show"})
+
+# Directory (inside the canonical target directory) holding invocation directories
+INVOCATIONS_DIR = ".mcp_invocations"
+
+# Artifacts copied into each invocation so dbt can parse incrementally
+SEEDED_ARTIFACTS = ("manifest.json", "partial_parse.msgpack")
+
+# Artifacts promoted back to the canonical target directory after success
+PROMOTED_ARTIFACTS = (
+    "manifest.json",
+    "partial_parse.msgpack",
+    "semantic_manifest.json",
+    "graph.gpickle",
+    "graph_summary.json",
+)
+
+
+def _stat_signature(path: Path) -> Optional[tuple]:
+    """Get a signature identifying the current version of a file."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+class IsolatedInvocation:
+    """
+    Private target and log directories for a single dbt invocation.
+
+    Invocation directories live inside the canonical target directory, so
+    promotion is an atomic rename on the same filesystem.
+    """
+
+    def __init__(self, project_dir: str, env: Optional[Mapping[str, str]] = None):
+        self.target_path = get_target_path(project_dir, env)
+        self.root = self.target_path / INVOCATIONS_DIR / uuid.uuid4().hex
+        self.invocation_target = self.root / "target"
+        self.invocation_logs = self.root / "logs"
+        self._seeded: Dict[str, Optional[tuple]] = {}
+
+    def prepare(self) -> None:
+        """
+        Create the invocation directories and seed them from the canonical target.
+        """
+        self.invocation_target.mkdir(parents=True)
+        self.invocation_logs.mkdir()
+
+        for name in SEEDED_ARTIFACTS:
+            source = self.target_path / name
+            self._seeded[name] = _stat_signature(source)
+            if self._seeded[name] is None:
+                continue
+            # Copy rather than link: dbt rewrites these files in place
+            try:
+                shutil.copy2(source, self.invocation_target / name)
+            except OSError as e:
+                logger.debug(f"Could not seed {name} into {self.invocation_target}: {e}")
+
+    def args(self) -> List[str]:
+        """
+        Get the dbt arguments that redirect the invocation's artifacts and logs.
+
+        Returns:
+            List of command arguments
+        """
+        return ["--target-path", str(self.invocation_target), "--log-path", str(self.invocation_logs)]
+
+    def promote(self) -> List[str]:
+        """
+        Move the invocation's artifacts to the canonical target directory.
+
+        Promotion is skipped if the canonical manifest changed since the
+        invocation was seeded, since another command produced newer artifacts.
+
+        Returns:
+            Names of the promoted artifacts
+        """
+        for name, signature in self._seeded.items():
+            if _stat_signature(self.target_path / name) != signature:
+                logger.debug(f"Canonical {name} changed during the invocation; not promoting artifacts")
+                return []
+
+        promoted = []
+        for name in PROMOTED_ARTIFACTS:
+            source = self.invocation_target / name
+            if source.is_file():
+                os.replace(source, self.target_path / name)
+                promoted.append(name)
+
+        if promoted:
+            logger.debug(f"Promoted {', '.join(promoted)} to {self.target_path}")
+        return promoted
+
+    def cleanup(self) -> None:
+        """
+        Remove the invocation directories.
+        """
+        shutil.rmtree(self.root, ignore_errors=True)
@@ -0,0 +1,297 @@
+"""
+Lineage queries for the DBT CLI MCP Server.
+
+Answers "what is upstream/downstream of X" from the project's compact manifest
+instead of running `dbt ls -s +X+`. Traversals walk the node store's compressed
+sparse row (CSR) adjacency, which is built once per manifest, so a query only
+touches the part of the graph it returns.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.manifest import get_parsed_manifest
+from src.node_store import NodeStore
+from src.reachability import ReachabilityIndex
+
+# Logger for this module
+logger = logging.getLogger(__name__)
+
+# Lineage directions
+UPSTREAM = "upstream"
+DOWNSTREAM = "downstream"
+BOTH = "both"
+DIRECTIONS = (UPSTREAM, DOWNSTREAM, BOTH)
+
+# Default maximum number of paths enumerated between two nodes
+MAX_PATHS = 100
+
+# Resource types tried first when a name matches several resources
+PREFERRED_RESOURCE_TYPES = ("model", "seed", "snapshot", "source")
+
+
+class LineageError(Exception):
+    """Raised when a lineage query can't be answered."""
+
+
+def resource_type_of(store: NodeStore, node_id: int) -> str:
+    """
+    Get a node's resource type.
+
+    Args:
+        store: The node store
+        node_id: The node id
+
+    Returns:
+        The resource type, taken from the unique_id for nodes only known from the graph
+    """
+    return store.value(node_id, "resource_type") or store.unique_ids[node_id].split(".", 1)[0]
+
+
+def resolve_node(store: NodeStore, node: str) -> int:
+    """
+    Find the node a query refers to.
+
+    Args:
+        store: The node store
+        node: A unique_id (e.g. "model.my_project.customers") or a resource name
+
+    Returns:
+        The node id
+
+    Raises:
+        LineageError: If no resource, or several equally likely ones, match
+    """
+    node_id = store.node_id(node)
+    if node_id is not None:
+        return node_id
+
+    matches = [node_id for node_id in store.find_by_name(node) if resource_type_of(store, node_id) != "test"]
+    for resource_type in PREFERRED_RESOURCE_TYPES:
+        preferred = [node_id for node_id in matches if resource_type_of(store, node_id) == resource_type]
+        if preferred:
+            matches = preferred
+            break
+
+    if not matches:
+        raise LineageError(f"No resource named '{node}' in the manifest")
+    if len(matches) > 1:
+        candidates = ", ".join(sorted(store.unique_ids[node_id] for node_id in matches))
+        raise LineageError(f"'{node}' matches several resources, use one of their unique_ids: {candidates}")
+    return matches[0]
+
+
+def traverse(store: NodeStore, start: int, direction: str, max_depth: Optional[int] = None) -> Dict[int, int]:
+    """
+    Find the nodes upstream or downstream of a node, breadth first.
+
+    Args:
+        store: The node store
+        start: The node id to start from
+        direction: UPSTREAM or DOWNSTREAM
+        max_depth: Maximum number of edges from the start node (None for unlimited)
+
+    Returns:
+        Dictionary mapping each reached node id (excluding the start node) to its
+        shortest distance from the start node
+    """
+    if direction == UPSTREAM:
+        offsets, targets = store.parent_offsets, store.parent_targets
+    else:
+        offsets, targets = store.child_offsets, store.child_targets
+
+    depths = {start: 0}
+    frontier = [start]
+    depth = 0
+    while frontier and (max_depth is None or depth < max_depth):
+        depth += 1
+        next_frontier = []
+        for node_id in frontier:
+            for neighbour in targets[offsets[node_id]:offsets[node_id + 1]]:
+                if neighbour not in depths:
+                    depths[neighbour] = depth
+                    next_frontier.append(neighbour)
+        frontier = next_frontier
+
+    del depths[start]
+    return depths
+
+
+def find_paths(
+    store: NodeStore,
+    source: int,
+    target: int,
+    max_paths: int = MAX_PATHS,
+    max_depth: Optional[int] = None
+) -> Tuple[List[List[int]], bool]:
+    """
+    Enumerate the paths leading from a node down to one of its descendants.
+
+    The search only descends into ancestors of the target, so it never explores
+    branches that can't reach it.
+
+    Args:
+        store: The node store
+        source: The upstream node id
+        target: The downstream node id
+        max_paths: Maximum number of paths to return
+        max_depth: Maximum number of edges in a path (None for unlimited)
+
+    Returns:
+        Tuple of (paths as lists of node ids from source to target, whether
+        more paths exist than were returned)
+
+    Raises:
+        LineageError: If max_paths or max_depth is less than 1, which would
+                      leave the enumeration unbounded or empty
+    """
+    if max_paths < 1:
+        raise LineageError("max_paths must be at least 1")
+    if max_depth is not None and max_depth < 1:
+        raise LineageError("depth must be at least 1")
+    # Distance from each ancestor of the target down to the target
+    remaining = traverse(store, target, UPSTREAM, max_depth)
+    if source not in remaining:
+        return [], False
+
+    offsets, targets = store.child_offsets, store.child_targets
+    paths: List[List[int]] = []
+    path = [source]
+    stack = [iter(targets[offsets[source]:offsets[source + 1]])]
+    while stack:
+        for child in stack[-1]:
+            if child == target:
+                if len(paths) == max_paths:
+                    return paths, True
+                paths.append(path + [target])
+            elif child in remaining and (max_depth is None or len(path) + remaining[child] <= max_depth):
+                path.append(child)
+                stack.append(iter(targets[offsets[child]:offsets[child + 1]]))
+                break
+        else:
+            stack.pop()
+            path.pop()
+    return paths, False
+
+
+def describe(store: NodeStore, node_id: int) -> Dict[str, Any]:
+    """Get the fields returned for a node."""
+    return {
+        "unique_id": store.unique_ids[node_id],
+        "name": store.value(node_id, "name"),
+        "resource_type": resource_type_of(store, node_id),
+    }
+
+
+def lineage(
+    store: NodeStore,
+    node: str,
+    direction: str = BOTH,
+    max_depth: Optional[int] = None,
+    resource_types: Optional[List[str]] = None,
+    to: Optional[str] = None,
+    max_paths: int = MAX_PATHS,
+    index: Optional[ReachabilityIndex] = None
+) -> Dict[str, Any]:
+    """
+    Answer a lineage query.
+
+    Args:
+        store: The node store
+        node: unique_id or name of the node
+        direction: UPSTREAM, DOWNSTREAM or BOTH
+        max_depth: Maximum number of edges from the node (None for unlimited)
+        resource_types: Only return nodes of these types; the traversal still
+                        passes through nodes of other types
+        to: unique_id or name of another node, to enumerate the paths between the two
+        max_paths: Maximum number of paths to enumerate
+        index: The graph's reachability index, used to tell at once whether
+               (and in which direction) two nodes are connected
+
+    Returns:
+        Dictionary with the node, its upstream and/or downstream nodes (each with
+        its distance from the node) and, if `to` was given, the paths between the
+        two nodes, listed from the upstream end to the downstream end
+
+    Raises:
+        LineageError: If the query is invalid or refers to unknown nodes
+    """
+    if direction not in DIRECTIONS:
+        raise LineageError(f"Invalid direction '{direction}', expected one of: {', '.join(DIRECTIONS)}")
+    if max_depth is not None and max_depth < 1:
+        raise LineageError("depth must be at least 1")
+    if max_paths < 1:
+        raise LineageError("max_paths must be at least 1")
+
+    node_id = resolve_node(store, node)
+    result: Dict[str, Any] = {"node": describe(store, node_id)}
+
+    for name in (UPSTREAM, DOWNSTREAM):
+        if direction not in (name, BOTH):
+            continue
+        depths = traverse(store, node_id, name, max_depth)
+        entries = [
+            {**describe(store, other), "depth": depth}
+            for other, depth in depths.items()
+            if not resource_types or resource_type_of(store, other) in resource_types
+        ]
+        entries.sort(key=lambda entry: (entry["depth"], entry["unique_id"]))
+        result[name] = entries
+
+    if to is not None:
+        other_id = resolve_node(store, to)
+        if index is None:
+            paths, truncated = find_paths(store, node_id, other_id, max_paths, max_depth)
+            if not paths:
+                paths, truncated = find_paths(store, other_id, node_id, max_paths, max_depth)
+        elif index.is_ancestor(node_id, other_id):
+            paths, truncated = find_paths(store, node_id, other_id, max_paths, max_depth)
+        elif index.is_ancestor(other_id, node_id):
+            paths, truncated = find_paths(store, other_id, node_id, max_paths, max_depth)
+        else:
+            paths, truncated = [], False
+        result["paths"] = [[store.unique_ids[step] for step in path] for path in paths]
+        result["paths_truncated"] = truncated
+
+    return result
+
+
+async def get_lineage(
+    node: str,
+    project_dir: str = ".",
+    profiles_dir: Optional[str] = None,
+    **query: Any
+) -> Dict[str, Any]:
+    """
+    Answer a lineage query for a project, parsing it first if its manifest is missing or stale.
+
+    Args:
+        node: unique_id or name of the node
+        project_dir: Directory containing the dbt project
+        profiles_dir: Directory containing the profiles.yml file
+        **query: Further arguments of lineage()
+
+    Returns:
+        A result in the format of execute_dbt_command, with the lineage as its output
+    """
+    manifest, failure = await get_parsed_manifest(project_dir, profiles_dir)
+    if manifest is None:
+        return failure
+
+    try:
+        output = await asyncio.to_thread(
+            lambda: lineage(manifest.store, node, index=manifest.reachability, **query)
+        )
+    except LineageError as e:
+        return {"success": False, "output": None, "error": str(e), "returncode": 1}
+
+    return {
+        "success": True,
+        "output": output,
+        "error": None,
+        "returncode": 0,
+        "timed_out": False,
+        "scheduling": None,
+        "backend": "manifest"
+    }
@@ -0,0 +1,70 @@
+"""
+Log previews for the DBT CLI MCP Server.
+
+The command, formatter and tool code logs the start of each command's output.
+Building those previews with f-strings serializes the whole output (often
+megabytes of JSON) on every call, even when the log level discards the message.
+Preview objects defer the work until a handler actually formats the record, and
+stop serializing as soon as the preview is long enough.
+
+Usage:
+    logger.info("Output: %s", Preview(result["output"]))
+"""
+
+import json
+from itertools import islice
+from typing import Any
+
+# Default number of characters shown of a value
+PREVIEW_CHARS = 100
+
+# Encoder producing JSON in small chunks, so encoding can stop early
+_encoder = json.JSONEncoder(default=str)
+
+
+def preview(value: Any, limit: int = PREVIEW_CHARS) -> str:
+    """
+    Get the start of a value as it would be logged.
+
+    Strings are cut as they are; dicts and lists are serialized as JSON only up
+    to `limit` characters.
+
+    Args:
+        value: The value
+        limit: Maximum number of characters
+
+    Returns:
+        At most `limit` characters of the value
+    """
+    if isinstance(value, str):
+        return value[:limit]
+    if isinstance(value, (dict, list)):
+        text = ""
+        chunks = _encoder.iterencode(value)
+        while len(text) < limit:
+            batch = "".join(islice(chunks, 64))
+            if not batch:
+                break
+            text += batch
+        return text[:limit]
+    return str(value)[:limit]
+
+
+class Preview:
+    """
+    A value rendered with preview() only when a log record is formatted.
+    """
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value: Any, limit: int = PREVIEW_CHARS):
+        """
+        Args:
+            value: The value
+            limit: Maximum number of characters
+        """
+        self.value = value
+        self.limit = limit
+
+    def __str__(self) -> str:
+        return preview(self.value, self.limit)
@@ -0,0 +1,479 @@
+"""
+Manifest cache for the DBT CLI MCP Server.
+
+Several tools need information from a project's graph. Rather than spawning dbt
+or re-parsing a (possibly 100+ MB) manifest.json for every request, this module
+loads each project's manifest once and keeps it in a process-wide cache. Entries
+are keyed by the manifest's path and invalidated when its modification time, size
+or inode changes; the least recently used entries are evicted to stay within a
+memory budget.
+
+The cache holds compact manifests, which stream the file into a NodeStore
+rather than parsing the whole document.
+"""
+
+import re
+import json
+import asyncio
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from src.config import get_config
+from src.environment import get_environment
+from src.artifacts import file_signature
+from src.project import get_target_path
+from src.node_store import NodeStore
+from src.reachability import ReachabilityIndex
+from src.manifest_stream import load_node_store
+from src.manifest_index import load_indexed_node_store
+
+# Logger for this module
+logger = logging.getLogger(__name__)
+
+# Project configuration files that change what dbt parses
+PROJECT_FILES = ("dbt_project.yml", "packages.yml", "dependencies.yml", "selectors.yml")
+
+# Resource types of the manifest's nodes section, which dbt selects by name
+NODE_RESOURCE_TYPES = ("model", "seed", "snapshot", "analysis", "test")
+
+# Plain resource names, as opposed to selectors with methods, paths or graph operators
+RESOURCE_NAME_PATTERN = re.compile(r"\A\w+\Z")
+
+
+def split_source_paths(files: List[str]) -> Tuple[List[str], List[str]]:
+    """
+    Get the directories containing a project's files.
+
+    Args:
+        files: Paths relative to the project directory
+
+    Returns:
+        Tuple of (sorted files, sorted directories containing them)
+    """
+    directories = set()
+    for path in files:
+        parent = Path(path).parent
+        while parent != Path("."):
+            directories.add(str(parent))
+            parent = parent.parent
+    return sorted(set(files)), sorted(directories)
+
+
+class ManifestFile(ABC):
+    """
+    Base class for the views of a manifest.json file kept in a ManifestCache.
+    """
+
+    def __init__(self, path: Path, signature: tuple):
+        """
+        Args:
+            path: Path the manifest was loaded from
+            signature: file_signature() of the manifest when it was loaded
+        """
+        self.path = path
+        self.signature = signature
+        self._source_paths: Optional[Tuple[List[str], List[str]]] = None
+        self._reachability: Optional[ReachabilityIndex] = None
+        self._reachability_built = False
+        self._reachability_lock = threading.Lock()
+        # Set by the ManifestCache holding the view, to charge memory it allocates later
+        self.on_grow: Optional[Callable[["ManifestFile"], None]] = None
+
+    @property
+    def size(self) -> int:
+        """Size of the manifest file in bytes."""
+        return self.signature[1]
+
+    @property
+    def mtime_ns(self) -> int:
+        """Modification time of the manifest file."""
+        return self.signature[0]
+
+    @property
+    @abstractmethod
+    def memory_bytes(self) -> int:
+        """Approximate memory used by the view, counted against the cache's budget."""
+
+    @property
+    @abstractmethod
+    def node_store(self) -> NodeStore:
+        """Compact columnar view of the manifest's resources and graph."""
+
+    @property
+    def reachability(self) -> Optional[ReachabilityIndex]:
+        """
+        Ancestor and descendant bitsets of every node, built on first use.
+
+        None if the graph has more nodes than reachability_max_nodes (or the
+        index is disabled), or if it has a cycle. The index is built once, however
+        many threads ask for it, and charged to the holding cache's budget.
+        """
+        if self._reachability_built:
+            return self._reachability
+
+        with self._reachability_lock:
+            if not self._reachability_built:
+                max_nodes = get_config("reachability_max_nodes", 0)
+                store = self.node_store
+                if max_nodes and len(store) <= max_nodes:
+                    try:
+                        self._reachability = ReachabilityIndex(store)
+                        logger.debug(f"Built reachability index for {self.path} ({self._reachability.nbytes} bytes)")
+                    except ValueError as e:
+                        logger.warning(f"Not indexing reachability of {self.path}: {e}")
+                self._reachability_built = True
+                grown = self._reachability is not None
+            else:
+                grown = False
+
+        if grown and self.on_grow is not None:
+            self.on_grow(self)
+        return self._reachability
+
+    @abstractmethod
+    def _source_files(self) -> List[str]:
+        """Get the root project's files the manifest was parsed from."""
+
+    def source_paths(self) -> Tuple[List[str], List[str]]:
+        """
+        Get the root project's files the manifest was parsed from.
+
+        Returns:
+            Tuple of (files, directories containing them), relative to the project directory
+        """
+        if self._source_paths is None:
+            self._source_paths = split_source_paths(self._source_files())
+        return self._source_paths
+
+    def is_fresh(self, project_dir: str) -> bool:
+        """
+        Check whether the manifest reflects the project's current files.
+
+        The manifest is stale if any file it was parsed from changed or was removed
+        after it was written, if a directory holding those files changed (a file was
+        added, removed or renamed), or if the project's configuration changed.
+        Changes to variables or environment variables aren't detected.
+
+        Args:
+            project_dir: Directory containing the dbt project
+
+        Returns:
+            True if no project file is newer than the manifest
+        """
+        project_path = Path(project_dir).resolve()
+        files, directories = self.source_paths()
+
+        for name in PROJECT_FILES:
+            signature = file_signature(project_path / name)
+            if signature is not None and signature[0] > self.mtime_ns:
+                logger.debug(f"Manifest is stale: {name} changed")
+                return False
+
+        for path in files + directories:
+            signature = file_signature(project_path / path)
+            if signature is None or signature[0] > self.mtime_ns:
+                logger.debug(f"Manifest is stale: {path} changed or was removed")
+                return False
+        return True
+
+
+class CompactManifest(ManifestFile):
+    """
+    The node store of a manifest.json, streamed from the file without keeping
+    the parsed document.
+    """
+
+    def __init__(self, store: NodeStore, path: Path, signature: tuple):
+        """
+        Args:
+            store: The manifest's node store
+            path: Path the manifest was loaded from
+            signature: file_signature() of the manifest when it was loaded
+        """
+        super().__init__(path, signature)
+        self.store = store
+
+    @classmethod
+    def load(cls, path: Path, signature: tuple) -> "CompactManifest":
+        """
+        Stream a manifest.json file into a node store, or load the node store
+        from the manifest's persistent index if it is up to date.
+
+        Args:
+            path: Path of the manifest.json file
+            signature: file_signature() of the file before it was read
+
+        Returns:
+            The compact manifest
+        """
+        if get_config("manifest_index", True):
+            return cls(load_indexed_node_store(path, signature), path, signature)
+        return cls(load_node_store(path), path, signature)
+
+    @property
+    def memory_bytes(self) -> int:
+        """Approximate memory used by the node store and its reachability index."""
+        index_bytes = self._reachability.nbytes if self._reachability is not None else 0
+        return self.store.nbytes + index_bytes
+
+    @property
+    def node_store(self) -> NodeStore:
+        """The manifest's node store."""
+        return self.store
+
+    @property
+    def project_name(self) -> Optional[str]:
+        """Name of the root project."""
+        return self.store.project_name
+
+    def _source_files(self) -> List[str]:
+        return self.store.source_files
+
+
+class ManifestCache:
+    """
+    Process-wide LRU cache of manifests.
+
+    The memory budget is charged with each view's memory_bytes. Loads of the
+    same manifest from several threads are serialized, so it is read only once.
+    """
+
+    def __init__(self, loader: Callable[[Path, tuple], ManifestFile]):
+        """
+        Args:
+            loader: Function loading a manifest from its path and file signature
+        """
+        self.loader = loader
+        self._entries: "OrderedDict[Path, ManifestFile]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks: Dict[Path, threading.Lock] = {}
+
+    @property
+    def total_bytes(self) -> int:
+        """Combined memory budget used by the cached manifests."""
+        return sum(manifest.memory_bytes for manifest in self._entries.values())
+
+    def _cached(self, path: Path, signature: tuple) -> Optional[ManifestFile]:
+        """Get a cached manifest if it matches the file's current signature."""
+        with self._lock:
+            manifest = self._entries.get(path)
+            if manifest is not None and manifest.signature == signature:
+                self._entries.move_to_end(path)
+                return manifest
+            return None
+
+    def _store(self, manifest: ManifestFile) -> None:
+        """Add a manifest, evicting the least recently used ones beyond the budget."""
+        manifest.on_grow = self._charge
+        with self._lock:
+            self._entries[manifest.path] = manifest
+            self._evict(manifest.path)
+
+    def _charge(self, manifest: ManifestFile) -> None:
+        """Re-check the budget after a cached manifest allocated more memory, e.g. its reachability index."""
+        with self._lock:
+            if self._entries.get(manifest.path) is manifest:
+                self._evict(manifest.path)
+
+    def _evict(self, path: Path) -> None:
+        """Mark a manifest as the most recently used and evict others beyond the budget. Call with the lock held."""
+        max_bytes = int(get_config("manifest_cache_max_mb", 0) * 1024 * 1024)
+        self._entries.move_to_end(path)
+        while max_bytes and len(self._entries) > 1 and self.total_bytes > max_bytes:
+            evicted_path, _ = self._entries.popitem(last=False)
+            logger.debug(f"Evicted manifest {evicted_path} from cache")
+
+    def get(self, path: Path) -> Optional[ManifestFile]:
+        """
+        Get the manifest at a path, loading it if it isn't cached or has changed.
+
+        Args:
+            path: Path of a manifest.json file
+
+        Returns:
+            The manifest, or None if it doesn't exist or can't be parsed
+        """
+        path = path.resolve()
+        signature = file_signature(path)
+        if signature is None:
+            return None
+
+        manifest = self._cached(path, signature)
+        if manifest is not None:
+            return manifest
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(path, threading.Lock())
+
+        with load_lock:
+            # Another thread may have loaded it while we waited
+            signature = file_signature(path)
+            if signature is None:
+                return None
+            manifest = self._cached(path, signature)
+            if manifest is not None:
+                return manifest
+
+            logger.info(f"Loading manifest {path} ({signature[1]} bytes)")
+            try:
+                # Keep the signature from before the read, so a manifest rewritten
+                # during the read is reloaded on the next access
+                manifest = self.loader(path, signature)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Failed to load manifest {path}: {e}")
+                return None
+            self._store(manifest)
+            return manifest
+
+    def paths(self) -> List[Path]:
+        """Get the resolved paths of the cached manifests."""
+        with self._lock:
+            return list(self._entries)
+
+    def invalidate(self, path: Optional[Path] = None) -> None:
+        """
+        Drop a cached manifest, or all of them.
+
+        Args:
+            path: Path of the manifest to drop (all manifests if None)
+        """
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(path.resolve(), None)
+
+
+# Cache shared by all tool calls
+compact_manifest_cache = ManifestCache(CompactManifest.load)
+
+
+def get_manifest_path(project_dir: str, env: Optional[Mapping[str, str]] = None) -> Path:
+    """
+    Get the path of a project's canonical manifest.json.
+
+    Args:
+        project_dir: Directory containing the dbt project
+        env: Environment variables the project's commands run with
+
+    Returns:
+        Path of manifest.json in the project's target directory
+    """
+    return get_target_path(project_dir, env) / "manifest.json"
+
+
+def get_compact_manifest(project_dir: str, env: Optional[Mapping[str, str]] = None) -> Optional[CompactManifest]:
+    """
+    Get a project's compact manifest from the cache.
+
+    This may stream the manifest, so call it through asyncio.to_thread from
+    async code.
+
+    Args:
+        project_dir: Directory containing the dbt project
+        env: Environment variables the project's commands run with
+
+    Returns:
+        The compact manifest, or None if the project hasn't been parsed yet
+    """
+    return compact_manifest_cache.get(get_manifest_path(project_dir, env))
+
+
+def load_fresh_manifest(project_dir: str, env: Dict[str, str]) -> Optional[CompactManifest]:
+    """Get the project's compact manifest if it is up to date."""
+    manifest = get_compact_manifest(project_dir, env)
+    if manifest is None or not manifest.is_fresh(project_dir):
+        return None
+    return manifest
+
+
+async def get_parsed_manifest(
+    project_dir: str,
+    profiles_dir: Optional[str] = None
+) -> Tuple[Optional[CompactManifest], Optional[Dict[str, Any]]]:
+    """
+    Get a project's compact manifest, running dbt parse first if it is missing or stale.
+
+    Args:
+        project_dir: Directory containing the dbt project
+        profiles_dir: Directory containing the profiles.yml file
+
+    Returns:
+        Tuple of (the manifest, None), or (None, a failed result in the format
+        of execute_dbt_command) if the project couldn't be parsed
+    """
+    env_vars = get_environment(project_dir, profiles_dir)
+    manifest = await asyncio.to_thread(load_fresh_manifest, project_dir, env_vars)
+    if manifest is not None:
+        return manifest, None
+
+    # Imported here because src.command imports this module (through src.selector)
+    from src.command import execute_dbt_command
+
+    logger.info("Manifest is missing or stale, running dbt parse")
+    result = await execute_dbt_command(["parse"], project_dir, profiles_dir)
+    if not result["success"]:
+        return None, result
+    manifest = await asyncio.to_thread(get_compact_manifest, project_dir, env_vars)
+    if manifest is None:
+        return None, {
+            "success": False,
+            "output": None,
+            "error": "dbt parse did not write a manifest",
+            "returncode": 1
+        }
+    return manifest, None
+
+
+async def find_nodes_by_name(name: str, project_dir: str, profiles_dir: Optional[str] = None) -> Optional[List[str]]:
+    """
+    Look up the nodes dbt would select by a plain name, without running dbt.
+
+    Args:
+        name: The node name (e.g. "customers")
+        project_dir: Directory containing the dbt project
+        profiles_dir: Directory containing the profiles.yml file
+
+    Returns:
+        unique_ids of the matching nodes (empty if none exist), or None if the
+        name isn't a plain name, the manifest is missing or stale, or no node has
+        the name but it is a package or part of a resource's fully qualified name
+    """
+    if not RESOURCE_NAME_PATTERN.match(name):
+        return None
+
+    env_vars = get_environment(project_dir, profiles_dir)
+
+    def lookup() -> Optional[List[str]]:
+        manifest = get_compact_manifest(project_dir, env_vars)
+        if manifest is None or not manifest.is_fresh(project_dir):
+            return None
+        store = manifest.store
+        matches = [
+            store.unique_ids[node_id] for node_id in store.find_by_name(name)
+            if store.value(node_id, "resource_type") in NODE_RESOURCE_TYPES
+        ]
+        if not matches and _is_fqn_component(store, name):
+            # dbt also selects packages and folders by name, so let dbt decide
+            return None
+        return matches
+
+    return await asyncio.to_thread(lookup)
+
+
+def _is_fqn_component(store: NodeStore, name: str) -> bool:
+    """Check whether a name is a package, or part of any resource's fully qualified name."""
+    strings = store.strings
+    code = strings.codes.get(name)
+    if code is not None and code in store.columns["package_name"]:
+        return True
+    # fqns are stored as JSON, so only decode those containing the name
+    needle = json.dumps(name)
+    return any(
+        needle in strings[fqn_code] and name in json.loads(strings[fqn_code])
+        for fqn_code in set(store.columns["fqn"]) if fqn_code
+    )
@@ -0,0 +1,390 @@
+"""
+Persistent manifest index for the DBT CLI MCP Server.
+
+The in-memory manifest caches are lost whenever the server restarts. This module
+keeps an SQLite index of each project's manifest next to it in the target
+directory, with tables for nodes, edges, graph maps, columns, tests, sources,
+macros and file paths. The index is updated while the manifest is streamed: every entry's
+digest is compared with the indexed one, and only changed entries are rewritten.
+A server that starts cold loads its node store from the index instead of
+re-parsing manifest.json, as long as the manifest hasn't changed since.
+"""
+
+import json
+import sqlite3
+import hashlib
+import logging
+from itertools import groupby
+from pathlib import Path
+from typing import Any, Dict, List, Set
+
+from src.node_store import STORED_COLUMNS, STORED_SECTIONS, NodeStore, NodeStoreBuilder, project_node, resource_files
+from src.manifest_stream import load_node_store
+
+# Logger for this module
+logger = logging.getLogger(__name__)
+
+# Name of the index file, in the manifest's directory
+INDEX_FILE = ".mcp_index.sqlite"
+
+# Version of the schema below; indexes with another version are rebuilt
+SCHEMA_VERSION = "3"
+
+# Number of changed entries whose rows are written at once
+WRITE_BATCH_SIZE = 2000
+
+# Tables holding rows of indexed entries, keyed by the entry's unique_id column
+ENTRY_TABLES = {
+    "nodes": "unique_id",
+    "sources": "unique_id",
+    "tests": "unique_id",
+    "columns": "unique_id",
+    "macros": "unique_id",
+    "files": "unique_id",
+    "edges": "child",
+    "graph_maps": "entry",
+}
+
+# Manifest sections mapping each node to its parents or children
+GRAPH_MAP_SECTIONS = ("parent_map", "child_map")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS entries (unique_id TEXT PRIMARY KEY, section TEXT NOT NULL, digest TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS nodes (
+    unique_id TEXT PRIMARY KEY,
+    name TEXT,
+    resource_type TEXT,
+    package_name TEXT,
+    original_file_path TEXT,
+    database TEXT,
+    schema TEXT,
+    alias TEXT,
+    source_name TEXT,
+    materialized TEXT,
+    patch_path TEXT,
+    fqn TEXT,
+    version TEXT,
+    config TEXT,
+    depends_on TEXT,
+    tags TEXT NOT NULL,
+    description TEXT,
+    checksum TEXT
+);
+CREATE INDEX IF NOT EXISTS nodes_name ON nodes (name);
+CREATE TABLE IF NOT EXISTS edges (parent TEXT NOT NULL, child TEXT NOT NULL, PRIMARY KEY (child, parent));
+CREATE INDEX IF NOT EXISTS edges_parent ON edges (parent);
+CREATE TABLE IF NOT EXISTS graph_maps (entry TEXT NOT NULL, neighbour TEXT NOT NULL, PRIMARY KEY (entry, neighbour));
+CREATE TABLE IF NOT EXISTS columns (
+    unique_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    data_type TEXT,
+    description TEXT,
+    PRIMARY KEY (unique_id, name)
+);
+CREATE TABLE IF NOT EXISTS tests (
+    unique_id TEXT PRIMARY KEY,
+    test_name TEXT,
+    attached_node TEXT,
+    column_name TEXT
+);
+CREATE INDEX IF NOT EXISTS tests_attached_node ON tests (attached_node);
+CREATE TABLE IF NOT EXISTS sources (
+    unique_id TEXT PRIMARY KEY,
+    source_name TEXT,
+    identifier TEXT,
+    loader TEXT,
+    loaded_at_field TEXT
+);
+CREATE TABLE IF NOT EXISTS macros (
+    unique_id TEXT PRIMARY KEY,
+    name TEXT,
+    package_name TEXT,
+    original_file_path TEXT,
+    description TEXT
+);
+CREATE TABLE IF NOT EXISTS files (
+    unique_id TEXT NOT NULL,
+    package_name TEXT,
+    path TEXT NOT NULL,
+    PRIMARY KEY (unique_id, path)
+);
+"""
+
+
+def get_index_path(manifest_path: Path) -> Path:
+    """
+    Get the path of a manifest's index.
+
+    Args:
+        manifest_path: Path of the manifest.json file
+
+    Returns:
+        Path of the SQLite index next to it
+    """
+    return manifest_path.parent / INDEX_FILE
+
+
+def open_index(path: Path) -> sqlite3.Connection:
+    """
+    Open an index, creating it (or recreating it if its schema is outdated).
+
+    Args:
+        path: Path of the index file
+
+    Returns:
+        The connection
+    """
+    connection = sqlite3.connect(str(path), timeout=10)
+    # The index can always be rebuilt from the manifest, so favour write speed
+    connection.execute("PRAGMA journal_mode = WAL")
+    connection.execute("PRAGMA synchronous = OFF")
+    try:
+        version = connection.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+    except sqlite3.OperationalError:
+        version = None
+    if version is None or version[0] != SCHEMA_VERSION:
+        tables = [row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        for table in tables:
+            connection.execute(f'DROP TABLE "{table}"')
+        connection.executescript(SCHEMA)
+        connection.execute("INSERT INTO meta VALUES ('schema_version', ?)", (SCHEMA_VERSION,))
+        connection.commit()
+    return connection
+
+
+def entry_key(section: str, unique_id: str) -> str:
+    """
+    Get the key an entry of the manifest is indexed under. Entries of the graph
+    maps share their unique_id with a resource, so their keys are prefixed with
+    the section.
+
+    Args:
+        section: The manifest section
+        unique_id: The entry's unique_id
+
+    Returns:
+        The key
+    """
+    return f"{section}:{unique_id}" if section in GRAPH_MAP_SECTIONS else unique_id
+
+
+def entry_rows(section: str, unique_id: str, entry: Any) -> Dict[str, List[tuple]]:
+    """
+    Get the rows an entry of the manifest is indexed as.
+
+    Args:
+        section: The manifest section ("nodes", "sources", "macros", "parent_map", ...)
+        unique_id: The entry's unique_id
+        entry: The entry; for the graph maps, the unique_ids of the node's parents or children
+
+    Returns:
+        Dictionary mapping table names to rows
+    """
+    if section in GRAPH_MAP_SECTIONS:
+        key = entry_key(section, unique_id)
+        return {"graph_maps": [(key, neighbour) for neighbour in sorted(set(entry))]}
+
+    rows: Dict[str, List[tuple]] = {
+        "files": [(unique_id, entry.get("package_name"), path) for path in sorted(set(resource_files(entry)))]
+    }
+
+    if section == "macros":
+        rows["macros"] = [(
+            unique_id, entry.get("name"), entry.get("package_name"),
+            entry.get("original_file_path"), entry.get("description")
+        )]
+        return rows
+    if section not in STORED_SECTIONS:
+        return rows
+
+    fields = project_node(entry)
+    checksum = (entry.get("checksum") or {}).get("checksum")
+    rows["nodes"] = [(
+        unique_id, *(fields[column] for column in STORED_COLUMNS),
+        json.dumps(fields["tags"]), entry.get("description"), checksum
+    )]
+    rows["edges"] = [
+        (parent, unique_id) for parent in sorted(set((entry.get("depends_on") or {}).get("nodes") or []))
+    ]
+    rows["columns"] = [
+        (unique_id, name, column.get("data_type"), column.get("description"))
+        for name, column in (entry.get("columns") or {}).items() if isinstance(column, dict)
+    ]
+    if fields["resource_type"] == "test":
+        metadata = entry.get("test_metadata") or {}
+        rows["tests"] = [(unique_id, metadata.get("name"), entry.get("attached_node"), entry.get("column_name"))]
+    if section == "sources":
+        rows["sources"] = [(
+            unique_id, entry.get("source_name"), entry.get("identifier"),
+            entry.get("loader"), entry.get("loaded_at_field")
+        )]
+    return rows
+
+
+class ManifestIndexWriter:
+    """
+    Incrementally updates an index from the entries of a manifest as they are streamed.
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        """
+        Args:
+            connection: Connection to the index
+        """
+        self.connection = connection
+        self.digests: Dict[str, str] = dict(connection.execute("SELECT unique_id, digest FROM entries"))
+        self.seen: Set[str] = set()
+        self.changed = 0
+        self.pending_deletes: List[str] = []
+        self.pending_rows: Dict[str, List[tuple]] = {}
+
+    def _flush(self) -> None:
+        """Write the pending deletes and rows."""
+        deletes = [(unique_id,) for unique_id in self.pending_deletes]
+        if deletes:
+            self.connection.executemany("DELETE FROM entries WHERE unique_id = ?", deletes)
+            for table, key in ENTRY_TABLES.items():
+                self.connection.executemany(f"DELETE FROM {table} WHERE {key} = ?", deletes)
+        for table, rows in self.pending_rows.items():
+            placeholders = ", ".join("?" * len(rows[0]))
+            self.connection.executemany(f"INSERT OR REPLACE INTO {table} VALUES ({placeholders})", rows)
+        self.pending_deletes = []
+        self.pending_rows = {}
+
+    def add(self, section: str, unique_id: str, entry: Any) -> None:
+        """
+        Index an entry, unless it is unchanged since it was last indexed.
+
+        Args:
+            section: The manifest section
+            unique_id: The entry's unique_id
+            entry: The entry
+        """
+        key = entry_key(section, unique_id)
+        rows = entry_rows(section, unique_id, entry)
+        # The rows hold only strings and None, so their repr is a stable serialization
+        digest = hashlib.sha1(repr((section, sorted(rows.items()))).encode()).hexdigest()
+        self.seen.add(key)
+        if self.digests.get(key) == digest:
+            return
+
+        if key in self.digests:
+            self.pending_deletes.append(key)
+        rows["entries"] = [(key, section, digest)]
+        for table, table_rows in rows.items():
+            if table_rows:
+                self.pending_rows.setdefault(table, []).extend(table_rows)
+        self.changed += 1
+        if self.changed % WRITE_BATCH_SIZE == 0:
+            self._flush()
+
+    def finish(self, metadata: Dict[str, Any], signature: tuple, default_selectors: List[str] = ()) -> None:
+        """
+        Remove the entries that are no longer in the manifest, and record which
+        manifest the index reflects.
+
+        Args:
+            metadata: The manifest's metadata
+            signature: file_signature() of the manifest
+            default_selectors: Names of the manifest's default selectors
+        """
+        removed = [unique_id for unique_id in self.digests if unique_id not in self.seen]
+        self.pending_deletes.extend(removed)
+        self._flush()
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+            [
+                ("metadata", json.dumps(metadata)),
+                ("default_selectors", json.dumps(list(default_selectors))),
+                ("manifest_signature", json.dumps(list(signature))),
+            ]
+        )
+        self.connection.commit()
+        logger.info(f"Updated manifest index: {self.changed} entries written, {len(removed)} removed")
+
+
+def read_index(connection: sqlite3.Connection) -> NodeStore:
+    """
+    Build a node store from an index.
+
+    Args:
+        connection: Connection to the index
+
+    Returns:
+        The node store
+    """
+    builder = NodeStoreBuilder()
+    metadata = connection.execute("SELECT value FROM meta WHERE key = 'metadata'").fetchone()
+    builder.metadata = json.loads(metadata[0]) if metadata else {}
+    default_selectors = connection.execute("SELECT value FROM meta WHERE key = 'default_selectors'").fetchone()
+    builder.default_selectors = json.loads(default_selectors[0]) if default_selectors else []
+
+    column_names = ", ".join(STORED_COLUMNS)
+    for row in connection.execute(f"SELECT unique_id, {column_names}, tags FROM nodes"):
+        fields = dict(zip(STORED_COLUMNS, row[1:-1]))
+        fields["tags"] = json.loads(row[-1])
+        builder.add_node(row[0], fields)
+
+    edges = connection.execute("SELECT child, parent FROM edges ORDER BY child")
+    for child, group in groupby(edges, key=lambda edge: edge[0]):
+        builder.add_dependencies(child, [parent for _, parent in group])
+
+    # Like the streamed store, prefer the graph maps to depends_on when the manifest has them
+    graph_maps = connection.execute(
+        "SELECT entries.section, entries.unique_id, graph_maps.neighbour FROM entries "
+        "LEFT JOIN graph_maps ON graph_maps.entry = entries.unique_id "
+        "WHERE entries.section IN (?, ?) ORDER BY entries.unique_id",
+        GRAPH_MAP_SECTIONS
+    )
+    for (section, key), group in groupby(graph_maps, key=lambda row: row[:2]):
+        add_edges = builder.add_parents if section == "parent_map" else builder.add_children
+        add_edges(key[len(section) + 1:], [neighbour for _, _, neighbour in group if neighbour is not None])
+
+    for package_name, path in connection.execute("SELECT package_name, path FROM files"):
+        builder.add_files(package_name, [path])
+    return builder.build()
+
+
+def load_indexed_node_store(manifest_path: Path, signature: tuple) -> NodeStore:
+    """
+    Get a manifest's node store from its index if the index is up to date, or
+    stream the manifest and update the index otherwise.
+
+    Errors reading or writing the index are logged and the manifest is streamed
+    as if there were no index.
+
+    Args:
+        manifest_path: Path of the manifest.json file
+        signature: file_signature() of the manifest
+
+    Returns:
+        The node store
+
+    Raises:
+        OSError: If the manifest can't be read
+        ValueError: If the manifest isn't valid
+    """
+    index_path = get_index_path(manifest_path)
+    try:
+        connection = open_index(index_path)
+    except sqlite3.Error as e:
+        logger.warning(f"Can't open manifest index {index_path}: {e}")
+        return load_node_store(manifest_path)
+
+    try:
+        indexed = connection.execute("SELECT value FROM meta WHERE key = 'manifest_signature'").fetchone()
+        if indexed is not None and tuple(json.loads(indexed[0])) == tuple(signature):
+            logger.info(f"Loading node store from manifest index {index_path}")
+            return read_index(connection)
+
+        writer = ManifestIndexWriter(connection)
+        store = load_node_store(manifest_path, on_entry=writer.add)
+        writer.finish(store.metadata, signature, store.default_selectors)
+        return store
+    except sqlite3.Error as e:
+        logger.warning(f"Manifest index {index_path} failed: {e}")
+        connection.rollback()
+        return load_node_store(manifest_path)
+    finally:
+        connection.close()
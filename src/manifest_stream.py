@@ -0,0 +1,253 @@
+"""
+Streaming manifest reader for the DBT CLI MCP Server.
+
+json.load of a large manifest.json holds the whole file and the full object tree
+in memory, although the tools only need a few fields of each node. This module
+reads the manifest incrementally instead: the file is read in chunks, and the
+top-level sections are walked one entry at a time, so only one node is decoded
+at any moment. The projected fields are added to a NodeStoreBuilder as they are
+read, and the rest of each entry is dropped straight away.
+"""
+
+import re
+import json
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, TextIO, Tuple
+
+from src.node_store import (
+    NodeStore,
+    NodeStoreBuilder,
+    SOURCE_FILE_SECTIONS,
+    STORED_SECTIONS,
+    project_node,
+    resource_files,
+)
+
+# Logger for this module
+logger = logging.getLogger(__name__)
+
+# Number of characters read from the file at a time
+CHUNK_SIZE = 1024 * 1024
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# Characters that can continue a number that was decoded up to the end of a chunk
+NUMBER_CHARACTERS = "0123456789.eE+-"
+
+
+class JSONStreamReader:
+    """
+    Incremental reader for a JSON document made of nested objects.
+
+    Objects are walked key by key with keys(); after each key, the caller
+    consumes its value with value(), skip() or a nested keys(). Only the
+    current chunk of the file and the value being decoded are held in memory.
+    """
+
+    def __init__(self, f: TextIO, chunk_size: int = CHUNK_SIZE):
+        """
+        Args:
+            f: The file, opened in text mode
+            chunk_size: Number of characters to read at a time
+        """
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, min_size: int = 0) -> bool:
+        """
+        Append the next chunk of the file to the unread part of the buffer.
+
+        Args:
+            min_size: Read at least this many characters
+
+        Returns:
+            False if the end of the file was reached
+        """
+        if self.eof:
+            return False
+        chunk = self.f.read(max(self.chunk_size, min_size))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and get the next character ("" at the end of the file)."""
+        while True:
+            self.pos = WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, characters: str) -> str:
+        """Consume the next character, which must be one of `characters`."""
+        character = self.peek()
+        if not character or character not in characters:
+            raise ValueError(f"Expected one of {characters!r}, found {character or 'end of file'!r}")
+        self.pos += 1
+        return character
+
+    def value(self) -> Any:
+        """
+        Decode the next value.
+
+        Returns:
+            The decoded value
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # The value may continue in the next chunk; read at least as much
+                # again as is pending, so long values are decoded a bounded number of times
+                if not self._fill(len(self.buffer) - self.pos):
+                    raise
+                continue
+            # A number cut off by the end of the buffer may continue in the next chunk
+            number_cut = isinstance(value, (int, float)) and (
+                end == len(self.buffer) or self.buffer[end] in NUMBER_CHARACTERS
+            )
+            if number_cut and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def skip(self) -> None:
+        """
+        Consume the next value without keeping it. Objects are skipped one entry
+        at a time, so skipping a large section never decodes it as a whole.
+        """
+        if self.peek() == "{":
+            for _ in self.keys():
+                self.value()
+        else:
+            self.value()
+
+    def keys(self) -> Iterator[str]:
+        """
+        Walk the next value, which must be an object.
+
+        Yields:
+            Each key of the object; its value must be consumed before the next one is read
+        """
+        self._expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise ValueError(f"Expected an object key, found {key!r}")
+            self._expect(":")
+            yield key
+            if self._expect(",}") == "}":
+                return
+
+
+# Callback receiving each streamed entry: (section, unique_id, entry); entries
+# of the graph maps are lists of unique_ids
+EntryCallback = Callable[[str, str, Any], None]
+
+
+def read_node_store(f: TextIO, chunk_size: int = CHUNK_SIZE, on_entry: Optional[EntryCallback] = None) -> NodeStore:
+    """
+    Build a node store from a manifest without loading the whole document.
+
+    Args:
+        f: The manifest.json file, opened in text mode
+        chunk_size: Number of characters to read at a time
+        on_entry: Called with every resource, macro and doc block, and every
+                  entry of the graph maps, as it is read
+
+    Returns:
+        The node store
+    """
+    reader = JSONStreamReader(f, chunk_size)
+    builder = NodeStoreBuilder()
+
+    for section in reader.keys():
+        if section == "metadata":
+            builder.metadata = reader.value() or {}
+        elif section == "selectors":
+            builder.add_selectors(reader.value() or {})
+        elif section in ("parent_map", "child_map") and reader.peek() == "{":
+            add_edges = builder.add_parents if section == "parent_map" else builder.add_children
+            for unique_id in reader.keys():
+                neighbours = reader.value() or []
+                if on_entry is not None:
+                    on_entry(section, unique_id, neighbours)
+                add_edges(unique_id, neighbours)
+        elif section in SOURCE_FILE_SECTIONS and reader.peek() == "{":
+            for unique_id in reader.keys():
+                resource = reader.value()
+                if not isinstance(resource, dict):
+                    continue
+                if on_entry is not None:
+                    on_entry(section, unique_id, resource)
+                builder.add_files(resource.get("package_name"), resource_files(resource))
+                if section in STORED_SECTIONS:
+                    builder.add_node(unique_id, project_node(resource))
+                    builder.add_dependencies(unique_id, (resource.get("depends_on") or {}).get("nodes") or [])
+        else:
+            reader.skip()
+
+    return builder.build()
+
+
+def load_node_store(path: Path, on_entry: Optional[EntryCallback] = None) -> NodeStore:
+    """
+    Build a node store from a manifest.json file by streaming it.
+
+    Args:
+        path: Path of the manifest.json file
+        on_entry: Called with every resource, macro and doc block, and every
+                  entry of the graph maps, as it is read
+
+    Returns:
+        The node store
+
+    Raises:
+        OSError: If the file can't be read
+        ValueError: If the file isn't a valid manifest
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        store = read_node_store(f, on_entry=on_entry)
+    logger.debug(f"Streamed {len(store)} nodes and {store.edge_count} edges from {path}")
+    return store
+
+
+def stream_entries(path: Path, sections: Iterable[str]) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+    """
+    Stream the entries of some sections of a JSON artifact (manifest.json, catalog.json).
+
+    Args:
+        path: Path of the file
+        sections: Top-level sections whose entries are wanted; the others are skipped
+
+    Yields:
+        Tuples of (section, key, entry) for every object entry of these sections
+
+    Raises:
+        OSError: If the file can't be read
+        ValueError: If the file isn't valid JSON
+    """
+    sections = set(sections)
+    with open(path, "r", encoding="utf-8") as f:
+        reader = JSONStreamReader(f)
+        for section in reader.keys():
+            if section not in sections or reader.peek() != "{":
+                reader.skip()
+                continue
+            for key in reader.keys():
+                entry = reader.value()
+                if isinstance(entry, dict):
+                    yield section, key, entry
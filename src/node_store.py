@@ -0,0 +1,527 @@
+"""
+Compact node storage for the DBT CLI MCP Server.
+
+Loading manifest.json into plain dictionaries repeats every key and most string
+values (package names, schemas, materializations, ...) for every node, which
+costs gigabytes for very large projects. This module keeps the fields the tools
+need in columns instead: nodes get integer ids, strings are interned once into a
+shared table and stored as integer codes, and graph adjacency is stored as
+compressed sparse row (CSR) integer arrays.
+"""
+
+import sys
+import json
+import logging
+from array import array
+from itertools import accumulate
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# Logger for this module
+logger = logging.getLogger(__name__)
+
+# Manifest sections whose resources are stored
+STORED_SECTIONS = ("nodes", "sources", "exposures", "metrics", "semantic_models", "saved_queries", "unit_tests")
+
+# Manifest sections whose entries come from the project's files
+SOURCE_FILE_SECTIONS = STORED_SECTIONS + ("macros", "docs")
+
+# String columns stored for each node, and where their values come from
+# (a top-level key, or a key of the node's config)
+COLUMNS = (
+    ("name", "name"),
+    ("resource_type", "resource_type"),
+    ("package_name", "package_name"),
+    ("original_file_path", "original_file_path"),
+    ("database", "database"),
+    ("schema", "schema"),
+    ("alias", "alias"),
+    ("source_name", "source_name"),
+    ("materialized", "config.materialized"),
+)
+
+# Further string columns, kept for in-process node selection but not part of NodeRecord
+SELECTION_COLUMNS = (
+    ("patch_path", "patch_path"),
+)
+
+# Top-level keys stored as compact JSON text, interned like the string columns
+# so that, for example, the identical configs of a folder's models are stored once
+JSON_COLUMNS = ("fqn", "version", "config", "depends_on")
+
+# Names of all columns of a store
+STORED_COLUMNS = tuple(column for column, _ in COLUMNS + SELECTION_COLUMNS) + JSON_COLUMNS
+
+# Separators of the stored JSON text
+JSON_SEPARATORS = (",", ":")
+
+# Array type code for node ids and string codes (unsigned int, at least 4 bytes)
+INDEX_TYPE = "I" if array("I").itemsize >= 4 else "L"
+
+
+def project_node(resource: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extract the stored fields of a manifest resource.
+
+    Args:
+        resource: The resource from manifest.json
+
+    Returns:
+        Dictionary with the column values (JSON columns as JSON text) and the resource's tags
+    """
+    fields: Dict[str, Any] = {}
+    for column, source in COLUMNS + SELECTION_COLUMNS:
+        if source.startswith("config."):
+            value = (resource.get("config") or {}).get(source[len("config."):])
+        else:
+            value = resource.get(source)
+        fields[column] = value if isinstance(value, str) else None
+    for column in JSON_COLUMNS:
+        value = resource.get(column)
+        fields[column] = None if value is None else json.dumps(value, separators=JSON_SEPARATORS)
+    fields["tags"] = [tag for tag in resource.get("tags") or [] if isinstance(tag, str)]
+    return fields
+
+
+def resource_files(resource: Dict[str, Any]) -> List[str]:
+    """
+    Get the files a manifest entry was parsed from.
+
+    Args:
+        resource: The entry from manifest.json (a resource, macro or doc block)
+
+    Returns:
+        Paths relative to the package's directory
+    """
+    files = []
+    if resource.get("original_file_path"):
+        files.append(resource["original_file_path"])
+    if resource.get("patch_path"):
+        files.append(resource["patch_path"].split("://", 1)[-1])
+    return files
+
+
+class StringTable:
+    """
+    Interns strings as integer codes. Code 0 stands for None.
+    """
+
+    def __init__(self):
+        self.strings: List[Optional[str]] = [None]
+        self.codes: Dict[str, int] = {}
+
+    def code(self, value: Optional[str]) -> int:
+        """
+        Get the code of a string, adding it to the table if needed.
+
+        Args:
+            value: The string (or None)
+
+        Returns:
+            The string's code
+        """
+        if value is None:
+            return 0
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.strings)
+            self.strings.append(value)
+            self.codes[value] = code
+        return code
+
+    def __getitem__(self, code: int) -> Optional[str]:
+        return self.strings[code]
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+
+class EdgeList:
+    """
+    Edges collected as flat arrays of (source, target) node ids, compacted into
+    compressed sparse row (CSR) form once all of them are known.
+    """
+
+    def __init__(self):
+        self.sources = array(INDEX_TYPE)
+        self.targets = array(INDEX_TYPE)
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+    def add(self, source: int, targets: Iterable[int]) -> None:
+        """
+        Add edges from a node.
+
+        Args:
+            source: The source node id
+            targets: The target node ids
+        """
+        for target in targets:
+            self.sources.append(source)
+            self.targets.append(target)
+
+    def clear(self) -> None:
+        """Remove all edges."""
+        self.sources = array(INDEX_TYPE)
+        self.targets = array(INDEX_TYPE)
+
+    def csr(self, node_count: int, reverse: bool = False, sort: bool = True) -> Tuple[array, array]:
+        """
+        Build the compressed sparse row representation of the edges.
+
+        Args:
+            node_count: Number of nodes
+            reverse: Build the adjacency of the reversed edges
+            sort: Sort each node's targets (otherwise they keep the order they were added in)
+
+        Returns:
+            Tuple of (offsets, targets): the neighbours of node i are
+            targets[offsets[i]:offsets[i + 1]]
+        """
+        sources, targets = (self.targets, self.sources) if reverse else (self.sources, self.targets)
+
+        counts = [0] * (node_count + 1)
+        for source in sources:
+            counts[source + 1] += 1
+        offsets = array(INDEX_TYPE, accumulate(counts))
+
+        result = array(INDEX_TYPE, bytes(len(targets) * offsets.itemsize))
+        positions = list(offsets[:-1])
+        for source, target in zip(sources, targets):
+            result[positions[source]] = target
+            positions[source] += 1
+
+        if sort:
+            for node_id in range(node_count):
+                start, end = offsets[node_id], offsets[node_id + 1]
+                if end - start > 1:
+                    result[start:end] = array(INDEX_TYPE, sorted(result[start:end]))
+        return offsets, result
+
+
+class NodeRecord:
+    """
+    A node's stored fields, materialized from the store's columns.
+    """
+
+    __slots__ = ("id", "unique_id", "tags") + tuple(column for column, _ in COLUMNS)
+
+    def __init__(self, store: "NodeStore", node_id: int):
+        self.id = node_id
+        self.unique_id = store.unique_ids[node_id]
+        for column, _ in COLUMNS:
+            setattr(self, column, store.strings[store.columns[column][node_id]])
+        self.tags = store.tags(node_id)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the record as a dictionary.
+
+        Returns:
+            Dictionary with unique_id, the column values and tags
+        """
+        return {name: getattr(self, name) for name in self.__slots__ if name != "id"}
+
+
+class NodeStoreBuilder:
+    """
+    Incrementally builds a NodeStore, from a parsed manifest or a stream of nodes.
+    """
+
+    def __init__(self):
+        self.strings = StringTable()
+        self.unique_ids: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.columns = {column: array(INDEX_TYPE) for column in STORED_COLUMNS}
+        self.tags = EdgeList()
+        self.parents = EdgeList()
+        self.children = EdgeList()
+        self.dependencies = EdgeList()
+        self.has_parent_map = False
+        self.has_child_map = False
+        self.metadata: Dict[str, Any] = {}
+        self.package_files: Dict[str, Set[str]] = {}
+        self.default_selectors: List[str] = []
+
+    def _node_id(self, unique_id: str) -> int:
+        """
+        Get a node's id, adding a node with empty fields if it hasn't been seen
+        (nodes only referenced by the graph maps keep empty fields).
+        """
+        node_id = self.index.get(unique_id)
+        if node_id is None:
+            node_id = len(self.unique_ids)
+            self.unique_ids.append(unique_id)
+            self.index[unique_id] = node_id
+            for column in self.columns.values():
+                column.append(0)
+        return node_id
+
+    def add_node(self, unique_id: str, fields: Dict[str, Any]) -> None:
+        """
+        Add a node. Each node is added once.
+
+        Args:
+            unique_id: The node's unique_id
+            fields: The node's fields, as returned by project_node()
+        """
+        node_id = self._node_id(unique_id)
+        for column in STORED_COLUMNS:
+            self.columns[column][node_id] = self.strings.code(fields.get(column))
+        self.tags.add(node_id, [self.strings.code(tag) for tag in fields.get("tags") or []])
+
+    def add_files(self, package_name: Optional[str], files: Iterable[str]) -> None:
+        """
+        Record files a package's resources were parsed from.
+
+        Args:
+            package_name: The package the files belong to
+            files: Paths relative to the package's directory
+        """
+        if package_name:
+            self.package_files.setdefault(package_name, set()).update(files)
+
+    def add_selectors(self, selectors: Dict[str, Any]) -> None:
+        """
+        Record the project's selectors (the manifest's selectors section).
+
+        Only the names of default selectors are kept, since a default selector
+        changes what `dbt ls` lists without a selection.
+
+        Args:
+            selectors: The selectors, keyed by name
+        """
+        self.default_selectors = sorted(
+            name for name, selector in selectors.items() if isinstance(selector, dict) and selector.get("default")
+        )
+
+    def add_parents(self, unique_id: str, parents: Iterable[str]) -> None:
+        """
+        Record a node's parents (an entry of the manifest's parent_map).
+
+        Args:
+            unique_id: The node's unique_id
+            parents: unique_ids of its parents
+        """
+        if not self.has_parent_map:
+            self.has_parent_map = True
+            self.dependencies.clear()
+        self.parents.add(self._node_id(unique_id), {self._node_id(parent) for parent in parents})
+
+    def add_dependencies(self, unique_id: str, depends_on: Iterable[str]) -> None:
+        """
+        Record a node's depends_on nodes, used as its parents if the manifest has no parent_map.
+
+        Args:
+            unique_id: The node's unique_id
+            depends_on: unique_ids of the nodes it depends on
+        """
+        if not self.has_parent_map:
+            self.dependencies.add(self._node_id(unique_id), {self._node_id(parent) for parent in depends_on})
+
+    def add_children(self, unique_id: str, children: Iterable[str]) -> None:
+        """
+        Record a node's children (an entry of the manifest's child_map).
+
+        Args:
+            unique_id: The node's unique_id
+            children: unique_ids of its children
+        """
+        self.has_child_map = True
+        self.children.add(self._node_id(unique_id), {self._node_id(child) for child in children})
+
+    def build(self) -> "NodeStore":
+        """
+        Build the store.
+
+        Returns:
+            The store. Children are derived from the parents if no child map was added.
+        """
+        node_count = len(self.unique_ids)
+        parents = self.parents if self.has_parent_map else self.dependencies
+
+        return NodeStore(
+            strings=self.strings,
+            unique_ids=self.unique_ids,
+            index=self.index,
+            columns=self.columns,
+            tag_csr=self.tags.csr(node_count, sort=False),
+            parent_csr=parents.csr(node_count),
+            child_csr=self.children.csr(node_count) if self.has_child_map else parents.csr(node_count, reverse=True),
+            metadata=self.metadata,
+            source_files=sorted(self.package_files.get(self.metadata.get("project_name"), ())),
+            default_selectors=self.default_selectors,
+        )
+
+
+class NodeStore:
+    """
+    Columnar, interned store of a manifest's resources and their graph.
+    """
+
+    def __init__(
+        self,
+        strings: StringTable,
+        unique_ids: List[str],
+        index: Dict[str, int],
+        columns: Dict[str, array],
+        tag_csr: Tuple[array, array],
+        parent_csr: Tuple[array, array],
+        child_csr: Tuple[array, array],
+        metadata: Optional[Dict[str, Any]] = None,
+        source_files: Optional[List[str]] = None,
+        default_selectors: Optional[List[str]] = None
+    ):
+        self.strings = strings
+        self.unique_ids = unique_ids
+        self.index = index
+        self.columns = columns
+        self.tag_offsets, self.tag_codes = tag_csr
+        self.parent_offsets, self.parent_targets = parent_csr
+        self.child_offsets, self.child_targets = child_csr
+        self.metadata = metadata or {}
+        self.source_files = source_files or []
+        self.default_selectors = default_selectors or []
+        self._names: Optional[Dict[int, List[int]]] = None
+        self._nbytes: Optional[int] = None
+
+    @classmethod
+    def from_manifest(cls, data: Dict[str, Any]) -> "NodeStore":
+        """
+        Build a store from a parsed manifest.
+
+        Args:
+            data: The parsed manifest.json
+
+        Returns:
+            The store
+        """
+        builder = NodeStoreBuilder()
+        builder.metadata = data.get("metadata") or {}
+        builder.add_selectors(data.get("selectors") or {})
+        for section in SOURCE_FILE_SECTIONS:
+            for unique_id, resource in (data.get(section) or {}).items():
+                builder.add_files(resource.get("package_name"), resource_files(resource))
+                if section in STORED_SECTIONS:
+                    builder.add_node(unique_id, project_node(resource))
+                    builder.add_dependencies(unique_id, (resource.get("depends_on") or {}).get("nodes") or [])
+        for unique_id, parents in (data.get("parent_map") or {}).items():
+            builder.add_parents(unique_id, parents)
+        for unique_id, children in (data.get("child_map") or {}).items():
+            builder.add_children(unique_id, children)
+        return builder.build()
+
+    def __len__(self) -> int:
+        return len(self.unique_ids)
+
+    @property
+    def edge_count(self) -> int:
+        """Number of parent -> child edges."""
+        return len(self.parent_targets)
+
+    @property
+    def project_name(self) -> Optional[str]:
+        """Name of the root project."""
+        return self.metadata.get("project_name")
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the store, in bytes."""
+        if self._nbytes is None:
+            arrays = list(self.columns.values()) + [
+                self.tag_offsets, self.tag_codes, self.parent_offsets, self.parent_targets,
+                self.child_offsets, self.child_targets,
+            ]
+            size = sum(len(values) * values.itemsize for values in arrays)
+            size += sum(sys.getsizeof(value) for value in self.strings.strings)
+            size += sum(sys.getsizeof(value) for value in self.unique_ids)
+            size += sys.getsizeof(self.strings.codes) + sys.getsizeof(self.index)
+            self._nbytes = size
+        return self._nbytes
+
+    def node_id(self, unique_id: str) -> Optional[int]:
+        """
+        Get a node's integer id.
+
+        Args:
+            unique_id: The node's unique_id
+
+        Returns:
+            The node id, or None if the node isn't in the store
+        """
+        return self.index.get(unique_id)
+
+    def get(self, node_id: int) -> NodeRecord:
+        """
+        Get a node's stored fields.
+
+        Args:
+            node_id: The node id
+
+        Returns:
+            The node's record
+        """
+        return NodeRecord(self, node_id)
+
+    def value(self, node_id: int, column: str) -> Optional[str]:
+        """
+        Get a single field of a node without materializing its record.
+
+        Args:
+            node_id: The node id
+            column: The column name (e.g. "resource_type")
+
+        Returns:
+            The field's value
+        """
+        return self.strings[self.columns[column][node_id]]
+
+    def json_value(self, node_id: int, column: str) -> Any:
+        """
+        Get a field of a node stored as JSON text, decoded.
+
+        Args:
+            node_id: The node id
+            column: The column name, one of JSON_COLUMNS
+
+        Returns:
+            The field's value (a new object on every call), or None
+        """
+        text = self.strings[self.columns[column][node_id]]
+        return None if text is None else json.loads(text)
+
+    def tags(self, node_id: int) -> List[str]:
+        """Get a node's tags."""
+        codes = self.tag_codes[self.tag_offsets[node_id]:self.tag_offsets[node_id + 1]]
+        return [self.strings[code] for code in codes]
+
+    def parents(self, node_id: int) -> array:
+        """Get the ids of a node's direct parents."""
+        return self.parent_targets[self.parent_offsets[node_id]:self.parent_offsets[node_id + 1]]
+
+    def children(self, node_id: int) -> array:
+        """Get the ids of a node's direct children."""
+        return self.child_targets[self.child_offsets[node_id]:self.child_offsets[node_id + 1]]
+
+    def find_by_name(self, name: str) -> List[int]:
+        """
+        Find nodes by name.
+
+        Args:
+            name: The node name
+
+        Returns:
+            Ids of the nodes with that name
+        """
+        if self._names is None:
+            names: Dict[int, List[int]] = {}
+            for node_id, code in enumerate(self.columns["name"]):
+                names.setdefault(code, []).append(node_id)
+            self._names = names
+        code = self.strings.codes.get(name)
+        return list(self._names.get(code, [])) if code is not None else []
+
+    def records(self) -> Iterator[NodeRecord]:
+        """Iterate over all nodes' records."""
+        for node_id in range(len(self.unique_ids)):
+            yield NodeRecord(self, node_id)
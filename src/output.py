@@ -0,0 +1,241 @@
+"""
+Output capture utilities for the DBT CLI MCP Server.
+
+This module reads dbt's stdout and stderr incrementally, hands each line to
+line-oriented parsers and retains at most a configurable number of bytes per
+stream (the head and the tail of the output), so very large outputs never have
+to be held in memory in full.
+"""
+
+import re
+import codecs
+import asyncio
+import logging
+from collections import deque
+from typing import Callable, Deque, List, Optional
+
+# Logger for this module
+logger = logging.getLogger(__name__)
+
+# Size of the chunks read from the process pipes
+CHUNK_SIZE = 64 * 1024
+
+# Message emitted by dbt when a selector matches nothing
+NO_NODES_MATCHED = "does not match any enabled nodes"
+
+# Line that replaces the dropped middle of a truncated output
+TRUNCATION_MARKER = "... [{} bytes truncated] ..."
+TRUNCATION_MARKER_PATTERN = re.compile(r"^\.\.\. \[\d+ bytes truncated\] \.\.\.\n?", re.MULTILINE)
+
+
+def encoded_size(text: str) -> int:
+    """Get the size of a string encoded as UTF-8."""
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+def strip_truncation_marker(text: str) -> str:
+    """
+    Remove the marker BoundedBuffer.getvalue() puts in place of dropped output,
+    so the retained lines can be parsed.
+
+    Args:
+        text: Output of a command
+
+    Returns:
+        The output without truncation markers
+    """
+    if "bytes truncated] ..." not in text:
+        return text
+    return TRUNCATION_MARKER_PATTERN.sub("", text)
+
+
+class BoundedBuffer:
+    """
+    Line buffer that keeps the head and tail of its input within a byte budget.
+
+    The first half of the budget is filled with the first lines received and the
+    second half holds the most recent lines; everything in between is dropped and
+    replaced with a marker when the value is read.
+    """
+
+    def __init__(self, max_bytes: int = 0):
+        """
+        Args:
+            max_bytes: Maximum number of bytes to retain (0 for unlimited)
+        """
+        self.max_bytes = max_bytes
+        self.head: List[str] = []
+        self.tail: Deque[str] = deque()
+        self.head_bytes = 0
+        self.tail_bytes = 0
+        self.dropped_bytes = 0
+        self.total_bytes = 0
+
+    @property
+    def truncated(self) -> bool:
+        """Whether any output was dropped."""
+        return self.dropped_bytes > 0
+
+    def append(self, text: str) -> None:
+        """
+        Add a line (or line fragment) to the buffer.
+
+        Args:
+            text: The text to add, including its line terminator
+        """
+        size = encoded_size(text)
+        self.total_bytes += size
+
+        if not self.max_bytes:
+            self.head.append(text)
+            self.head_bytes += size
+            return
+
+        half = self.max_bytes // 2
+        if not self.tail and self.head_bytes + size <= half:
+            self.head.append(text)
+            self.head_bytes += size
+            return
+
+        # A single piece larger than the tail budget only keeps its last bytes,
+        # without a character cut in half
+        if size > half:
+            text = text.encode("utf-8")[-half:].decode("utf-8", "ignore")
+            kept_size = encoded_size(text)
+            self.dropped_bytes += self.tail_bytes + size - kept_size
+            self.tail.clear()
+            self.tail.append(text)
+            self.tail_bytes = kept_size
+            return
+
+        self.tail.append(text)
+        self.tail_bytes += size
+        while self.tail_bytes > half:
+            removed = self.tail.popleft()
+            removed_size = encoded_size(removed)
+            self.tail_bytes -= removed_size
+            self.dropped_bytes += removed_size
+
+    def getvalue(self) -> str:
+        """
+        Get the retained output.
+
+        Returns:
+            The head and tail of the output, separated by a truncation marker
+            if anything was dropped
+        """
+        head = "".join(self.head)
+        if not self.tail:
+            return head
+        marker = "\n" + TRUNCATION_MARKER.format(self.dropped_bytes) + "\n" if self.truncated else ""
+        return head + marker + "".join(self.tail)
+
+
+class OutputCapture:
+    """
+    Incremental capture of a dbt command's stdout and stderr.
+
+    Every complete line is passed to the registered line handlers as it
+    arrives, then stored in a bounded buffer for its stream. A handler may
+    return a string to store in place of the line.
+    """
+
+    def __init__(self, max_bytes: int = 0):
+        """
+        Args:
+            max_bytes: Maximum number of bytes to retain per stream (0 for unlimited)
+        """
+        self.stdout = BoundedBuffer(max_bytes)
+        self.stderr = BoundedBuffer(max_bytes)
+        self.line_handlers: List[Callable[[str, str], Optional[str]]] = []
+        self.no_nodes_matched = False
+        self._pending = {"stdout": "", "stderr": ""}
+
+    def add_line_handler(self, handler: Callable[[str, str], Optional[str]]) -> None:
+        """
+        Register a function called with (stream_name, line) for every line.
+
+        If the handler returns a string, that string is stored instead of the line.
+
+        Args:
+            handler: The line handler
+        """
+        self.line_handlers.append(handler)
+
+    def feed_line(self, stream_name: str, line: str) -> None:
+        """
+        Process a single line of output.
+
+        Args:
+            stream_name: "stdout" or "stderr"
+            line: The line, including its line terminator if it had one
+        """
+        if stream_name == "stdout" and NO_NODES_MATCHED in line:
+            self.no_nodes_matched = True
+
+        stored = line
+        for handler in self.line_handlers:
+            try:
+                replacement = handler(stream_name, line)
+            except Exception as e:
+                logger.debug(f"Line handler failed on {stream_name} line: {e}")
+                continue
+            if replacement is not None:
+                stored = replacement
+
+        getattr(self, stream_name).append(stored)
+
+    def feed_text(self, stream_name: str, text: str, final: bool = False) -> None:
+        """
+        Process a piece of output that may contain several or partial lines.
+
+        Args:
+            stream_name: "stdout" or "stderr"
+            text: The decoded output
+            final: Whether this is the end of the stream
+        """
+        buffer = self._pending[stream_name] + text
+        start = 0
+        while True:
+            end = buffer.find("\n", start)
+            if end < 0:
+                break
+            self.feed_line(stream_name, buffer[start:end + 1])
+            start = end + 1
+        pending = buffer[start:]
+
+        # Don't let a single unterminated line grow past the retention budget
+        max_bytes = getattr(self, stream_name).max_bytes
+        if pending and (final or (max_bytes and len(pending) > max_bytes)):
+            self.feed_line(stream_name, pending)
+            pending = ""
+
+        self._pending[stream_name] = pending
+
+    def flush(self) -> None:
+        """
+        Process any partial lines left when a stream was not read to EOF.
+        """
+        for stream_name in ("stdout", "stderr"):
+            if self._pending[stream_name]:
+                self.feed_text(stream_name, "", final=True)
+
+    async def consume(self, stream_name: str, reader: Optional[asyncio.StreamReader]) -> None:
+        """
+        Read a process pipe in chunks until EOF.
+
+        Args:
+            stream_name: "stdout" or "stderr"
+            reader: The pipe to read
+        """
+        if reader is None:
+            return
+
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        while True:
+            chunk = await reader.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            self.feed_text(stream_name, decoder.decode(chunk))
+
+        self.feed_text(stream_name, decoder.decode(b"", final=True), final=True)
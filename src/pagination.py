@@ -0,0 +1,229 @@
+"""
+Cursor-based pagination of dbt ls results for the DBT CLI MCP Server.
+
+Listing a large project returns thousands of resources, more than many MCP
+clients accept in a single response. A paginated listing runs dbt once, keeps
+the sorted result set in memory, keyed by the command and a fingerprint of the
+project's state, and serves it a page at a time. Each page carries an opaque
+cursor for the next one, so following pages are sliced from the cached result
+set instead of running dbt again.
+"""
+
+import json
+import base64
+import hashlib
+import logging
+from pathlib import Path
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from src.environment import get_environment
+from src.project import get_project_fingerprint
+
+# Logger for this module
+logger = logging.getLogger(__name__)
+
+# Maximum number of result sets kept in memory
+MAX_RESULT_SETS = 16
+
+# Number of items per page when a cursor is given without a page size
+DEFAULT_PAGE_SIZE = 500
+
+# Runs a dbt command, like execute_dbt_command
+CommandRunner = Callable[[List[str], str, Optional[str]], Awaitable[Dict[str, Any]]]
+
+
+class PaginationError(ValueError):
+    """Raised for invalid page sizes and cursors."""
+
+
+def encode_cursor(token: str, offset: int, page_size: int) -> str:
+    """
+    Build the cursor of a page.
+
+    Args:
+        token: Identity of the result set
+        offset: Index of the page's first item
+        page_size: Number of items per page
+
+    Returns:
+        Opaque cursor
+    """
+    data = json.dumps([token, offset, page_size], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int, int]:
+    """
+    Read a cursor built by encode_cursor().
+
+    Args:
+        cursor: The cursor
+
+    Returns:
+        Tuple of (token, offset, page_size)
+
+    Raises:
+        PaginationError: If the cursor is malformed
+    """
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        token, offset, page_size = json.loads(data)
+    except (ValueError, TypeError) as e:
+        raise PaginationError(f"Invalid cursor: {cursor!r}") from e
+    if not isinstance(token, str) or not isinstance(offset, int) or not isinstance(page_size, int) \
+            or offset < 0 or page_size < 1:
+        raise PaginationError(f"Invalid cursor: {cursor!r}")
+    return token, offset, page_size
+
+
+def result_set_token(command: List[str], project_dir: str, profiles_dir: Optional[str], view: Hashable) -> str:
+    """
+    Get the identity of a command's result set for the project's current state.
+
+    Args:
+        command: The dbt command
+        project_dir: Directory containing the dbt project
+        profiles_dir: Directory containing the profiles.yml file
+        view: Settings shaping the items beyond the command, e.g. verbosity
+
+    Returns:
+        Token identifying the result set
+    """
+    env_vars = get_environment(project_dir, profiles_dir)
+    key = (
+        tuple(command),
+        str(Path(project_dir).resolve()),
+        str(Path(profiles_dir).resolve()) if profiles_dir is not None else None,
+        view,
+        get_project_fingerprint(project_dir, env_vars)
+    )
+    return hashlib.sha1(repr(key).encode()).hexdigest()[:20]
+
+
+class ResultSetCache:
+    """
+    LRU cache of sorted result sets, keyed by token.
+    """
+
+    def __init__(self, max_entries: int = MAX_RESULT_SETS):
+        """
+        Args:
+            max_entries: Maximum number of result sets kept
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, List[Any]]" = OrderedDict()
+
+    def get(self, token: str) -> Optional[List[Any]]:
+        """Get a result set, or None if it isn't cached."""
+        items = self._entries.get(token)
+        if items is not None:
+            self._entries.move_to_end(token)
+        return items
+
+    def put(self, token: str, items: List[Any]) -> None:
+        """Cache a result set, evicting the least recently used one if full."""
+        self._entries[token] = items
+        self._entries.move_to_end(token)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every result set."""
+        self._entries.clear()
+
+
+# Result sets shared by all tool calls
+result_sets = ResultSetCache()
+
+
+def get_page(items: List[Any], token: str, offset: int, page_size: int) -> Dict[str, Any]:
+    """
+    Slice a page from a result set.
+
+    Args:
+        items: The result set
+        token: Identity of the result set
+        offset: Index of the page's first item
+        page_size: Number of items per page
+
+    Returns:
+        Dictionary with the page's items, the total number of items, and the
+        cursor of the next page (None on the last page)
+    """
+    end = offset + page_size
+    return {
+        "items": items[offset:end],
+        "total": len(items),
+        "offset": offset,
+        "next_cursor": encode_cursor(token, end, page_size) if end < len(items) else None
+    }
+
+
+async def list_page(
+    command: List[str],
+    project_dir: str,
+    profiles_dir: Optional[str],
+    run: CommandRunner,
+    build_items: Callable[[Any], List[Any]],
+    view: Hashable = None,
+    page_size: Optional[int] = None,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Get a page of a command's result set, running the command only when the
+    result set for the project's current state isn't cached.
+
+    Args:
+        command: The dbt command
+        project_dir: Directory containing the dbt project
+        profiles_dir: Directory containing the profiles.yml file
+        run: Function running a dbt command, like execute_dbt_command
+        build_items: Function turning the command's output into the sorted result set
+        view: Settings shaping the items beyond the command, e.g. verbosity
+        page_size: Number of items per page; defaults to the cursor's page size
+        cursor: Cursor of the page, from the previous page; None for the first page
+
+    Returns:
+        A result in the format of execute_dbt_command, with the page as its output
+    """
+    offset = 0
+    try:
+        if cursor:
+            cursor_token, offset, cursor_page_size = decode_cursor(cursor)
+            page_size = page_size or cursor_page_size
+        if page_size is not None and page_size < 1:
+            raise PaginationError("page_size must be at least 1")
+    except PaginationError as e:
+        return {"success": False, "output": None, "error": str(e), "returncode": 1}
+    page_size = page_size or DEFAULT_PAGE_SIZE
+
+    token = result_set_token(command, project_dir, profiles_dir, view)
+    if cursor and token != cursor_token:
+        return {
+            "success": False,
+            "output": None,
+            "error": "The cursor has expired because the project changed; list again without a cursor",
+            "returncode": 1
+        }
+
+    items = result_sets.get(token)
+    if items is None:
+        result = await run(command, project_dir, profiles_dir)
+        if not result["success"]:
+            return result
+        items = build_items(result["output"])
+        # The command may have re-parsed the project, so key the result set on
+        # the state after the run: the next page's call will see that state
+        token = result_set_token(command, project_dir, profiles_dir, view)
+        result_sets.put(token, items)
+        logger.info(f"Cached {len(items)} items of dbt {' '.join(command)}")
+    else:
+        logger.info(f"Serving dbt {' '.join(command)} from the cached result set at offset {offset}")
+
+    return {
+        "success": True,
+        "output": get_page(items, token, offset, page_size),
+        "error": None,
+        "returncode": 0
+    }
@@ -0,0 +1,57 @@
+"""
+Process management utilities for the DBT CLI MCP Server.
+
+dbt processes are started in their own session (and so their own process group),
+which lets a timed out or cancelled command be stopped together with anything
+it spawned.
+"""
+
+import os
+import signal
+import asyncio
+import logging
+
+from src.config import get_config
+
+# Logger for this module
+logger = logging.getLogger(__name__)
+
+# Return code reported for commands stopped because they exceeded their timeout
+# (the same code GNU timeout uses)
+TIMEOUT_RETURNCODE = 124
+
+
+def _signal_group(process: asyncio.subprocess.Process, sig: int) -> None:
+    """Send a signal to a process's group, or to the process where groups aren't supported."""
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(process.pid, sig)
+        elif sig == signal.SIGTERM:
+            process.terminate()
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+async def terminate_process_group(process: asyncio.subprocess.Process) -> None:
+    """
+    Stop a process and its process group.
+
+    Sends SIGTERM, waits up to `kill_grace_period` seconds for the process to
+    exit, then sends SIGKILL.
+
+    Args:
+        process: A process started with start_new_session=True
+    """
+    if process.returncode is None:
+        logger.info(f"Terminating process group {process.pid}")
+        _signal_group(process, signal.SIGTERM)
+        try:
+            await asyncio.wait_for(process.wait(), timeout=get_config("kill_grace_period", 10))
+        except asyncio.TimeoutError:
+            logger.warning(f"Process group {process.pid} ignored SIGTERM, sending SIGKILL")
+
+    # Also kill anything left in the group once the leader has gone
+    _signal_group(process, getattr(signal, "SIGKILL", signal.SIGTERM))
+    await process.wait()
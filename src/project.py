@@ -0,0 +1,78 @@
+"""
+dbt project helpers for the DBT CLI MCP Server.
+
+This module locates a project's files and directories without running dbt.
+"""
+
+import re
+import logging
+from pathlib import Path
+from typing import Mapping, Optional
+
+from src.config import get_config
+from src.artifacts import file_signature
+
+# Logger for this module
+logger = logging.getLogger(__name__)
+
+# Files whose changes make earlier command results stale, relative to the project
+# directory (target artifacts are added relative to the target path)
+FINGERPRINT_FILES = ("dbt_project.yml", "packages.yml", "dependencies.yml", "selectors.yml")
+FINGERPRINT_ARTIFACTS = ("manifest.json", "partial_parse.msgpack")
+
+# Matches a top-level `target-path:` entry in dbt_project.yml
+TARGET_PATH_PATTERN = re.compile(r"""^target-path:\s*["']?([^"'#\s]+)""", re.MULTILINE)
+
+
+def get_target_path(project_dir: str, env: Optional[Mapping[str, str]] = None) -> Path:
+    """
+    Get the canonical target directory of a dbt project.
+
+    Follows dbt's precedence: the DBT_TARGET_PATH environment variable, then
+    `target-path` in dbt_project.yml, then `target`.
+
+    Args:
+        project_dir: Directory containing the dbt project
+        env: Environment variables the command runs with
+
+    Returns:
+        Absolute path of the target directory
+    """
+    project_path = Path(project_dir).resolve()
+
+    target_path = (env or {}).get("DBT_TARGET_PATH")
+    if not target_path:
+        try:
+            match = TARGET_PATH_PATTERN.search((project_path / "dbt_project.yml").read_text())
+            target_path = match.group(1) if match else None
+        except OSError:
+            target_path = None
+
+    return project_path / (target_path or "target")
+
+
+def get_project_fingerprint(project_dir: str, env: Optional[Mapping[str, str]] = None) -> tuple:
+    """
+    Get a cheap fingerprint of a project's state.
+
+    The fingerprint is built from the signatures of the project's configuration
+    files, its .env file, profiles.yml and the parse artifacts in the target directory. It changes
+    whenever dbt re-parses the project or its configuration is edited, without
+    walking the project's model files.
+
+    Args:
+        project_dir: Directory containing the dbt project
+        env: Environment variables the command runs with
+
+    Returns:
+        Hashable fingerprint
+    """
+    project_path = Path(project_dir).resolve()
+    target_path = get_target_path(project_dir, env)
+    profiles_dir = Path((env or {}).get("DBT_PROFILES_DIR") or project_path)
+
+    paths = [project_path / name for name in FINGERPRINT_FILES]
+    paths.append(project_path / get_config("env_file", ".env"))
+    paths.append(profiles_dir / "profiles.yml")
+    paths.extend(target_path / name for name in FINGERPRINT_ARTIFACTS)
+    return tuple(file_signature(path) for path in paths)
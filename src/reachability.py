@@ -0,0 +1,159 @@
+"""
+Reachability index for the DBT CLI MCP Server.
+
+Selectors such as `+fct_orders+` and impact analyses repeatedly compute the
+ancestors or descendants of nodes. For projects up to tens of thousands of
+nodes, this module precomputes the transitive closure of the graph once per
+manifest: every node gets a bitset of its ancestors and one of its descendants.
+Bitsets are Python integers whose bit positions follow a topological order, so
+closure queries, unions and intersections become word-level integer operations.
+"""
+
+import sys
+import logging
+from array import array
+from typing import Iterable, List
+
+from src.node_store import INDEX_TYPE, NodeStore
+
+# Logger for this module
+logger = logging.getLogger(__name__)
+
+# Positions of the set bits of every byte value
+BYTE_BITS = tuple(tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256))
+
+
+class ReachabilityIndex:
+    """
+    Ancestor and descendant bitsets of every node of a NodeStore.
+
+    Bit i of a bitset stands for the node at position i of the topological
+    order (`order[i]`); parents come before their children.
+    """
+
+    def __init__(self, store: NodeStore):
+        """
+        Args:
+            store: The node store to index
+
+        Raises:
+            ValueError: If the graph has a cycle
+        """
+        self.order = self._topological_order(store)
+        self.position = array(INDEX_TYPE, bytes(len(self.order) * self.order.itemsize))
+        for position, node_id in enumerate(self.order):
+            self.position[node_id] = position
+
+        self.ancestor_bits: List[int] = [0] * len(self.order)
+        for node_id in self.order:
+            bits = 0
+            for parent in store.parents(node_id):
+                bits |= self.ancestor_bits[parent] | (1 << self.position[parent])
+            self.ancestor_bits[node_id] = bits
+
+        self.descendant_bits: List[int] = [0] * len(self.order)
+        for node_id in reversed(self.order):
+            bits = 0
+            for child in store.children(node_id):
+                bits |= self.descendant_bits[child] | (1 << self.position[child])
+            self.descendant_bits[node_id] = bits
+
+        # Approximate memory used by the index, in bytes
+        self.nbytes = sum(sys.getsizeof(bits) for bits in self.ancestor_bits + self.descendant_bits)
+        self.nbytes += 2 * len(self.order) * self.order.itemsize
+
+    @staticmethod
+    def _topological_order(store: NodeStore) -> array:
+        """Order the nodes so that every node comes after its parents (Kahn's algorithm)."""
+        remaining = [0] * len(store)
+        for child in store.child_targets:
+            remaining[child] += 1
+        order = array(INDEX_TYPE, (node_id for node_id, count in enumerate(remaining) if count == 0))
+        index = 0
+        while index < len(order):
+            for child in store.children(order[index]):
+                remaining[child] -= 1
+                if remaining[child] == 0:
+                    order.append(child)
+            index += 1
+        if len(order) != len(store):
+            raise ValueError("The graph has a cycle")
+        return order
+
+    def bits(self, node_ids: Iterable[int]) -> int:
+        """
+        Get the bitset of a set of nodes.
+
+        Args:
+            node_ids: The node ids
+
+        Returns:
+            The bitset
+        """
+        bits = 0
+        for node_id in node_ids:
+            bits |= 1 << self.position[node_id]
+        return bits
+
+    def node_ids(self, bits: int) -> List[int]:
+        """
+        Get the nodes of a bitset.
+
+        Args:
+            bits: The bitset
+
+        Returns:
+            The node ids, in topological order
+        """
+        node_ids = []
+        for byte_index, value in enumerate(bits.to_bytes((bits.bit_length() + 7) // 8, "little")):
+            if value:
+                base = byte_index * 8
+                node_ids.extend(self.order[base + bit] for bit in BYTE_BITS[value])
+        return node_ids
+
+    def ancestors(self, node_ids: Iterable[int]) -> int:
+        """
+        Get the union of the ancestors of nodes.
+
+        Args:
+            node_ids: The node ids
+
+        Returns:
+            Bitset of their ancestors (excluding the nodes themselves, unless one
+            is an ancestor of another)
+        """
+        bits = 0
+        for node_id in node_ids:
+            bits |= self.ancestor_bits[node_id]
+        return bits
+
+    def descendants(self, node_ids: Iterable[int]) -> int:
+        """
+        Get the union of the descendants of nodes.
+
+        Args:
+            node_ids: The node ids
+
+        Returns:
+            Bitset of their descendants (excluding the nodes themselves, unless one
+            is a descendant of another)
+        """
+        bits = 0
+        for node_id in node_ids:
+            bits |= self.descendant_bits[node_id]
+        return bits
+
+    def is_ancestor(self, ancestor: int, node_id: int) -> bool:
+        """
+        Check whether a node is upstream of another.
+
+        Args:
+            ancestor: The possible ancestor's node id
+            node_id: The node id
+
+        Returns:
+            True if there is a path from `ancestor` down to `node_id`
+        """
+        position = self.position[ancestor]
+        return position < self.position[node_id] and bool(self.ancestor_bits[node_id] >> position & 1)
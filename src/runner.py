@@ -0,0 +1,443 @@
+"""
+In-process dbt execution backend for the DBT CLI MCP Server.
+
+This module manages pools of long-lived worker processes (see src/dbt_worker.py)
+that run dbt commands through dbt's programmatic dbtRunner, avoiding the
+interpreter startup and dbt import cost that every `dbt` subprocess pays.
+Crashes stay isolated to a single worker, which is replaced on the next command.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import asyncio
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.config import get_config
+from src.process import terminate_process_group
+
+# Logger for this module
+logger = logging.getLogger(__name__)
+
+# Path to the worker script, executed by the dbt interpreter
+WORKER_SCRIPT = Path(__file__).with_name("dbt_worker.py")
+
+# Maximum size of a single protocol line (a full command response)
+PROTOCOL_LINE_LIMIT = 1 << 30
+
+
+class WorkerError(Exception):
+    """Raised when a dbt worker dies or violates the protocol."""
+
+
+class WorkerTimeout(WorkerError):
+    """Raised when a command exceeds its timeout and its worker is terminated."""
+
+
+def resolve_dbt_python(dbt_path: str) -> str:
+    """
+    Determine the Python interpreter that has dbt-core installed.
+
+    The `dbt_python` config value takes precedence. Otherwise the interpreter is
+    read from the shebang line of the dbt executable, falling back to the
+    interpreter running the server.
+
+    Args:
+        dbt_path: Path to the dbt executable
+
+    Returns:
+        Path to the Python interpreter
+    """
+    configured = get_config("dbt_python")
+    if configured:
+        return configured
+
+    executable = shutil.which(dbt_path)
+    if executable:
+        try:
+            with open(executable, "rb") as f:
+                first_line = f.readline(512).decode("utf-8", errors="ignore").strip()
+            if first_line.startswith("#!") and "python" in first_line:
+                interpreter = first_line[2:].strip().split()[0]
+                if os.path.isfile(interpreter):
+                    return interpreter
+        except OSError:
+            pass
+
+    return sys.executable
+
+
+class DbtWorker:
+    """
+    Client side of a single long-lived dbt worker process.
+
+    Commands are executed one at a time; concurrent callers wait on a lock.
+    """
+
+    def __init__(self, python: str):
+        self.python = python
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.commands_run = 0
+        self.rss = 0
+        self.last_used = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._next_id = 0
+
+    @property
+    def alive(self) -> bool:
+        """Whether the worker process is running."""
+        return self.process is not None and self.process.returncode is None
+
+    async def start(self) -> None:
+        """
+        Start the worker process and wait until dbt has been imported.
+
+        Raises:
+            WorkerError: If the worker fails to start
+        """
+        logger.debug(f"Starting dbt worker with {self.python}")
+        self.process = await asyncio.create_subprocess_exec(
+            self.python, str(WORKER_SCRIPT),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            limit=PROTOCOL_LINE_LIMIT,
+            start_new_session=True
+        )
+
+        line = await self.process.stdout.readline()
+        try:
+            handshake = json.loads(line) if line else {}
+        except json.JSONDecodeError:
+            handshake = {}
+
+        if not handshake.get("ready"):
+            await self.close()
+            raise WorkerError(f"dbt worker failed to start using {self.python}")
+
+        logger.info(f"Started dbt worker (pid {handshake.get('pid')})")
+
+    async def run(
+        self,
+        command: List[str],
+        project_dir: str,
+        env: Dict[str, str],
+        timeout: float = 0
+    ) -> Tuple[str, str, int]:
+        """
+        Execute a dbt command in the worker.
+
+        dbtRunner can't be interrupted, so if the command times out or the
+        calling task is cancelled the worker's process group is terminated.
+
+        Args:
+            command: List of command arguments (without the dbt executable)
+            project_dir: Directory containing the dbt project
+            env: Environment variables for the command
+            timeout: Timeout in seconds (0 for no timeout)
+
+        Returns:
+            Tuple of (stdout, stderr, returncode)
+
+        Raises:
+            WorkerError: If the worker dies while running the command
+            WorkerTimeout: If the command exceeds the timeout
+        """
+        async with self._lock:
+            if not self.alive:
+                await self.start()
+
+            self._next_id += 1
+            request = {
+                "id": self._next_id,
+                "args": command,
+                "cwd": str(Path(project_dir).resolve()),
+                "env": dict(env)
+            }
+
+            try:
+                self.process.stdin.write((json.dumps(request) + "\n").encode("utf-8"))
+                await self.process.stdin.drain()
+                line = await asyncio.wait_for(self.process.stdout.readline(), timeout=timeout or None)
+            except (BrokenPipeError, ConnectionResetError, ValueError) as e:
+                await self.close()
+                raise WorkerError(f"dbt worker connection failed: {e}") from e
+            except asyncio.TimeoutError:
+                logger.warning(f"dbt command timed out after {timeout} seconds, terminating worker")
+                await self.terminate()
+                raise WorkerTimeout(f"Command timed out after {timeout} seconds")
+            except asyncio.CancelledError:
+                logger.info("dbt command cancelled, terminating worker")
+                await self.terminate()
+                raise
+
+            if not line:
+                await self.close()
+                raise WorkerError("dbt worker exited while running a command")
+
+            response = json.loads(line)
+            self.commands_run += 1
+            self.rss = response.get("rss", 0)
+            return response["stdout"], response["stderr"], response["returncode"]
+
+    async def terminate(self) -> None:
+        """
+        Stop the worker process group immediately, abandoning any running command.
+        """
+        if self.process is not None:
+            await terminate_process_group(self.process)
+            self.process = None
+
+    async def close(self) -> None:
+        """
+        Stop the worker process.
+        """
+        if self.process is None:
+            return
+
+        if self.process.returncode is None:
+            try:
+                self.process.stdin.close()
+                await asyncio.wait_for(self.process.wait(), timeout=5)
+            except (asyncio.TimeoutError, BrokenPipeError, ConnectionResetError):
+                self.process.kill()
+                await self.process.wait()
+
+        self.process = None
+
+
+class WorkerPool:
+    """
+    Pool of pre-started dbt workers for one (project_dir, profiles_dir, dbt_path).
+
+    Commands are dispatched to an idle worker. New workers are started on demand
+    up to `worker_pool_size`, workers are recycled after `worker_max_commands`
+    commands or once their RSS exceeds `worker_max_rss_mb`, and workers idle for
+    longer than `worker_idle_timeout` seconds are stopped.
+    """
+
+    def __init__(self, python: str):
+        self.python = python
+        self.workers: List[DbtWorker] = []
+        self._idle: List[DbtWorker] = []
+        self._starting = 0
+        self._available = asyncio.Condition()
+
+    @property
+    def size(self) -> int:
+        """Number of workers in the pool, including ones being started."""
+        return len(self.workers) + self._starting
+
+    async def _start_worker(self) -> None:
+        """Start a new worker and add it to the idle list."""
+        worker = DbtWorker(self.python)
+        try:
+            await worker.start()
+        except BaseException:
+            async with self._available:
+                self._starting -= 1
+                self._available.notify()
+            raise
+
+        async with self._available:
+            self._starting -= 1
+            self.workers.append(worker)
+            self._idle.append(worker)
+            self._available.notify()
+
+    def prestart(self) -> None:
+        """Start a worker in the background so the next command finds it warm."""
+        if self.size >= max(1, get_config("worker_pool_size", 2)):
+            return
+        self._starting += 1
+        task = asyncio.ensure_future(self._start_worker())
+        task.add_done_callback(_log_prestart_failure)
+
+    async def _acquire(self) -> DbtWorker:
+        """Wait for an idle worker, starting a new one if the pool has room."""
+        async with self._available:
+            while True:
+                if self._idle:
+                    return self._idle.pop()
+                if self.size < max(1, get_config("worker_pool_size", 2)):
+                    self._starting += 1
+                    break
+                await self._available.wait()
+
+        await self._start_worker()
+        return await self._acquire()
+
+    async def _release(self, worker: DbtWorker) -> None:
+        """Return a worker to the pool, recycling it if it is used up."""
+        max_commands = get_config("worker_max_commands", 100)
+        max_rss = get_config("worker_max_rss_mb", 2048) * 1024 * 1024
+        recycle = (
+            not worker.alive
+            or (max_commands and worker.commands_run >= max_commands)
+            or (max_rss and worker.rss > max_rss)
+        )
+
+        async with self._available:
+            if recycle:
+                self.workers.remove(worker)
+            else:
+                worker.last_used = time.monotonic()
+                self._idle.append(worker)
+            self._available.notify()
+
+        if recycle:
+            logger.info(f"Recycling dbt worker after {worker.commands_run} commands (RSS {worker.rss} bytes)")
+            await worker.close()
+            self.prestart()
+
+    async def run(
+        self,
+        command: List[str],
+        project_dir: str,
+        env: Dict[str, str],
+        timeout: float = 0
+    ) -> Tuple[str, str, int]:
+        """
+        Execute a dbt command on an idle worker.
+
+        Args:
+            command: List of command arguments (without the dbt executable)
+            project_dir: Directory containing the dbt project
+            env: Environment variables for the command
+            timeout: Timeout in seconds (0 for no timeout)
+
+        Returns:
+            Tuple of (stdout, stderr, returncode)
+        """
+        worker = await self._acquire()
+        try:
+            return await worker.run(command, project_dir, env, timeout)
+        finally:
+            await self._release(worker)
+
+    async def evict_idle(self, idle_timeout: float) -> None:
+        """
+        Stop workers that have been idle for longer than the timeout.
+
+        Args:
+            idle_timeout: Maximum idle time in seconds
+        """
+        now = time.monotonic()
+        async with self._available:
+            expired = [w for w in self._idle if now - w.last_used > idle_timeout]
+            for worker in expired:
+                self._idle.remove(worker)
+                self.workers.remove(worker)
+
+        for worker in expired:
+            logger.info("Stopping idle dbt worker")
+            await worker.close()
+
+    async def close(self) -> None:
+        """
+        Stop all workers in the pool.
+        """
+        async with self._available:
+            workers = list(self.workers)
+            self.workers.clear()
+            self._idle.clear()
+
+        for worker in workers:
+            await worker.close()
+
+
+def _log_prestart_failure(task: "asyncio.Future") -> None:
+    """Log failures of background worker starts."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Failed to pre-start dbt worker: {task.exception()}")
+
+
+# Worker pools keyed by (project_dir, profiles_dir, dbt_path)
+_pools: Dict[Tuple[str, Optional[str], str], WorkerPool] = {}
+
+# Background task that stops idle workers
+_reaper: Optional["asyncio.Task"] = None
+
+
+async def _reap_idle_workers() -> None:
+    """Periodically stop idle workers in all pools."""
+    while _pools:
+        idle_timeout = get_config("worker_idle_timeout", 300)
+        await asyncio.sleep(max(1, min(idle_timeout / 2, 60)))
+        for key, pool in list(_pools.items()):
+            await pool.evict_idle(idle_timeout)
+            if pool.size == 0:
+                _pools.pop(key, None)
+
+
+def get_pool(project_dir: str, profiles_dir: Optional[str]) -> WorkerPool:
+    """
+    Get the worker pool for a project, creating and pre-starting it if needed.
+
+    Args:
+        project_dir: Directory containing the dbt project
+        profiles_dir: Directory containing the profiles.yml file
+
+    Returns:
+        The worker pool
+    """
+    global _reaper
+
+    dbt_path = get_config("dbt_path", "dbt")
+    key = (str(Path(project_dir).resolve()), profiles_dir, dbt_path)
+
+    pool = _pools.get(key)
+    if pool is None:
+        pool = WorkerPool(resolve_dbt_python(dbt_path))
+        _pools[key] = pool
+        pool.prestart()
+
+    if _reaper is None or _reaper.done():
+        _reaper = asyncio.ensure_future(_reap_idle_workers())
+
+    return pool
+
+
+async def run_in_worker(
+    command: List[str],
+    project_dir: str,
+    profiles_dir: Optional[str],
+    env: Dict[str, str],
+    timeout: float = 0
+) -> Tuple[str, str, int]:
+    """
+    Execute a dbt command in the worker pool for the project.
+
+    Args:
+        command: List of command arguments (without the dbt executable)
+        project_dir: Directory containing the dbt project
+        profiles_dir: Directory containing the profiles.yml file
+        env: Environment variables for the command
+        timeout: Timeout in seconds (0 for no timeout)
+
+    Returns:
+        Tuple of (stdout, stderr, returncode)
+
+    Raises:
+        WorkerTimeout: If the command exceeds the timeout
+    """
+    return await get_pool(project_dir, profiles_dir).run(command, project_dir, env, timeout)
+
+
+async def shutdown_workers() -> None:
+    """
+    Stop all running dbt workers.
+    """
+    global _reaper
+
+    pools = list(_pools.values())
+    _pools.clear()
+    for pool in pools:
+        await pool.close()
+
+    if _reaper is not None:
+        _reaper.cancel()
+        _reaper = None
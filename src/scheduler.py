@@ -0,0 +1,231 @@
+"""
+Command scheduling for the DBT CLI MCP Server.
+
+This module limits how many dbt commands run at once, globally and per project,
+so concurrent tool calls don't fight over a project's target/ directory and
+partial parse cache. Commands that write to the canonical target/ directory are
+exclusive: only one of them runs per project at a time, while commands running
+in an isolated target directory may run alongside it. Waiting commands are
+queued FIFO, with cheap read-only commands served before builds, except that
+isolated commands don't overtake a waiting exclusive command of their project.
+"""
+
+import time
+import asyncio
+import bisect
+import logging
+import itertools
+from pathlib import Path
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Set
+
+from src.config import get_config
+
+# Logger for this module
+logger = logging.getLogger(__name__)
+
+# Commands that only read the project and return quickly
+READ_ONLY_COMMANDS = frozenset({"ls", "list", "show", "compile"})
+
+# Queue priorities (lower is served first)
+PRIORITY_READ = 0
+PRIORITY_BUILD = 1
+
+
+def command_priority(command: List[str]) -> int:
+    """
+    Get the queue priority of a dbt command.
+
+    Args:
+        command: List of command arguments (without the dbt executable)
+
+    Returns:
+        PRIORITY_READ for read-only commands, PRIORITY_BUILD otherwise
+    """
+    return PRIORITY_READ if command and command[0] in READ_ONLY_COMMANDS else PRIORITY_BUILD
+
+
+@dataclass(order=True)
+class _Waiter:
+    """A queued command waiting for a slot."""
+    priority: int
+    sequence: int
+    project: str = field(compare=False)
+    exclusive: bool = field(compare=False)
+    future: "asyncio.Future" = field(compare=False)
+
+
+class CommandScheduler:
+    """
+    Admission control for dbt commands.
+
+    At most `max_concurrent_commands` commands run at once, at most
+    `max_concurrent_per_project` for any one project, and at most one exclusive
+    command per project. Waiting commands are granted slots in (priority, arrival)
+    order; a command that can't run because its project is busy doesn't hold up
+    commands for other projects.
+    """
+
+    def __init__(self):
+        self._queue: List[_Waiter] = []
+        self._running: Dict[str, int] = {}
+        self._exclusive: Set[str] = set()
+        self._total_running = 0
+        self._sequence = itertools.count()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of commands waiting for a slot."""
+        return len(self._queue)
+
+    def _has_capacity(self, project: str, exclusive: bool) -> bool:
+        """Whether a command for the project may start now."""
+        global_limit = get_config("max_concurrent_commands", 4)
+        project_limit = get_config("max_concurrent_per_project", 4)
+        return (
+            (not global_limit or self._total_running < global_limit)
+            and (not project_limit or self._running.get(project, 0) < project_limit)
+            and not (exclusive and project in self._exclusive)
+        )
+
+    def _start(self, project: str, exclusive: bool) -> None:
+        """Record a command as running."""
+        self._running[project] = self._running.get(project, 0) + 1
+        self._total_running += 1
+        if exclusive:
+            self._exclusive.add(project)
+
+    def _dispatch(self) -> None:
+        """
+        Grant slots to queued commands, in priority order, while capacity allows.
+
+        Isolated commands are served before exclusive ones, but once an exclusive
+        command is waiting for a project, isolated commands for that project that
+        arrived after it wait too, so a stream of reads can't starve a build.
+        """
+        dispatched_exclusive = True
+        while dispatched_exclusive:
+            dispatched_exclusive = False
+            # Arrival of the first exclusive command waiting for each project
+            gates: Dict[str, int] = {}
+            for waiter in self._queue:
+                if waiter.exclusive and not waiter.future.done():
+                    gates[waiter.project] = min(gates.get(waiter.project, waiter.sequence), waiter.sequence)
+
+            index = 0
+            while index < len(self._queue):
+                waiter = self._queue[index]
+                if waiter.future.done():
+                    # Cancelled while waiting
+                    self._queue.pop(index)
+                    continue
+                gated = not waiter.exclusive and waiter.sequence > gates.get(waiter.project, waiter.sequence)
+                if not gated and self._has_capacity(waiter.project, waiter.exclusive):
+                    self._queue.pop(index)
+                    self._start(waiter.project, waiter.exclusive)
+                    waiter.future.set_result(None)
+                    if waiter.exclusive:
+                        # Its project's gate is lifted, so look at the queue again
+                        dispatched_exclusive = True
+                        break
+                    continue
+                index += 1
+
+    def release(self, project: str, exclusive: bool) -> None:
+        """
+        Release a slot held by a finished command.
+
+        Args:
+            project: The project key the slot was acquired for
+            exclusive: Whether the slot was exclusive
+        """
+        if exclusive:
+            self._exclusive.discard(project)
+        self._running[project] -= 1
+        if not self._running[project]:
+            del self._running[project]
+        self._total_running -= 1
+        self._dispatch()
+
+    async def acquire(self, project: str, priority: int, exclusive: bool = True) -> None:
+        """
+        Wait for a slot to run a command.
+
+        Args:
+            project: The project key
+            priority: PRIORITY_READ or PRIORITY_BUILD
+            exclusive: Whether the command writes to the canonical target directory
+        """
+        if not self._queue and self._has_capacity(project, exclusive):
+            self._start(project, exclusive)
+            return
+
+        waiter = _Waiter(priority, next(self._sequence), project, exclusive, asyncio.get_running_loop().create_future())
+        bisect.insort(self._queue, waiter)
+        self._dispatch()
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # The slot was granted just as we were cancelled
+                self.release(project, exclusive)
+            else:
+                self._dispatch()
+            raise
+
+    @asynccontextmanager
+    async def slot(self, project_dir: str, command: List[str], exclusive: bool = True) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Hold a slot for the duration of a command.
+
+        Args:
+            project_dir: Directory containing the dbt project
+            command: List of command arguments (without the dbt executable)
+            exclusive: Whether the command writes to the canonical target directory
+
+        Yields:
+            Scheduling statistics: queue depth on arrival, wait time in seconds
+            and the command's priority
+        """
+        project = str(Path(project_dir).resolve())
+        priority = command_priority(command)
+        stats = {
+            "queue_depth": self.queue_depth,
+            "wait_time": 0.0,
+            "priority": "read" if priority == PRIORITY_READ else "build"
+        }
+
+        start = time.monotonic()
+        await self.acquire(project, priority, exclusive)
+        stats["wait_time"] = round(time.monotonic() - start, 3)
+
+        if stats["wait_time"] > 0.1:
+            logger.info(
+                f"dbt {command[0] if command else ''} waited {stats['wait_time']}s for a slot "
+                f"(queue depth on arrival: {stats['queue_depth']})"
+            )
+
+        try:
+            yield stats
+        finally:
+            self.release(project, exclusive)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the current scheduler state.
+
+        Returns:
+            Dictionary with running and queued command counts
+        """
+        return {
+            "running": self._total_running,
+            "running_per_project": dict(self._running),
+            "exclusive_projects": sorted(self._exclusive),
+            "queued": self.queue_depth
+        }
+
+
+# Scheduler shared by all tool calls
+scheduler = CommandScheduler()
@@ -0,0 +1,481 @@
+"""
+Full-text search for the DBT CLI MCP Server.
+
+Finding "the model that has customer lifetime value" with dbt_ls takes many
+calls. This module keeps an inverted index of each project's resources instead,
+built from manifest.json and, when it exists, catalog.json. Names, tags,
+descriptions, column names and descriptions, and the tokens of the raw SQL are
+indexed, each with its own weight, and queries are ranked with BM25.
+
+The index is kept per project and updated when the manifest or catalog changes:
+resources whose checksum and documented fields are unchanged keep their
+postings, and only the others are re-tokenized.
+"""
+
+import re
+import math
+import heapq
+import asyncio
+import logging
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.artifacts import file_signature
+from src.manifest import ManifestCache, compact_manifest_cache, get_parsed_manifest
+from src.manifest_stream import stream_entries
+from src.node_store import STORED_SECTIONS
+
+# Logger for this module
+logger = logging.getLogger(__name__)
+
+# Weight of a term occurrence in each indexed field
+FIELD_WEIGHTS = {
+    "name": 8.0,
+    "tags": 4.0,
+    "columns": 3.0,
+    "description": 2.0,
+    "column_descriptions": 1.0,
+    "code": 0.5,
+}
+FIELD_BITS = {field: 1 << index for index, field in enumerate(FIELD_WEIGHTS)}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Default number of results returned
+DEFAULT_LIMIT = 20
+
+# Length of the description excerpt returned with each result
+DESCRIPTION_EXCERPT = 200
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def normalize(token: str) -> str:
+    """Reduce a token to the form it is indexed under, folding simple plurals."""
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Split text into index terms.
+
+    Identifiers are split on underscores and other punctuation, so that
+    "customer_lifetime_value" matches a search for "customer lifetime value".
+
+    Args:
+        text: The text
+
+    Returns:
+        The terms, in order
+    """
+    if not text:
+        return []
+    return [normalize(token) for token in TOKEN_PATTERN.findall(text.lower())]
+
+
+class SearchDocument:
+    """
+    A resource as indexed: its weighted term frequencies and the fields each term occurs in.
+    """
+
+    __slots__ = ("unique_id", "name", "resource_type", "description", "columns", "digest", "terms", "fields", "length")
+
+    def __init__(
+        self,
+        unique_id: str,
+        entry: Dict[str, Any],
+        catalog_columns: Optional[Dict[str, Optional[str]]] = None,
+        digest: Optional[int] = None
+    ):
+        """
+        Args:
+            unique_id: The resource's unique_id
+            entry: The resource's manifest entry
+            catalog_columns: Column names and comments of the resource's relation in the catalog
+            digest: document_digest() of the entry
+        """
+        self.unique_id = unique_id
+        self.name = entry.get("name")
+        self.resource_type = entry.get("resource_type") or unique_id.split(".", 1)[0]
+        self.description = (entry.get("description") or "")[:DESCRIPTION_EXCERPT]
+        self.digest = digest
+
+        # Column names are matched case-insensitively, catalog comments fill in missing descriptions
+        columns: Dict[str, Optional[str]] = {}
+        for name, column in (entry.get("columns") or {}).items():
+            if isinstance(column, dict):
+                columns[name.lower()] = column.get("description") or None
+        for name, comment in (catalog_columns or {}).items():
+            if not columns.get(name.lower()):
+                columns[name.lower()] = comment or None
+        self.columns = tuple(columns)
+
+        field_texts = {
+            "name": [self.name, entry.get("source_name")],
+            "tags": entry.get("tags") or [],
+            "columns": list(columns),
+            "description": [entry.get("description")],
+            "column_descriptions": list(columns.values()),
+            "code": [entry.get("raw_code") or entry.get("raw_sql")],
+        }
+        frequencies: Counter = Counter()
+        self.fields: Dict[str, int] = {}
+        for field, texts in field_texts.items():
+            weight, bit = FIELD_WEIGHTS[field], FIELD_BITS[field]
+            for text in texts:
+                for term in tokenize(text):
+                    frequencies[term] += weight
+                    self.fields[term] = self.fields.get(term, 0) | bit
+        self.terms: Dict[str, float] = dict(frequencies)
+        self.length = sum(frequencies.values())
+
+
+def document_digest(entry: Dict[str, Any], catalog_columns: Optional[Dict[str, Optional[str]]] = None) -> int:
+    """
+    Get a digest of the indexed fields of a resource.
+
+    The raw SQL is covered by dbt's checksum of the resource's file, so it isn't
+    hashed again; the fields documented in yml files are hashed as they are.
+
+    Args:
+        entry: The resource's manifest entry
+        catalog_columns: Column names and comments of the resource's relation in the catalog
+
+    Returns:
+        The digest
+    """
+    checksum = (entry.get("checksum") or {}).get("checksum")
+    if checksum is None:
+        checksum = entry.get("raw_code") or entry.get("raw_sql")
+    columns = [
+        (name, column.get("description"))
+        for name, column in (entry.get("columns") or {}).items() if isinstance(column, dict)
+    ]
+    return hash((
+        checksum,
+        entry.get("name"),
+        entry.get("resource_type"),
+        entry.get("description"),
+        tuple(entry.get("tags") or ()),
+        tuple(columns),
+        tuple(sorted((catalog_columns or {}).items())),
+    ))
+
+
+def read_catalog(path: Path) -> Dict[str, Dict[str, Optional[str]]]:
+    """
+    Read the columns of every relation of a catalog.json file.
+
+    Args:
+        path: Path of the catalog
+
+    Returns:
+        Dictionary mapping unique_ids to their columns' names and comments
+    """
+    catalog = {}
+    for _, unique_id, entry in stream_entries(path, ("nodes", "sources")):
+        catalog[unique_id] = {
+            column.get("name") or name: column.get("comment")
+            for name, column in (entry.get("columns") or {}).items() if isinstance(column, dict)
+        }
+    return catalog
+
+
+class SearchIndex:
+    """
+    Inverted index of a project's resources.
+    """
+
+    def __init__(self):
+        self.documents: Dict[str, SearchDocument] = {}
+        # Term -> unique_id -> weighted term frequency
+        self.postings: Dict[str, Dict[str, float]] = {}
+        self.total_length = 0.0
+        # BM25 length normalization of each document, computed on the first search after a change
+        self._norms: Optional[Dict[str, float]] = None
+        self.signature: Optional[Tuple[Optional[tuple], Optional[tuple]]] = None
+
+    def _add(self, document: SearchDocument) -> None:
+        """Add a document's postings."""
+        self.documents[document.unique_id] = document
+        self._norms = None
+        for term, frequency in document.terms.items():
+            self.postings.setdefault(term, {})[document.unique_id] = frequency
+        self.total_length += document.length
+
+    def _remove(self, unique_id: str) -> None:
+        """Remove a document's postings."""
+        document = self.documents.pop(unique_id)
+        self._norms = None
+        for term in document.terms:
+            postings = self.postings[term]
+            del postings[unique_id]
+            if not postings:
+                del self.postings[term]
+        self.total_length -= document.length
+
+    def update(self, manifest_path: Path, catalog_path: Optional[Path] = None) -> Tuple[int, int]:
+        """
+        Bring the index up to date with a manifest and catalog.
+
+        Args:
+            manifest_path: Path of manifest.json
+            catalog_path: Path of catalog.json, if the project has one
+
+        Returns:
+            Tuple of (number of resources indexed again, number removed)
+
+        Raises:
+            OSError: If a file can't be read
+            ValueError: If a file isn't valid JSON
+        """
+        catalog = read_catalog(catalog_path) if catalog_path is not None else {}
+
+        seen = set()
+        changed = 0
+        for _, unique_id, entry in stream_entries(manifest_path, STORED_SECTIONS):
+            seen.add(unique_id)
+            catalog_columns = catalog.get(unique_id)
+            digest = document_digest(entry, catalog_columns)
+            document = self.documents.get(unique_id)
+            if document is not None:
+                if document.digest == digest:
+                    continue
+                self._remove(unique_id)
+            self._add(SearchDocument(unique_id, entry, catalog_columns, digest))
+            changed += 1
+
+        removed = [unique_id for unique_id in self.documents if unique_id not in seen]
+        for unique_id in removed:
+            self._remove(unique_id)
+        return changed, len(removed)
+
+    def search(
+        self,
+        query: str,
+        resource_types: Optional[Iterable[str]] = None,
+        limit: int = DEFAULT_LIMIT
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank the resources matching a query.
+
+        Args:
+            query: Free text (e.g. "customer lifetime value")
+            resource_types: Only return resources of these types; tests are only
+                            returned when they are listed here
+            limit: Maximum number of results
+
+        Returns:
+            The best matches first, each with its unique_id, name, resource_type,
+            score, the fields the query matched, the matching columns and the
+            start of its description
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self.documents:
+            return []
+
+        count = len(self.documents)
+        if self._norms is None:
+            average_length = self.total_length / count or 1.0
+            self._norms = {
+                unique_id: K1 * (1 - B + B * document.length / average_length)
+                for unique_id, document in self.documents.items()
+            }
+        norms = self._norms
+
+        scores: Dict[str, float] = {}
+        postings_list = sorted((self.postings[term] for term in terms if term in self.postings), key=len)
+        for postings in postings_list:
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5)) * (K1 + 1)
+            if scores and len(postings) > count // 2:
+                # A term most resources have only adds to the scores of resources the
+                # rarer terms already matched, rather than matching nearly everything
+                for unique_id in scores:
+                    frequency = postings.get(unique_id)
+                    if frequency:
+                        scores[unique_id] += idf * frequency / (frequency + norms[unique_id])
+                continue
+            for unique_id, frequency in postings.items():
+                scores[unique_id] = scores.get(unique_id, 0.0) + idf * frequency / (frequency + norms[unique_id])
+
+        documents = self.documents
+        allowed = set(resource_types) if resource_types else None
+        candidates = [
+            (unique_id, score) for unique_id, score in scores.items()
+            if (documents[unique_id].resource_type in allowed if allowed
+                else documents[unique_id].resource_type != "test")
+        ]
+        best = heapq.nsmallest(limit, candidates, key=lambda candidate: (-candidate[1], candidate[0]))
+        return [self._describe(documents[unique_id], score, terms) for unique_id, score in best]
+
+    @staticmethod
+    def _describe(document: SearchDocument, score: float, terms: List[str]) -> Dict[str, Any]:
+        """Get the fields returned for a match."""
+        bits = 0
+        for term in terms:
+            bits |= document.fields.get(term, 0)
+        term_set = set(terms)
+        overlaps = {column: len(term_set.intersection(tokenize(column))) for column in document.columns}
+        return {
+            "unique_id": document.unique_id,
+            "name": document.name,
+            "resource_type": document.resource_type,
+            "score": round(score, 3),
+            "matched": [field for field, bit in FIELD_BITS.items() if bits & bit],
+            "columns": sorted((column for column in document.columns if overlaps[column]), key=lambda column: -overlaps[column]),
+            "description": document.description,
+        }
+
+
+class SearchIndexCache:
+    """
+    Process-wide search indexes, one per manifest, updated when their files change.
+
+    Indexes live as long as their manifest is in the manifest cache: the indexes
+    of manifests it evicted or dropped are removed on the next search.
+    """
+
+    def __init__(self, manifests: ManifestCache = compact_manifest_cache):
+        """
+        Args:
+            manifests: The cache whose manifests the indexes are kept for
+        """
+        self.manifests = manifests
+        self._indexes: Dict[Path, SearchIndex] = {}
+        self._lock = threading.Lock()
+        self._load_locks: Dict[Path, threading.Lock] = {}
+
+    def search(
+        self,
+        manifest_path: Path,
+        query: str,
+        resource_types: Optional[Iterable[str]] = None,
+        limit: int = DEFAULT_LIMIT
+    ) -> List[Dict[str, Any]]:
+        """
+        Search the index of a manifest, updating it first if the manifest or the
+        catalog next to it changed. The search holds the index's lock, so a
+        concurrent update can't change it midway.
+
+        Args:
+            manifest_path: Path of manifest.json
+            query: Free text (e.g. "customer lifetime value")
+            resource_types: Only return resources of these types
+            limit: Maximum number of results
+
+        Returns:
+            The best matches first, as returned by SearchIndex.search()
+
+        Raises:
+            OSError: If a file can't be read
+            ValueError: If a file isn't valid JSON
+        """
+        manifest_path = manifest_path.resolve()
+        self._prune(manifest_path)
+        index, load_lock = self._entry(manifest_path)
+        with load_lock:
+            self._refresh(index, manifest_path)
+            return index.search(query, resource_types, limit)
+
+    def _prune(self, manifest_path: Path) -> None:
+        """Drop the indexes of manifests no longer cached, other than the one being searched."""
+        cached = set(self.manifests.paths())
+        with self._lock:
+            for path in list(self._indexes):
+                if path != manifest_path and path not in cached:
+                    logger.debug(f"Dropping search index of {path}")
+                    del self._indexes[path]
+                    self._load_locks.pop(path, None)
+
+    def _entry(self, manifest_path: Path) -> Tuple[SearchIndex, threading.Lock]:
+        """Get the index of a manifest and the lock guarding it."""
+        manifest_path = manifest_path.resolve()
+        with self._lock:
+            index = self._indexes.setdefault(manifest_path, SearchIndex())
+            load_lock = self._load_locks.setdefault(manifest_path, threading.Lock())
+        return index, load_lock
+
+    def _refresh(self, index: SearchIndex, manifest_path: Path) -> None:
+        """Update an index if the manifest or the catalog next to it changed. Call with its lock held."""
+        manifest_path = manifest_path.resolve()
+        catalog_path = manifest_path.parent / "catalog.json"
+        # Take the signatures before reading, so files rewritten during the
+        # update are read again on the next call
+        signature = (file_signature(manifest_path), file_signature(catalog_path))
+        if index.signature != signature:
+            changed, removed = index.update(manifest_path, catalog_path if signature[1] else None)
+            index.signature = signature
+            logger.info(f"Updated search index of {manifest_path}: {changed} resources indexed, {removed} removed")
+
+    def invalidate(self, manifest_path: Optional[Path] = None) -> None:
+        """
+        Drop an index, or all of them.
+
+        Args:
+            manifest_path: Path of the manifest whose index to drop (all if None)
+        """
+        with self._lock:
+            if manifest_path is None:
+                self._indexes.clear()
+                self._load_locks.clear()
+            else:
+                self._indexes.pop(manifest_path.resolve(), None)
+                self._load_locks.pop(manifest_path.resolve(), None)
+
+
+# Indexes shared by all tool calls
+search_index_cache = SearchIndexCache()
+
+
+async def search_project(
+    query: str,
+    project_dir: str = ".",
+    profiles_dir: Optional[str] = None,
+    resource_types: Optional[List[str]] = None,
+    limit: int = DEFAULT_LIMIT
+) -> Dict[str, Any]:
+    """
+    Search a project's resources, parsing the project first if its manifest is missing or stale.
+
+    Args:
+        query: Free text (e.g. "customer lifetime value")
+        project_dir: Directory containing the dbt project
+        profiles_dir: Directory containing the profiles.yml file
+        resource_types: Only return resources of these types
+        limit: Maximum number of results
+
+    Returns:
+        A result in the format of execute_dbt_command, with the ranked matches as its output
+    """
+    if limit < 1:
+        return {"success": False, "output": None, "error": "limit must be at least 1", "returncode": 1}
+
+    manifest, failure = await get_parsed_manifest(project_dir, profiles_dir)
+    if manifest is None:
+        return failure
+
+    def run_search() -> List[Dict[str, Any]]:
+        return search_index_cache.search(manifest.path, query, resource_types, limit)
+
+    try:
+        output = await asyncio.to_thread(run_search)
+    except (OSError, ValueError) as e:
+        return {"success": False, "output": None, "error": f"Failed to index the project: {e}", "returncode": 1}
+
+    return {
+        "success": True,
+        "output": output,
+        "error": None,
+        "returncode": 0,
+        "timed_out": False,
+        "scheduling": None,
+        "backend": "manifest"
+    }
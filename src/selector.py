@@ -0,0 +1,722 @@
+"""
+In-process node selection for the DBT CLI MCP Server.
+
+This module evaluates dbt's node selection syntax against a project's cached
+manifest, so `dbt ls` can be answered in milliseconds instead of spawning dbt
+and re-parsing the project. Only the common selection methods and graph operators
+are supported; anything else raises UnsupportedSelection and the command falls
+back to running dbt.
+"""
+
+import os
+import re
+import json
+import asyncio
+import logging
+from fnmatch import fnmatch
+from pathlib import Path, PurePath
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from src.config import get_config
+from src.environment import get_environment
+from src.manifest import ManifestFile, get_compact_manifest
+from src.node_store import JSON_COLUMNS, NodeStore
+
+# Logger for this module
+logger = logging.getLogger(__name__)
+
+# dbt's selection criterion syntax: [@][n+][method:]value[+n]
+SELECTOR_PATTERN = re.compile(
+    r"\A"
+    r"(?P<childrens_parents>@)?"
+    r"(?P<parents>(?P<parents_depth>\d*)\+)?"
+    r"(?:(?P<method>[\w.]+):)?(?P<value>.*?)"
+    r"(?P<children>\+(?P<children_depth>\d*))?"
+    r"\Z"
+)
+
+# Resource types listed by `dbt ls` without --resource-type, and with "all"
+DEFAULT_LIST_RESOURCE_TYPES = frozenset({
+    "model", "test", "seed", "snapshot", "source", "exposure", "metric",
+    "semantic_model", "saved_query", "unit_test",
+})
+ALL_LIST_RESOURCE_TYPES = DEFAULT_LIST_RESOURCE_TYPES | {"analysis"}
+
+# Resource types selected indirectly when a node they test is selected
+INDIRECT_RESOURCE_TYPES = frozenset({"test", "unit_test"})
+
+# Keys of each resource included in `dbt ls --output json`, in the order they are output
+LIST_JSON_KEYS = (
+    "name", "resource_type", "package_name", "original_file_path", "unique_id",
+    "alias", "source_name", "tags", "config", "depends_on",
+)
+
+# Resource types of the manifest's sections other than nodes
+NON_NODE_RESOURCE_TYPES = frozenset({"source", "exposure", "metric", "semantic_model", "saved_query", "unit_test"})
+
+# Selection methods matching resources by "[package.]name", and the resource types they search
+NAMED_RESOURCE_METHODS = {
+    "exposure": "exposure",
+    "metric": "metric",
+    "semantic_model": "semantic_model",
+    "saved_query": "saved_query",
+}
+
+# Option flags of `dbt ls` that can be evaluated in-process
+SELECT_FLAGS = ("-s", "--select", "-m", "--models", "--model")
+EXCLUDE_FLAGS = ("--exclude",)
+RESOURCE_TYPE_FLAGS = ("--resource-type", "--resource-types")
+IGNORED_FLAGS = ("-q", "--quiet")
+IGNORED_OPTIONS = ("--log-format",)
+
+
+class UnsupportedSelection(Exception):
+    """Raised for selection syntax or options that can't be evaluated in-process."""
+
+
+@dataclass
+class Criterion:
+    """A single selection criterion, e.g. `2+tag:nightly+`."""
+    raw: str
+    method: str
+    value: str
+    parents: bool = False
+    parents_depth: Optional[int] = None
+    children: bool = False
+    children_depth: Optional[int] = None
+    childrens_parents: bool = False
+
+
+@dataclass
+class ListRequest:
+    """The options of a `dbt ls` command."""
+    select: List[str] = field(default_factory=list)
+    exclude: List[str] = field(default_factory=list)
+    resource_types: List[str] = field(default_factory=list)
+    output: str = "selector"
+    models_only: bool = False
+    quiet: bool = False
+
+
+def default_method(value: str) -> str:
+    """
+    Get the selection method dbt uses for a criterion without one.
+
+    Args:
+        value: The criterion's value
+
+    Returns:
+        "path" for paths, "file" for file names, otherwise "fqn"
+    """
+    if os.sep in value or (os.altsep and os.altsep in value):
+        return "path"
+    if value.lower().endswith((".sql", ".py", ".csv")):
+        return "file"
+    return "fqn"
+
+
+def parse_criterion(raw: str) -> Criterion:
+    """
+    Parse a selection criterion.
+
+    Args:
+        raw: The criterion, e.g. "+customers" or "config.materialized:table"
+
+    Returns:
+        The parsed criterion
+
+    Raises:
+        UnsupportedSelection: If the criterion can't be parsed
+    """
+    match = SELECTOR_PATTERN.match(raw)
+    if not match or not match.group("value"):
+        raise UnsupportedSelection(f"Invalid selection criterion: {raw}")
+
+    def depth(value: Optional[str]) -> Optional[int]:
+        return int(value) if value else None
+
+    criterion = Criterion(
+        raw=raw,
+        method=match.group("method") or default_method(match.group("value")),
+        value=match.group("value"),
+        parents=bool(match.group("parents")),
+        parents_depth=depth(match.group("parents_depth")),
+        children=bool(match.group("children")),
+        children_depth=depth(match.group("children_depth")),
+        childrens_parents=bool(match.group("childrens_parents")),
+    )
+    if criterion.childrens_parents and (criterion.parents or criterion.children):
+        raise UnsupportedSelection(f"'@' can't be combined with '+': {raw}")
+    return criterion
+
+
+def fqn_matches(fqn: List[str], selector: str, is_versioned: bool) -> bool:
+    """
+    Check whether a node's fully qualified name matches a selector, as dbt does.
+
+    The selector matches the node's name, or a prefix of its fully qualified name
+    (e.g. "my_project.staging"), where a "*" part matches everything below it.
+
+    Args:
+        fqn: The node's fully qualified name
+        selector: The selector value
+        is_versioned: Whether the node is a versioned model
+
+    Returns:
+        True if the node matches
+    """
+    flat_selector = selector.split(".")
+    if is_versioned:
+        if len(fqn) >= 2 and (fqn[-2] == selector or "_".join(fqn[-2:]) == "_".join(flat_selector[-2:])):
+            return True
+    elif fqn and fqn[-1] == selector:
+        return True
+
+    flat_fqn = [item for segment in fqn for item in segment.split(".")]
+    if len(flat_selector) > len(flat_fqn):
+        return False
+    for i, part in enumerate(flat_selector):
+        if part == "*":
+            return True
+        if flat_fqn[i] != part:
+            return False
+    return True
+
+
+def _config_value_matches(value: Any, selector: str) -> bool:
+    """Check whether a config value matches a `config.<key>:` selector."""
+    if isinstance(value, list):
+        return any(_config_value_matches(item, selector) for item in value)
+    if isinstance(value, bool):
+        return str(value).lower() == selector.lower()
+    if isinstance(value, dict) or value is None:
+        return False
+    return str(value) == selector
+
+
+class SelectorEngine:
+    """
+    Evaluates dbt selection syntax against a manifest's node store.
+
+    Supports model names and fully qualified names, the `+`, `n+` and `@` graph
+    operators, the tag, path, file, resource_type, package, config.<key>, source,
+    exposure, metric, semantic_model and saved_query methods, unions (spaces),
+    intersections (commas) and exclusions, with dbt's default "eager" selection
+    of tests attached to selected nodes.
+
+    Resources are handled by their node ids internally; select() returns unique_ids.
+    """
+
+    def __init__(self, manifest: ManifestFile, project_dir: str):
+        """
+        Args:
+            manifest: The project's manifest (usually a CompactManifest)
+            project_dir: Directory containing the dbt project (paths are relative to it)
+        """
+        self.manifest = manifest
+        self.store = manifest.node_store
+        self.project_path = Path(project_dir).resolve()
+
+    def _resources(self, resource_types: Optional[Iterable[str]] = None) -> Iterator[int]:
+        """
+        Iterate over the ids of the manifest's resources, optionally of some types.
+        Nodes only referenced by the graph maps have no resource type and are skipped.
+        """
+        strings = self.store.strings
+        if resource_types is None:
+            return (node_id for node_id, code in enumerate(self.store.columns["resource_type"]) if code)
+        codes = {strings.codes[resource_type] for resource_type in resource_types if resource_type in strings.codes}
+        return (node_id for node_id, code in enumerate(self.store.columns["resource_type"]) if code in codes)
+
+    def _filter(self, predicate: Callable[[int], bool], resource_types: Optional[Iterable[str]] = None) -> Set[int]:
+        """Get the ids of resources matching a predicate."""
+        return {node_id for node_id in self._resources(resource_types) if predicate(node_id)}
+
+    def _value(self, node_id: int, column: str) -> Optional[str]:
+        """Get a string field of a resource."""
+        return self.store.value(node_id, column)
+
+    def _node_resource_types(self) -> Set[str]:
+        """Get the resource types in the store that belong to the manifest's nodes section."""
+        strings = self.store.strings
+        return {strings[code] for code in set(self.store.columns["resource_type"]) if code} - NON_NODE_RESOURCE_TYPES
+
+    def _match_fqn(self, value: str) -> Set[int]:
+        """Match nodes by name or fully qualified name."""
+        if any(char in part for part in value.split(".") if part != "*" for char in "*?[]"):
+            raise UnsupportedSelection(f"Wildcards in names aren't supported: {value}")
+
+        matched = set()
+        for node_id in self._resources(self._node_resource_types()):
+            fqn = self.store.json_value(node_id, "fqn") or []
+            is_versioned = self.store.columns["version"][node_id] != 0
+            if fqn_matches(fqn, value, is_versioned):
+                matched.add(node_id)
+            elif len(fqn) > 1 and fqn_matches(fqn[1:], value, is_versioned):
+                # Matches below the package level (e.g. a folder name) differ between dbt versions
+                raise UnsupportedSelection(f"Ambiguous name selector: {value}")
+        return matched
+
+    def _match_path(self, value: str) -> Set[int]:
+        """Match resources defined in files or directories matching a glob."""
+        value = value.rstrip("/" + (os.altsep or ""))
+        if not value or PurePath(value).is_absolute() or ".." in PurePath(value).parts:
+            raise UnsupportedSelection(f"Unsupported path selector: {value}")
+        # glob() raises ValueError for invalid patterns and NotImplementedError for non-relative ones
+        try:
+            paths = {path.relative_to(self.project_path) for path in self.project_path.glob(value)}
+        except (ValueError, NotImplementedError) as e:
+            raise UnsupportedSelection(f"Unsupported path selector: {value}") from e
+
+        def in_paths(node_id: int) -> bool:
+            original_file_path = PurePath(self._value(node_id, "original_file_path") or "")
+            if original_file_path in paths or any(parent in paths for parent in original_file_path.parents):
+                return True
+            patch_path = self._value(node_id, "patch_path")
+            return bool(patch_path) and PurePath(patch_path.split("://", 1)[-1]) in paths
+
+        return self._filter(in_paths)
+
+    def _match_named(self, value: str, resource_type: str) -> Set[int]:
+        """Match resources by "[package.]name"."""
+        parts = value.split(".")
+        if len(parts) == 1:
+            package, name = "*", parts[0]
+        elif len(parts) == 2:
+            package, name = parts
+        else:
+            raise UnsupportedSelection(f"Invalid selector: {value}")
+        if package == "this":
+            package = self.manifest.project_name or ""
+
+        return self._filter(
+            lambda node_id: (
+                fnmatch(self._value(node_id, "package_name") or "", package)
+                and fnmatch(self._value(node_id, "name") or "", name)
+            ),
+            (resource_type,)
+        )
+
+    def _match_source(self, value: str) -> Set[int]:
+        """Match sources by "[package.]source[.table]"."""
+        parts = value.split(".")
+        if len(parts) == 1:
+            package, source, table = "*", parts[0], "*"
+        elif len(parts) == 2:
+            package, (source, table) = "*", parts
+        elif len(parts) == 3:
+            package, source, table = parts
+        else:
+            raise UnsupportedSelection(f"Invalid source selector: {value}")
+        if package == "this":
+            package = self.manifest.project_name or ""
+
+        return self._filter(
+            lambda node_id: (
+                fnmatch(self._value(node_id, "package_name") or "", package)
+                and fnmatch(self._value(node_id, "source_name") or "", source)
+                and fnmatch(self._value(node_id, "name") or "", table)
+            ),
+            ("source",)
+        )
+
+    def _match_config(self, keys: List[str], value: str) -> Set[int]:
+        """Match resources by a config value. Each distinct config is decoded and checked once."""
+        strings = self.store.strings
+        configs = self.store.columns["config"]
+        results: Dict[int, bool] = {}
+
+        def config_matches(node_id: int) -> bool:
+            code = configs[node_id]
+            if code not in results:
+                config_value: Any = json.loads(strings[code]) if code else {}
+                for key in keys:
+                    if not isinstance(config_value, dict) or key not in config_value:
+                        results[code] = False
+                        break
+                    config_value = config_value[key]
+                else:
+                    results[code] = _config_value_matches(config_value, value)
+            return results[code]
+
+        return self._filter(config_matches)
+
+    def match(self, criterion: Criterion) -> Set[int]:
+        """
+        Get the resources a criterion's method and value select, before graph operators.
+
+        Args:
+            criterion: The criterion
+
+        Returns:
+            Ids of the matching resources
+
+        Raises:
+            UnsupportedSelection: If the method isn't supported
+        """
+        method, value = criterion.method, criterion.value
+
+        if method == "fqn":
+            return self._match_fqn(value)
+        if method == "tag":
+            return self._filter(lambda node_id: any(fnmatch(tag, value) for tag in self.store.tags(node_id)))
+        if method == "path":
+            return self._match_path(value)
+        if method == "file":
+            def file_matches(node_id: int) -> bool:
+                path = PurePath(self._value(node_id, "original_file_path") or "")
+                return fnmatch(path.name, value) or fnmatch(path.stem, value)
+
+            return self._filter(file_matches)
+        if method == "resource_type":
+            if value not in ALL_LIST_RESOURCE_TYPES:
+                raise UnsupportedSelection(f"Unsupported resource type: {value}")
+            return set(self._resources((value,)))
+        if method == "package":
+            package = (self.manifest.project_name or "") if value == "this" else value
+            return self._filter(lambda node_id: fnmatch(self._value(node_id, "package_name") or "", package))
+        if method.startswith("config."):
+            return self._match_config(method.split(".")[1:], value)
+        if method == "source":
+            return self._match_source(value)
+        if method in NAMED_RESOURCE_METHODS:
+            return self._match_named(value, NAMED_RESOURCE_METHODS[method])
+
+        raise UnsupportedSelection(f"Unsupported selection method: {method}")
+
+    def _walk(self, start: Set[int], neighbours: Callable[[int], Iterable[int]], depth: Optional[int]) -> Set[int]:
+        """Get the nodes reachable from a set of nodes, up to a depth."""
+        seen: Set[int] = set()
+        frontier = set(start)
+        level = 0
+        while frontier and (depth is None or level < depth):
+            level += 1
+            next_frontier = set()
+            for node_id in frontier:
+                for neighbour in neighbours(node_id):
+                    if neighbour not in seen:
+                        seen.add(neighbour)
+                        next_frontier.add(neighbour)
+            frontier = next_frontier
+        return seen
+
+    def _closure(self, start: Set[int], upstream: bool, depth: Optional[int]) -> Set[int]:
+        """
+        Get the ancestors or descendants of a set of nodes, up to a depth. Unlimited
+        closures come from the manifest's reachability index when it has one.
+        """
+        index = self.manifest.reachability if depth is None else None
+        if index is None:
+            return self._walk(start, self.store.parents if upstream else self.store.children, depth)
+
+        bits = index.ancestors(start) if upstream else index.descendants(start)
+        return set(index.node_ids(bits))
+
+    def select_criterion(self, criterion: Criterion) -> Set[int]:
+        """
+        Get the resources selected by a criterion, including graph operators
+        and tests selected indirectly.
+
+        Args:
+            criterion: The criterion
+
+        Returns:
+            Ids of the selected resources
+        """
+        selected = self.match(criterion)
+        collected = set(selected)
+
+        if criterion.childrens_parents:
+            descendants = self._closure(selected, False, None)
+            collected |= descendants | self._closure(selected | descendants, True, None)
+        else:
+            if criterion.parents:
+                collected |= self._closure(selected, True, criterion.parents_depth)
+            if criterion.children:
+                collected |= self._closure(selected, False, criterion.children_depth)
+
+        # Graph maps may mention resources that aren't in the manifest's sections
+        resource_types = self.store.columns["resource_type"]
+        collected = {node_id for node_id in collected if resource_types[node_id]}
+
+        # Tests of selected nodes are selected too ("eager" indirect selection)
+        for node_id in list(collected):
+            for child in self.store.children(node_id):
+                if self._value(child, "resource_type") in INDIRECT_RESOURCE_TYPES:
+                    collected.add(child)
+        return collected
+
+    def select_union(self, arguments: List[str]) -> Tuple[Set[int], List[str]]:
+        """
+        Evaluate selection arguments: space-separated criteria are unioned and
+        comma-separated criteria intersected.
+
+        Args:
+            arguments: The values passed to --select or --exclude
+
+        Returns:
+            Tuple of (ids of the selected resources, criteria that matched nothing)
+        """
+        selected: Set[int] = set()
+        unmatched = []
+        for token in " ".join(arguments).split():
+            parts = [self.select_criterion(parse_criterion(part)) for part in token.split(",") if part]
+            matches = set.intersection(*parts) if parts else set()
+            if not matches:
+                unmatched.append(token)
+            selected |= matches
+        return selected, unmatched
+
+    def select_ids(self, select: List[str], exclude: List[str]) -> Tuple[Set[int], List[str]]:
+        """
+        Evaluate a selection.
+
+        Args:
+            select: The values passed to --select (everything if empty)
+            exclude: The values passed to --exclude
+
+        Returns:
+            Tuple of (ids of the selected resources, criteria that matched nothing)
+        """
+        if select:
+            selected, unmatched = self.select_union(select)
+        else:
+            selected, unmatched = set(self._resources()), []
+        if exclude:
+            selected -= self.select_union(exclude)[0]
+        return selected, unmatched
+
+    def select(self, select: List[str], exclude: List[str]) -> Tuple[Set[str], List[str]]:
+        """
+        Evaluate a selection.
+
+        Args:
+            select: The values passed to --select (everything if empty)
+            exclude: The values passed to --exclude
+
+        Returns:
+            Tuple of (selected unique_ids, criteria that matched nothing)
+        """
+        selected, unmatched = self.select_ids(select, exclude)
+        return {self.store.unique_ids[node_id] for node_id in selected}, unmatched
+
+
+def parse_list_command(command: List[str]) -> ListRequest:
+    """
+    Parse the options of a `dbt ls` command.
+
+    Args:
+        command: List of command arguments (without the dbt executable)
+
+    Returns:
+        The parsed options
+
+    Raises:
+        UnsupportedSelection: If the command uses options that can't be evaluated in-process
+    """
+    request = ListRequest()
+    args = list(command[1:])
+    index = 0
+
+    def values() -> List[str]:
+        nonlocal index
+        collected = []
+        while index < len(args) and not args[index].startswith("-"):
+            collected.append(args[index])
+            index += 1
+        return collected
+
+    while index < len(args):
+        arg = args[index]
+        index += 1
+        if "=" in arg and arg.startswith("--"):
+            arg, inline_value = arg.split("=", 1)
+            args.insert(index, inline_value)
+
+        if arg in SELECT_FLAGS:
+            request.select.extend(values())
+            request.models_only = request.models_only or arg in ("-m", "--models", "--model")
+        elif arg in EXCLUDE_FLAGS:
+            request.exclude.extend(values())
+        elif arg in RESOURCE_TYPE_FLAGS:
+            request.resource_types.extend(values())
+        elif arg == "--output":
+            output = values()
+            if len(output) != 1 or output[0] not in ("json", "name", "path", "selector"):
+                raise UnsupportedSelection(f"Unsupported output format: {output}")
+            request.output = output[0]
+        elif arg == "--indirect-selection":
+            if values() != ["eager"]:
+                raise UnsupportedSelection("Only eager indirect selection is supported")
+        elif arg in IGNORED_FLAGS:
+            request.quiet = True
+        elif arg in IGNORED_OPTIONS:
+            values()
+        else:
+            raise UnsupportedSelection(f"Unsupported option: {arg}")
+    return request
+
+
+def list_resource_types(request: ListRequest) -> Set[str]:
+    """Get the resource types a `dbt ls` command lists."""
+    if request.models_only:
+        return {"model"}
+    if not request.resource_types:
+        return set(DEFAULT_LIST_RESOURCE_TYPES)
+
+    resource_types = set(request.resource_types)
+    if "default" in resource_types:
+        resource_types.discard("default")
+        resource_types |= DEFAULT_LIST_RESOURCE_TYPES
+    if "all" in resource_types:
+        resource_types.discard("all")
+        resource_types |= ALL_LIST_RESOURCE_TYPES
+    if not resource_types <= ALL_LIST_RESOURCE_TYPES:
+        raise UnsupportedSelection(f"Unsupported resource types: {sorted(resource_types - ALL_LIST_RESOURCE_TYPES)}")
+    return resource_types
+
+
+def format_resource(store: NodeStore, node_id: int, output: str) -> Any:
+    """
+    Format a resource the way `dbt ls` prints it.
+
+    Args:
+        store: The manifest's node store
+        node_id: The resource's id
+        output: "json", "name", "path" or "selector"
+
+    Returns:
+        A dictionary for json output, otherwise a string
+    """
+    resource_type = store.value(node_id, "resource_type")
+    name = store.value(node_id, "name")
+    if output == "json":
+        resource: Dict[str, Any] = {}
+        for key in LIST_JSON_KEYS:
+            if key == "unique_id":
+                resource[key] = store.unique_ids[node_id]
+            elif key == "tags":
+                resource[key] = store.tags(node_id)
+            elif key in JSON_COLUMNS:
+                value = store.json_value(node_id, key)
+                if value is not None:
+                    resource[key] = value
+            elif store.value(node_id, key) is not None:
+                resource[key] = store.value(node_id, key)
+        return resource
+    if output == "path":
+        return store.value(node_id, "original_file_path")
+    if output == "name":
+        if resource_type == "source":
+            return f"{store.value(node_id, 'source_name')}.{name}"
+        version = store.json_value(node_id, "version")
+        if version is not None:
+            return f"{name}.v{version}"
+        return name
+
+    package_name = store.value(node_id, "package_name")
+    if resource_type == "source":
+        return f"source:{package_name}.{store.value(node_id, 'source_name')}.{name}"
+    if resource_type in ("exposure", "metric", "semantic_model", "saved_query"):
+        return f"{resource_type}:{package_name}.{name}"
+    return ".".join(store.json_value(node_id, "fqn") or [name or ""])
+
+
+def list_resources(manifest: ManifestFile, project_dir: str, request: ListRequest) -> Any:
+    """
+    Answer a `dbt ls` command from a manifest.
+
+    Args:
+        manifest: The project's manifest (usually a CompactManifest)
+        project_dir: Directory containing the dbt project
+        request: The parsed command
+
+    Returns:
+        A list of resource dictionaries for json output, otherwise the printed
+        lines; without --quiet, criteria that matched nothing are reported the
+        way dbt reports them (and the output is returned as text)
+
+    Raises:
+        UnsupportedSelection: If the selection can't be evaluated in-process
+    """
+    store = manifest.node_store
+    if not request.select and store.default_selectors:
+        raise UnsupportedSelection("The project defines a default selector")
+
+    resource_types = list_resource_types(request)
+    selected, unmatched = SelectorEngine(manifest, project_dir).select_ids(request.select, request.exclude)
+
+    resources = []
+    for node_id in sorted(selected, key=store.unique_ids.__getitem__):
+        if store.value(node_id, "resource_type") in resource_types:
+            resources.append(format_resource(store, node_id, request.output))
+
+    if unmatched and not request.quiet:
+        warnings = [f"The selection criterion '{token}' does not match any enabled nodes" for token in unmatched]
+        lines = warnings + [line if isinstance(line, str) else json.dumps(line) for line in resources]
+        return "\n".join(lines) + "\n"
+    if request.output == "json":
+        return resources
+    return "\n".join(resources) + "\n" if resources else ""
+
+
+async def list_from_manifest(
+    command: List[str],
+    project_dir: str = ".",
+    profiles_dir: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Answer a `dbt ls` command from the project's cached manifest.
+
+    Args:
+        command: List of command arguments (without the dbt executable)
+        project_dir: Directory containing the dbt project
+        profiles_dir: Directory containing the profiles.yml file
+
+    Returns:
+        A result in the format of execute_dbt_command, or None if the manifest is
+        missing or stale or the command can't be evaluated in-process
+    """
+    if not get_config("manifest_selection", True):
+        return None
+
+    try:
+        request = parse_list_command(command)
+    except UnsupportedSelection as e:
+        logger.debug(f"Running dbt for ls: {e}")
+        return None
+
+    env_vars = get_environment(project_dir, profiles_dir)
+    if env_vars.get("DBT_INDIRECT_SELECTION", "eager") != "eager":
+        logger.debug("Running dbt for ls: DBT_INDIRECT_SELECTION is not eager")
+        return None
+
+    def evaluate() -> Optional[Any]:
+        manifest = get_compact_manifest(project_dir, env_vars)
+        if manifest is None:
+            logger.debug("Running dbt for ls: no manifest")
+            return None
+        if not manifest.is_fresh(project_dir):
+            logger.debug("Running dbt for ls: manifest is stale")
+            return None
+        return list_resources(manifest, project_dir, request)
+
+    try:
+        output = await asyncio.to_thread(evaluate)
+    except UnsupportedSelection as e:
+        logger.info(f"Running dbt for ls: {e}")
+        return None
+    if output is None:
+        return None
+
+    logger.info(f"Answered dbt {' '.join(command)} from the manifest")
+    return {
+        "success": True,
+        "output": output,
+        "error": None,
+        "returncode": 0,
+        "timed_out": False,
+        "scheduling": None,
+        "backend": "manifest"
+    }
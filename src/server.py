@@ -40,6 +40,17 @@ def parse_args():
         choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
         default=os.environ.get("LOG_LEVEL", "INFO")
     )
+    parser.add_argument(
+        "--execution-backend",
+        help="How dbt commands are executed: a new subprocess per command, or long-lived dbtRunner workers",
+        choices=["subprocess", "dbt_runner"],
+        default=os.environ.get("EXECUTION_BACKEND", "subprocess")
+    )
+    parser.add_argument(
+        "--dbt-python",
+        help="Python interpreter with dbt-core installed (dbt_runner backend only)",
+        default=os.environ.get("DBT_PYTHON")
+    )
     parser.add_argument(
         "--mock-mode",
         help="Enable mock mode for testing",
@@ -78,6 +89,9 @@ def main():
     os.environ["ENV_FILE"] = args.env_file
     os.environ["LOG_LEVEL"] = args.log_level
     os.environ["MOCK_MODE"] = str(args.mock_mode).lower()
+    os.environ["EXECUTION_BACKEND"] = args.execution_backend
+    if args.dbt_python:
+        os.environ["DBT_PYTHON"] = args.dbt_python
     
     # Initialize configuration
     initialize_config()
@@ -92,6 +106,7 @@ def main():
     logger.info(f"Starting DBT CLI MCP Server")
     logger.info(f"dbt path: {get_config('dbt_path')}")
     logger.info(f"Environment file: {get_config('env_file')}")
+    logger.info(f"Execution backend: {get_config('execution_backend')}")
     logger.info(f"Mock mode: {get_config('mock_mode')}")
     
     # Run the server
@@ -6,7 +6,6 @@ Each tool is a function decorated with @mcp.tool() that handles a specific dbt c
 """
 
 import logging
-import json
 import re
 from typing import Optional, Dict, Any, List
 from functools import partial
@@ -16,7 +15,12 @@ from pydantic import Field
 
 from src.command import execute_dbt_command, parse_dbt_list_output, process_command_result
 from src.config import get_config, set_config
-from src.formatters import default_formatter, ls_formatter, show_formatter
+from src.formatters import LS_ENCODINGS, conflicting_fields, default_formatter, ls_formatter, ls_items, ls_page_formatter, show_formatter
+from src.manifest import find_nodes_by_name
+from src.lineage import MAX_PATHS, get_lineage
+from src.search import DEFAULT_LIMIT as SEARCH_LIMIT, search_project
+from src.log_preview import Preview
+from src.pagination import list_page
 
 # Logger for this module
 logger = logging.getLogger(__name__)
@@ -60,7 +64,9 @@ def register_tools(mcp: FastMCP) -> None:
         """Run dbt models. An AI agent should use this tool when it needs to execute dbt models to transform data and build analytical tables in the data warehouse. This is essential for refreshing data or implementing new data transformations in a project.
 
         Returns:
-            Output from the dbt run command as text (this command does not support JSON output format)
+            JSON summary of the run from run_results.json (per-node status, execution time,
+            rows affected and failures, with full messages for failing nodes), or the
+            command's text output if no run results were written
         """
         command = ["run"]
 
@@ -110,7 +116,9 @@ def register_tools(mcp: FastMCP) -> None:
         """Run dbt tests. An AI agent should use this tool when it needs to validate data quality and integrity by running tests defined in a dbt project. This helps ensure that data transformations meet expected business rules and constraints before being used for analysis or reporting.
 
         Returns:
-            Output from the dbt test command as text (this command does not support JSON output format)
+            JSON summary of the test from run_results.json (per-node status, execution time,
+            rows affected and failures, with full messages for failing nodes), or the
+            command's text output if no run results were written
         """
         command = ["test"]
 
@@ -164,6 +172,22 @@ def register_tools(mcp: FastMCP) -> None:
         verbose: bool = Field(
             default=False,
             description="Return full JSON output instead of simplified version"
+        ),
+        fields: Optional[List[str]] = Field(
+            default=None,
+            description="Fields of each resource to return, as dotted paths (e.g. [\"unique_id\", \"config.materialized\"]); overrides verbose"
+        ),
+        encoding: str = Field(
+            default="rows",
+            description="JSON encoding: 'rows' for a list of objects, or 'columnar' for {columns, rows}, which doesn't repeat the keys of every resource"
+        ),
+        page_size: Optional[int] = Field(
+            default=None,
+            description="Return the resources a page of this many at a time, with a cursor for the next page"
+        ),
+        cursor: Optional[str] = Field(
+            default=None,
+            description="next_cursor of the previous page, to get the following page (pass the same other arguments)"
         )
     ) -> str:
         """List dbt resources. An AI agent should use this tool when it needs to discover available models, tests, sources, and other resources within a dbt project. This helps the agent understand the project structure, identify dependencies, and select specific resources for other operations like running or testing.
@@ -172,11 +196,23 @@ def register_tools(mcp: FastMCP) -> None:
             When output_format is 'json' (default):
               - With verbose=False (default): returns a simplified JSON with only name, resource_type, and depends_on.nodes
               - With verbose=True: returns a full JSON with all resource details
+              - With fields: returns only those fields of each resource
+              - With encoding='columnar': returns {"columns": [...], "rows": [[...], ...]} instead of a list of objects
             When output_format is 'name', 'path', or 'selector', returns plain text with the respective format.
+            With page_size or cursor, returns a JSON object with the page's `items` (resources, or lines
+            for the text formats), the `total` number of items and the `next_cursor` (null on the last page).
+            Following pages are served from the first page's result set without running dbt again.
         """
         # Log diagnostic information
         logger.info(f"Starting dbt_ls with project_dir={project_dir}, output_format={output_format}")
 
+        if encoding not in LS_ENCODINGS:
+            return f"Invalid encoding '{encoding}', expected one of: {', '.join(LS_ENCODINGS)}"
+
+        conflict = conflicting_fields(fields or [])
+        if conflict:
+            return f"Invalid fields '{conflict[0]}' and '{conflict[1]}': a field can't be requested with a field nested in it"
+
         command = ["ls"]
 
         if models:
@@ -195,12 +231,29 @@ def register_tools(mcp: FastMCP) -> None:
 
         command.extend(["--quiet"])
 
+        if page_size is not None or cursor:
+            result = await list_page(
+                command,
+                project_dir,
+                profiles_dir,
+                execute_dbt_command,
+                partial(ls_items, output_format=output_format, verbose=verbose, fields=fields),
+                view=(verbose, tuple(fields or ())),
+                page_size=page_size,
+                cursor=cursor
+            )
+            formatter = partial(ls_page_formatter, output_format=output_format, verbose=verbose, fields=fields,
+                                encoding=encoding)
+            return await process_command_result(result, command_name="ls", output_formatter=formatter,
+                                                include_debug_info=True)
+
         logger.info(f"Executing dbt command: dbt {' '.join(command)}")
         result = await execute_dbt_command(command, project_dir, profiles_dir)
         logger.info(f"dbt command result: success={result['success']}, returncode={result.get('returncode')}")
 
         # Use the centralized result processor with ls_formatter
-        formatter = partial(ls_formatter, output_format=output_format, verbose=verbose)
+        formatter = partial(ls_formatter, output_format=output_format, verbose=verbose, fields=fields,
+                            encoding=encoding)
 
         return await process_command_result(
             result,
@@ -330,7 +383,9 @@ def register_tools(mcp: FastMCP) -> None:
         """Load CSV files as seed data. An AI agent should use this tool when it needs to load initial data from CSV files into the database. This is essential for creating reference tables, test datasets, or any static data that models will depend on.
 
         Returns:
-            Output from the dbt seed command as text (this command does not support JSON output format)
+            JSON summary of the seed from run_results.json (per-node status, execution time,
+            rows affected and failures, with full messages for failing nodes), or the
+            command's text output if no run results were written
         """
         command = ["seed"]
 
@@ -373,7 +428,7 @@ def register_tools(mcp: FastMCP) -> None:
         """Preview the results of a model. An AI agent should use this tool when it needs to preview data from a specific model without materializing it. This helps inspect transformation results, debug issues, or demonstrate how data looks after processing without modifying the target database.
 
         Returns:
-            Output from the dbt show command, defaulting to JSON format if not specified
+            The preview as JSON: {"node": ..., "columns": [...], "rows": [[...], ...]} ("node" is omitted for inline SQL and text tables)
         """
         # Use enhanced SQL detection
         is_inline_sql, sql_type = is_inline_sql_query(models)
@@ -416,17 +471,14 @@ def register_tools(mcp: FastMCP) -> None:
             result = await execute_dbt_command(command, project_dir, profiles_dir)
 
             logger.info(f"Command result: success={result['success']}, returncode={result.get('returncode')}")
-            if isinstance(result["output"], str):
-                logger.info(f"Output (first 100 chars): {result['output'][:100]}")
-            elif isinstance(result["output"], (dict, list)):
-                logger.info(f"Output structure: {json.dumps(result['output'])[:100]}")
+            logger.info("Output (first 100 chars): %s", Preview(result["output"]))
 
             # Check for specific error patterns in the output
             if not result["success"] or (
                 isinstance(result["output"], str) and
                 any(err in result["output"].lower() for err in ["error", "failed", "syntax", "exception"])
             ):
-                logger.warning(f"Error detected in output: {result['output'][:200]}")
+                logger.warning("Error detected in output: %s", Preview(result["output"], 200))
                 error_result = {
                     "success": False,
                     "output": f"Error executing inline SQL\n{result['output']}",
@@ -439,9 +491,20 @@ def register_tools(mcp: FastMCP) -> None:
                     include_debug_info=True
                 )
         else:
-            # For regular model references, check if the model exists first
-            check_command = ["ls", "-s", models]
-            check_result = await execute_dbt_command(check_command, project_dir, profiles_dir)
+            # For regular model references, check if the model exists first, using
+            # the manifest's name index when it is up to date
+            matches = await find_nodes_by_name(models, project_dir, profiles_dir)
+            if matches is not None:
+                logger.info(f"Model existence check from manifest: {models} -> {matches}")
+                check_result = {
+                    "success": True,
+                    "output": "" if matches else f"The selection criterion '{models}' does not match any enabled nodes",
+                    "error": None,
+                    "returncode": 0
+                }
+            else:
+                check_command = ["ls", "-s", models]
+                check_result = await execute_dbt_command(check_command, project_dir, profiles_dir)
 
             # If the model doesn't exist, return the error message
             if not check_result["success"] or "does not match any enabled nodes" in str(check_result["output"]):
@@ -503,7 +566,9 @@ def register_tools(mcp: FastMCP) -> None:
         """Run build command (seeds, tests, snapshots, and models). An AI agent should use this tool when it needs to execute a comprehensive build process that runs seeds, snapshots, models, and tests in the correct order. This is ideal for complete project deployment or ensuring all components work together.
 
         Returns:
-            Output from the dbt build command as text (this command does not support JSON output format)
+            JSON summary of the build from run_results.json (per-node status, execution time,
+            rows affected and failures, with full messages for failing nodes), or the
+            command's text output if no run results were written
         """
         command = ["build"]
 
@@ -527,6 +592,96 @@ def register_tools(mcp: FastMCP) -> None:
         # Use the centralized result processor
         return await process_command_result(result, command_name="build")
 
+    @mcp.tool()
+    async def dbt_lineage(
+        model: str = Field(
+            description="Resource to trace, by name (e.g. 'customers') or unique_id (e.g. 'model.my_project.customers')"
+        ),
+        project_dir: str = Field(
+            default=".",
+            description="ABSOLUTE PATH to the directory containing the dbt project (e.g. '/Users/username/projects/dbt_project' not '.')"
+        ),
+        profiles_dir: Optional[str] = Field(
+            default=None,
+            description="Directory containing the profiles.yml file (defaults to project_dir if not specified)"
+        ),
+        direction: str = Field(
+            default="both",
+            description="Which side of the resource to return: upstream, downstream or both"
+        ),
+        depth: Optional[int] = Field(
+            default=None,
+            description="Maximum number of edges away from the resource, at least 1 (unlimited if not specified)"
+        ),
+        resource_types: Optional[List[str]] = Field(
+            default=None,
+            description="Only return resources of these types (e.g. ['model', 'source']); other resources are still traversed"
+        ),
+        to: Optional[str] = Field(
+            default=None,
+            description="Another resource, by name or unique_id, to list the dependency paths between the two"
+        ),
+        max_paths: int = Field(
+            default=MAX_PATHS,
+            description="Maximum number of paths to list when 'to' is given, at least 1"
+        )
+    ) -> str:
+        """Trace the lineage of a dbt resource. An AI agent should use this tool when it needs to know what a model depends on or what depends on it, for example to assess the impact of a change or to find where a column's data comes from. It answers from the project's manifest without running a dbt command, so it is much faster than dbt_ls with '+model+' selectors.
+
+        Returns:
+            JSON with the resource, its upstream and/or downstream resources (unique_id, name,
+            resource_type and depth, the number of edges away from the resource) and, when 'to'
+            is given, the paths between the two resources from the upstream end to the downstream end
+        """
+        logger.info(f"dbt_lineage called with model={model}, direction={direction}, depth={depth}")
+
+        result = await get_lineage(
+            model,
+            project_dir,
+            profiles_dir,
+            direction=direction,
+            max_depth=depth,
+            resource_types=resource_types,
+            to=to,
+            max_paths=max_paths
+        )
+
+        return await process_command_result(result, command_name="lineage")
+
+    @mcp.tool()
+    async def dbt_search(
+        query: str = Field(
+            description="Words describing what you are looking for (e.g. 'customer lifetime value')"
+        ),
+        project_dir: str = Field(
+            default=".",
+            description="ABSOLUTE PATH to the directory containing the dbt project (e.g. '/Users/username/projects/dbt_project' not '.')"
+        ),
+        profiles_dir: Optional[str] = Field(
+            default=None,
+            description="Directory containing the profiles.yml file (defaults to project_dir if not specified)"
+        ),
+        resource_types: Optional[List[str]] = Field(
+            default=None,
+            description="Only return resources of these types (e.g. ['model', 'source']); tests are only returned when listed here"
+        ),
+        limit: int = Field(
+            default=SEARCH_LIMIT,
+            description="Maximum number of results"
+        )
+    ) -> str:
+        """Search the resources of a dbt project. An AI agent should use this tool when it doesn't know which model, source or seed holds some data, for example to find "the model that has customer lifetime value". It ranks resources by how well their names, tags, descriptions, column names, column descriptions and SQL match the query, using the project's manifest (and catalog.json when docs have been generated) without running a dbt command.
+
+        Returns:
+            JSON list of the best matches first, each with its unique_id, name, resource_type,
+            score, the fields the query matched, the matching columns and the start of its description
+        """
+        logger.info(f"dbt_search called with query={query}, resource_types={resource_types}, limit={limit}")
+
+        result = await search_project(query, project_dir, profiles_dir, resource_types=resource_types, limit=limit)
+
+        return await process_command_result(result, command_name="search")
+
     logger.info("Registered all dbt tools")
 
 
@@ -0,0 +1,356 @@
+"""
+Project file watcher for the DBT CLI MCP Server.
+
+The first dbt command after a model is edited pays for re-parsing the project.
+When enabled, this module watches the files of each project the server has run
+commands for (models/, macros/, seeds/, snapshots/ and the yml files at the
+project's root) and, once edits have settled for a short debounce period, runs
+`dbt parse` in the background. manifest.json and partial_parse.msgpack are then
+already fresh when the next tool call arrives.
+
+Changes are detected with inotify on Linux, and by periodically comparing file
+modification times elsewhere.
+"""
+
+import os
+import sys
+import time
+import ctypes
+import ctypes.util
+import struct
+import asyncio
+import logging
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.config import get_config
+from src.artifacts import file_signature
+from src.environment import get_environment
+from src.project import get_target_path
+
+# Logger for this module
+logger = logging.getLogger(__name__)
+
+# Directories of a project whose files are watched (recursively)
+WATCHED_DIRECTORIES = ("models", "macros", "seeds", "snapshots")
+
+# Suffixes of the files dbt parses; other files (editor swap files, ...) are ignored
+WATCHED_SUFFIXES = (".sql", ".py", ".yml", ".yaml", ".csv", ".md")
+
+# Suffixes of the files watched at the project's root
+ROOT_SUFFIXES = (".yml", ".yaml")
+
+# inotify constants, from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+)
+EVENT_HEADER = struct.Struct("iIII")
+
+# Runs a dbt command, like execute_dbt_command
+CommandRunner = Callable[[List[str], str, Optional[str]], Awaitable[Dict[str, Any]]]
+
+
+def is_watched_file(name: str, at_root: bool) -> bool:
+    """Check whether a change to a file should trigger a re-parse."""
+    return name.endswith(ROOT_SUFFIXES if at_root else WATCHED_SUFFIXES)
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    """Load the C library if it provides inotify."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1, libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class InotifyMonitor:
+    """
+    Reports changes to a project's files through inotify, from the event loop.
+    """
+
+    def __init__(self, root: Path, on_change: Callable[[], None], libc: ctypes.CDLL):
+        """
+        Args:
+            root: The project directory
+            on_change: Called whenever a watched file changes
+            libc: The C library
+
+        Raises:
+            OSError: If inotify can't be initialized
+        """
+        self.root = root
+        self.on_change = on_change
+        self.libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self.directories: Dict[int, Path] = {}
+
+        self._add_watch(root)
+        for name in WATCHED_DIRECTORIES:
+            self._add_tree(root / name)
+        asyncio.get_running_loop().add_reader(self.fd, self._read)
+
+    def _add_watch(self, directory: Path) -> None:
+        """Watch a directory."""
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            logger.debug(f"Can't watch {directory}: {os.strerror(ctypes.get_errno())}")
+            return
+        self.directories[wd] = directory
+
+    def _add_tree(self, directory: Path) -> None:
+        """Watch a directory and its subdirectories."""
+        if not directory.is_dir():
+            return
+        self._add_watch(directory)
+        for path, subdirectories, _ in os.walk(directory):
+            for name in subdirectories:
+                self._add_watch(Path(path) / name)
+
+    def _read(self) -> None:
+        """Handle the pending events."""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return
+
+        changed = False
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            name = os.fsdecode(data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b"\0"))
+            offset += EVENT_HEADER.size + length
+
+            if mask & IN_Q_OVERFLOW:
+                changed = True
+                continue
+            directory = self.directories.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                del self.directories[wd]
+                continue
+
+            at_root = directory == self.root
+            if mask & IN_ISDIR:
+                if at_root and name not in WATCHED_DIRECTORIES:
+                    continue
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._add_tree(directory / name)
+                changed = changed or bool(mask & (IN_CREATE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE))
+            elif name and is_watched_file(name, at_root):
+                changed = True
+
+        if changed:
+            self.on_change()
+
+    def close(self) -> None:
+        """Stop watching."""
+        try:
+            asyncio.get_running_loop().remove_reader(self.fd)
+        except RuntimeError:
+            pass
+        os.close(self.fd)
+
+
+class PollingMonitor:
+    """
+    Reports changes to a project's files by comparing their modification times periodically.
+    """
+
+    def __init__(self, root: Path, on_change: Callable[[], None], interval: float):
+        """
+        Args:
+            root: The project directory
+            on_change: Called whenever a watched file changes
+            interval: Seconds between scans
+        """
+        self.root = root
+        self.on_change = on_change
+        self.interval = interval
+        self.snapshot = self.scan()
+        self.task = asyncio.get_running_loop().create_task(self._poll())
+
+    def scan(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Get the modification time and size of every watched file.
+
+        Returns:
+            Dictionary mapping paths to (mtime_ns, size)
+        """
+        files = {}
+        try:
+            with os.scandir(self.root) as entries:
+                for entry in entries:
+                    if entry.is_file() and is_watched_file(entry.name, at_root=True):
+                        signature = file_signature(Path(entry.path))
+                        if signature is not None:
+                            files[entry.path] = signature[:2]
+        except OSError:
+            return files
+
+        for name in WATCHED_DIRECTORIES:
+            for path, _, names in os.walk(self.root / name):
+                for file_name in names:
+                    if is_watched_file(file_name, at_root=False):
+                        signature = file_signature(Path(path) / file_name)
+                        if signature is not None:
+                            files[os.path.join(path, file_name)] = signature[:2]
+        return files
+
+    async def _poll(self) -> None:
+        """Scan the project until cancelled."""
+        while True:
+            await asyncio.sleep(self.interval)
+            snapshot = await asyncio.to_thread(self.scan)
+            if snapshot != self.snapshot:
+                self.snapshot = snapshot
+                self.on_change()
+
+    def close(self) -> None:
+        """Stop watching."""
+        self.task.cancel()
+
+
+class ProjectWatcher:
+    """
+    Re-parses a project in the background after its files change.
+    """
+
+    def __init__(self, project_dir: str, profiles_dir: Optional[str], run: CommandRunner):
+        """
+        Must be created from the event loop.
+
+        Args:
+            project_dir: Directory containing the dbt project
+            profiles_dir: Directory containing the profiles.yml file
+            run: Function running a dbt command, like execute_dbt_command
+        """
+        self.project_dir = str(Path(project_dir).resolve())
+        self.profiles_dir = profiles_dir
+        self.run = run
+        self.debounce = get_config("watch_debounce", 1.0)
+        # time.time_ns() of the last change not yet covered by a parse
+        self.changed_at: Optional[int] = None
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.task: Optional[asyncio.Task] = None
+        self.parses = 0
+
+        libc = _load_libc()
+        self.monitor: Any = None
+        if libc is not None:
+            try:
+                self.monitor = InotifyMonitor(Path(self.project_dir), self.on_change, libc)
+            except OSError as e:
+                logger.warning(f"inotify unavailable for {self.project_dir}, polling instead: {e}")
+        if self.monitor is None:
+            self.monitor = PollingMonitor(Path(self.project_dir), self.on_change, get_config("watch_poll_interval", 2.0))
+        logger.info(f"Watching {self.project_dir} with {type(self.monitor).__name__}")
+
+    def on_change(self) -> None:
+        """Record a change and (re)start the debounce timer."""
+        self.changed_at = time.time_ns()
+        if self.timer is not None:
+            self.timer.cancel()
+        self.timer = asyncio.get_running_loop().call_later(self.debounce, self._settled)
+
+    def _settled(self) -> None:
+        """Start a parse once changes have settled, unless one is already running."""
+        self.timer = None
+        if self.task is None or self.task.done():
+            self.task = asyncio.get_running_loop().create_task(self._prewarm())
+
+    def _is_parsed(self, changed_at: int) -> bool:
+        """Check whether the manifest was written after a change, e.g. by another command."""
+        env_vars = get_environment(self.project_dir, self.profiles_dir)
+        signature = file_signature(get_target_path(self.project_dir, env_vars) / "manifest.json")
+        return signature is not None and signature[0] >= changed_at
+
+    async def _prewarm(self) -> None:
+        """Parse the project until no change is left uncovered."""
+        while self.changed_at is not None:
+            changed_at = self.changed_at
+            self.changed_at = None
+            if await asyncio.to_thread(self._is_parsed, changed_at):
+                continue
+
+            logger.info(f"Project files changed, parsing {self.project_dir} in the background")
+            try:
+                result = await self.run(["parse"], self.project_dir, self.profiles_dir)
+            except Exception as e:
+                logger.warning(f"Background parse of {self.project_dir} failed: {e}")
+                continue
+            self.parses += 1
+            if not result.get("success"):
+                logger.warning(f"Background parse of {self.project_dir} failed: {result.get('error')}")
+            # Changes made while dbt was reading the files may not be in the manifest
+            if self.changed_at is not None and self.timer is not None:
+                return
+
+    def close(self) -> None:
+        """Stop watching and cancel a pending or running parse."""
+        if self.timer is not None:
+            self.timer.cancel()
+        if self.task is not None:
+            self.task.cancel()
+        self.monitor.close()
+
+
+class WatcherRegistry:
+    """
+    One watcher per project the server has run commands for.
+    """
+
+    def __init__(self):
+        self._watchers: Dict[str, ProjectWatcher] = {}
+
+    def register(self, project_dir: str, profiles_dir: Optional[str], run: CommandRunner) -> Optional[ProjectWatcher]:
+        """
+        Start watching a project, unless watching is disabled or it is already watched.
+
+        Must be called from the event loop.
+
+        Args:
+            project_dir: Directory containing the dbt project
+            profiles_dir: Directory containing the profiles.yml file
+            run: Function running a dbt command, like execute_dbt_command
+
+        Returns:
+            The project's watcher, or None if watching is disabled
+        """
+        if not get_config("watch_projects", False):
+            return None
+        key = str(Path(project_dir).resolve())
+        watcher = self._watchers.get(key)
+        if watcher is None and (Path(key) / "dbt_project.yml").is_file():
+            watcher = self._watchers[key] = ProjectWatcher(key, profiles_dir, run)
+        return watcher
+
+    def close(self) -> None:
+        """Stop every watcher."""
+        for watcher in self._watchers.values():
+            watcher.close()
+        self._watchers.clear()
+
+
+# Watchers shared by all tool calls
+watchers = WatcherRegistry()
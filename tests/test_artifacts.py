@@ -0,0 +1,120 @@
+"""
+Tests for the artifacts module.
+"""
+
+import os
+import json
+import time
+import pytest
+
+from src.artifacts import file_signature, read_run_results, summarize_run_results
+from src.command import process_command_result
+
+RUN_RESULTS = {
+    "metadata": {"invocation_id": "abc-123"},
+    "elapsed_time": 2.34567,
+    "results": [
+        {
+            "unique_id": "model.example.customers",
+            "status": "success",
+            "execution_time": 1.23456,
+            "message": "SELECT 42",
+            "failures": None,
+            "adapter_response": {"rows_affected": 42},
+        },
+        {
+            "unique_id": "model.example.orders",
+            "status": "error",
+            "execution_time": 0.5,
+            "message": "Database Error in model orders\n  column \"amount\" does not exist",
+            "failures": None,
+            "adapter_response": {},
+            "relation_name": "\"db\".\"main\".\"orders\"",
+        },
+        {
+            "unique_id": "test.example.not_null_orders_id",
+            "status": "fail",
+            "execution_time": 0.1,
+            "message": "Got 3 results, configured to fail if != 0",
+            "failures": 3,
+            "adapter_response": {},
+        },
+    ],
+}
+
+
+def write_run_results(target, mtime_ns=None):
+    """Write run_results.json, optionally with a given modification time."""
+    path = target / "run_results.json"
+    path.write_text(json.dumps(RUN_RESULTS))
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path
+
+
+def test_summarize_run_results():
+    """Test that the summary is compact and only keeps messages of failing nodes."""
+    summary = summarize_run_results(RUN_RESULTS)
+
+    assert summary["invocation_id"] == "abc-123"
+    assert summary["elapsed_time"] == 2.346
+    assert summary["counts"] == {"success": 1, "error": 1, "fail": 1}
+    assert summary["nodes"] == [
+        {"unique_id": "model.example.customers", "status": "success", "execution_time": 1.235, "rows_affected": 42},
+        {"unique_id": "model.example.orders", "status": "error", "execution_time": 0.5},
+        {"unique_id": "test.example.not_null_orders_id", "status": "fail", "execution_time": 0.1, "failures": 3},
+    ]
+    assert [node["unique_id"] for node in summary["failed"]] == [
+        "model.example.orders", "test.example.not_null_orders_id"
+    ]
+    assert "does not exist" in summary["failed"][0]["message"]
+    assert "SELECT 42" not in json.dumps(summary)
+
+
+def test_read_run_results_written_by_invocation(tmp_path):
+    """Test that run results written after the invocation started are read."""
+    started = time.time_ns()
+    write_run_results(tmp_path, mtime_ns=started + 1_000_000)
+
+    assert read_run_results(tmp_path, started) == RUN_RESULTS
+
+
+def test_read_run_results_skips_stale_file(tmp_path):
+    """Test that run results left over from an earlier invocation are ignored."""
+    path = write_run_results(tmp_path, mtime_ns=time.time_ns() - 60_000_000_000)
+    previous = file_signature(path)
+
+    assert read_run_results(tmp_path, time.time_ns(), previous) is None
+    assert read_run_results(tmp_path / "missing", time.time_ns()) is None
+
+
+def test_read_run_results_coarse_timestamps(tmp_path):
+    """Test that a rewritten file is read even if its timestamp predates the invocation."""
+    old_mtime = time.time_ns() - 60_000_000_000
+    path = tmp_path / "run_results.json"
+    path.write_text("{}")
+    os.utime(path, ns=(old_mtime, old_mtime))
+    previous = file_signature(path)
+
+    # Rewritten with a timestamp rounded down past the invocation start
+    write_run_results(tmp_path, mtime_ns=old_mtime)
+
+    assert read_run_results(tmp_path, time.time_ns(), previous) == RUN_RESULTS
+
+
+@pytest.mark.asyncio
+async def test_process_command_result_returns_run_results_summary():
+    """Test that the run results summary is returned instead of the text output."""
+    result = {
+        "success": False,
+        "output": "Completed with 1 error and 1 failure",
+        "error": "",
+        "returncode": 1,
+        "run_results": summarize_run_results(RUN_RESULTS),
+    }
+
+    formatted = json.loads(await process_command_result(result, command_name="build"))
+
+    assert formatted["success"] is False
+    assert formatted["counts"] == {"success": 1, "error": 1, "fail": 1}
+    assert len(formatted["failed"]) == 2
@@ -0,0 +1,126 @@
+"""
+Tests for the coalesce module.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import patch
+
+from src.config import config
+from src.coalesce import SingleFlight
+from src.command import execute_dbt_command
+from tests.test_command import make_process_mock
+
+
+def make_call(calls, release, result=None):
+    """Create a call that records its invocations and waits for release."""
+    async def call():
+        calls.append(1)
+        await release.wait()
+        return result or {"success": True, "output": "ok"}
+    return call
+
+
+@pytest.mark.asyncio
+async def test_identical_calls_share_one_run():
+    """Test that identical concurrent calls run once and share the result."""
+    flight = SingleFlight()
+    calls, release = [], asyncio.Event()
+    call = make_call(calls, release)
+
+    tasks = [asyncio.create_task(flight.run("key", call)) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert flight.in_flight == 1
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert len(calls) == 1
+    assert [shared for _, shared in results] == [False, True, True]
+    assert all(result == {"success": True, "output": "ok"} for result, _ in results)
+    assert flight.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_run():
+    """Test that a run continues while other callers still wait for it."""
+    flight = SingleFlight()
+    calls, release = [], asyncio.Event()
+    call = make_call(calls, release)
+
+    first = asyncio.create_task(flight.run("key", call))
+    second = asyncio.create_task(flight.run("key", call))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    result, shared = await second
+    assert result["success"] is True
+    assert shared is True
+    assert first.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_run_cancelled_when_all_callers_cancelled():
+    """Test that the run is cancelled once nobody waits for it."""
+    flight = SingleFlight()
+    calls, release = [], asyncio.Event()
+
+    caller = asyncio.create_task(flight.run("key", make_call(calls, release)))
+    await asyncio.sleep(0)
+    shared_task = flight._inflight["key"].task
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+    await asyncio.sleep(0)
+
+    assert shared_task.cancelled()
+    assert flight.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_remembered_result_reused_within_window():
+    """Test that successful results are reused until their window expires."""
+    flight = SingleFlight()
+    calls, release = [], asyncio.Event()
+    release.set()
+    call = make_call(calls, release)
+
+    flight.remember("key", {"success": True, "output": "cached"}, window=60)
+    flight.remember("failed", {"success": False, "output": "error"}, window=60)
+    flight.remember("expired", {"success": True, "output": "old"}, window=-1)
+
+    assert await flight.run("key", call) == ({"success": True, "output": "cached"}, True)
+    assert (await flight.run("failed", call))[1] is False
+    assert (await flight.run("expired", call))[1] is False
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+@patch("asyncio.create_subprocess_exec")
+async def test_execute_dbt_command_coalesces_read_only_commands(mock_subprocess, tmp_path):
+    """Test that identical concurrent ls calls start a single dbt process."""
+    release = asyncio.Event()
+
+    async def create_process(*args, **kwargs):
+        await release.wait()
+        return make_process_mock(b'model_a\nmodel_b\n', b'', 0)
+
+    mock_subprocess.side_effect = create_process
+
+    with patch.dict(config, {"isolate_read_only_commands": False, "coalesce_window": 0}):
+        tasks = [
+            asyncio.create_task(execute_dbt_command(["ls", "--output", "name"], str(tmp_path)))
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0.05)
+        release.set()
+        first, second = await asyncio.gather(*tasks)
+
+        assert mock_subprocess.call_count == 1
+        assert first["output"] == second["output"] == "model_a\nmodel_b\n"
+        assert (first["coalesced"], second["coalesced"]) == (False, True)
+
+        # Commands with side effects are never coalesced
+        await asyncio.gather(*(execute_dbt_command(["seed"], str(tmp_path)) for _ in range(2)))
+        assert mock_subprocess.call_count == 3
@@ -3,14 +3,21 @@ Tests for the command module.
 """
 
 import os
+import sys
 import json
+import asyncio
 import pytest
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
+from src.config import DEFAULT_CONFIG, config
+from src.output import BoundedBuffer, OutputCapture
+from src.process import TIMEOUT_RETURNCODE
 from src.command import (
     load_environment,
     execute_dbt_command,
+    get_command_timeout,
+    run_subprocess,
     parse_dbt_list_output,
     process_command_result
 )
@@ -70,20 +77,29 @@ async def test_execute_dbt_command_mock_mode():
     assert result["output"] == {"test": "data"}
 
 
+def make_process_mock(stdout: bytes, stderr: bytes, returncode: int) -> MagicMock:
+    """Create a mock process whose pipes yield the given output."""
+    process_mock = MagicMock()
+    process_mock.returncode = returncode
+    process_mock.stdout = asyncio.StreamReader()
+    process_mock.stdout.feed_data(stdout)
+    process_mock.stdout.feed_eof()
+    process_mock.stderr = asyncio.StreamReader()
+    process_mock.stderr.feed_data(stderr)
+    process_mock.stderr.feed_eof()
+
+    async def mock_wait():
+        return returncode
+    process_mock.wait = mock_wait
+    return process_mock
+
+
 @pytest.mark.asyncio
 @patch("asyncio.create_subprocess_exec")
 async def test_execute_dbt_command_real_mode(mock_subprocess):
     """Test executing dbt command in real mode."""
     # Mock subprocess
-    process_mock = MagicMock()
-    process_mock.returncode = 0
-    
-    # Create a coroutine for communicate
-    async def mock_communicate():
-        return ('{"test": "data"}', '')
-    process_mock.communicate = mock_communicate
-    
-    mock_subprocess.return_value = process_mock
+    mock_subprocess.return_value = make_process_mock(b'{"test": "data"}', b'', 0)
     
     result = await execute_dbt_command(["run"])
     
@@ -93,12 +109,7 @@ async def test_execute_dbt_command_real_mode(mock_subprocess):
     assert result["returncode"] == 0
     
     # Test with error
-    process_mock.returncode = 1
-    
-    # Create a coroutine for communicate with error
-    async def mock_communicate_error():
-        return ('', 'Error message')
-    process_mock.communicate = mock_communicate_error
+    mock_subprocess.return_value = make_process_mock(b'', b'Error message', 1)
     
     result = await execute_dbt_command(["run"])
     
@@ -107,6 +118,86 @@ async def test_execute_dbt_command_real_mode(mock_subprocess):
     assert result["returncode"] == 1
 
 
+@pytest.mark.asyncio
+@patch("asyncio.create_subprocess_exec")
+async def test_execute_dbt_command_bounded_output(mock_subprocess):
+    """Test that very large outputs are truncated to max_output_bytes."""
+    lines = b"".join(f"line {i}\n".encode() for i in range(10000))
+    mock_subprocess.return_value = make_process_mock(lines, b'', 0)
+    
+    with patch.dict(config, {"max_output_bytes": 1000}):
+        result = await execute_dbt_command(["build"])
+    
+    assert result["success"] is True
+    assert result["output"].startswith("line 0\n")
+    assert result["output"].endswith("line 9999\n")
+    assert "bytes truncated" in result["output"]
+    assert len(result["output"]) < 1100
+
+
+def is_running(pid: int) -> bool:
+    """Check whether a process exists and is not a zombie waiting to be reaped."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    status = Path(f"/proc/{pid}/status")
+    return not (status.exists() and "\nState:\tZ" in status.read_text())
+
+
+@pytest.mark.asyncio
+async def test_run_subprocess_timeout_kills_process_group(tmp_path):
+    """Test that a timed out command's process group is killed and partial output kept."""
+    script = (
+        "import subprocess, sys, time\n"
+        "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+        "print(child.pid, flush=True)\n"
+        "print('partial output', flush=True)\n"
+        "time.sleep(60)\n"
+    )
+    capture = OutputCapture()
+    
+    with patch.dict(config, {"kill_grace_period": 1}):
+        returncode = await run_subprocess([sys.executable, "-c", script], str(tmp_path), dict(os.environ), capture, timeout=1)
+    
+    assert returncode == TIMEOUT_RETURNCODE
+    child_pid, partial = capture.stdout.getvalue().splitlines()
+    assert partial == "partial output"
+    assert "timed out after 1 seconds" in capture.stderr.getvalue()
+    
+    # The grandchild was in the same process group and was killed too
+    await asyncio.sleep(0.2)
+    assert not is_running(int(child_pid))
+
+
+@pytest.mark.asyncio
+async def test_run_subprocess_cancellation(tmp_path):
+    """Test that cancelling a command terminates its process."""
+    capture = OutputCapture()
+    script = "import os, time; print(os.getpid(), flush=True); time.sleep(60)"
+    task = asyncio.create_task(run_subprocess([sys.executable, "-c", script], str(tmp_path), dict(os.environ), capture))
+    
+    while not capture.stdout.getvalue():
+        await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    
+    assert not is_running(int(capture.stdout.getvalue()))
+
+
+def test_get_command_timeout():
+    """Test per-command timeout overrides."""
+    with patch.dict(config, {"command_timeout": 100, "command_timeouts": {"ls": 5}}):
+        assert get_command_timeout(["ls", "--quiet"]) == 5
+        assert get_command_timeout(["run"]) == 100
+
+    # By default only the read-only commands have a time limit
+    with patch.dict(config, {key: DEFAULT_CONFIG[key] for key in ("command_timeout", "command_timeouts")}):
+        assert get_command_timeout(["build"]) == 0
+        assert get_command_timeout(["ls"]) == 300
+
+
 def test_parse_dbt_list_output():
     """Test parsing dbt list output."""
     # Test with dictionary containing nodes
@@ -145,6 +236,48 @@ def test_parse_dbt_list_output():
     assert {"name": "model2"} in result
 
 
+def test_parse_dbt_list_output_formats():
+    """Test parsing the line formats printed by dbt Core and the dbt Cloud CLI."""
+    customers = {"name": "customers", "resource_type": "model"}
+    orders = {"name": "orders", "resource_type": "model"}
+    
+    # dbt Core's newline-delimited JSON
+    ndjson = json.dumps(customers) + "\n" + json.dumps(orders) + "\n"
+    assert parse_dbt_list_output(ndjson) == [customers, orders]
+    assert parse_dbt_list_output(json.dumps(customers)) == [customers]
+    
+    # Timestamped lines mixed with log messages and names
+    text = f"00:59:06 Running with dbt=1.7.0\n00:59:07 {json.dumps(customers)}\n{json.dumps({'id': 1})}\norders\n"
+    assert parse_dbt_list_output(text) == [
+        {"name": "00:59:06 Running with dbt=1.7.0"}, customers, {"name": json.dumps({"id": 1})}, {"name": "orders"}
+    ]
+    
+    # dbt Cloud CLI log objects, with resources embedded in their names
+    cloud = [
+        {"name": "Sending project to dbt Cloud"},
+        {"name": json.dumps(customers)},
+        {"name": "00:59:06 " + json.dumps(orders)},
+        {"name": "unrelated message"},
+        {"name": "Invocation has finished"},
+    ]
+    assert parse_dbt_list_output(cloud) == [customers, orders]
+    assert parse_dbt_list_output(cloud[:1]) == []
+    
+    # Resources already parsed from events are returned as is
+    assert parse_dbt_list_output([customers, orders]) == [customers, orders]
+
+
+def test_parse_dbt_list_output_truncated():
+    """Test that the marker of truncated output isn't parsed as a resource."""
+    buffer = BoundedBuffer(max_bytes=120)
+    for i in range(10):
+        buffer.append(json.dumps({"name": f"m{i}", "resource_type": "model"}) + "\n")
+    assert buffer.truncated
+    
+    resources = parse_dbt_list_output(buffer.getvalue())
+    assert resources and all(resource["resource_type"] == "model" for resource in resources)
+
+
 # Test for load_mock_response removed as it's not part of the command module
 
 
@@ -212,4 +345,25 @@ async def test_process_command_result_error():
     assert "Error executing dbt test: Error message" in output
     assert "Output: Command output with error details" in output
     assert "Command details:" in output
-    assert "Return code: 1" in output
\ No newline at end of file
+    assert "Return code: 1" in output
+
+
+@pytest.mark.asyncio
+@patch("asyncio.create_subprocess_exec")
+async def test_execute_dbt_command_json_log_format(mock_subprocess):
+    """Test that dbt's JSON events are parsed into the payload and node progress."""
+    lines = [
+        {"info": {"name": "MainReportVersion", "level": "info", "msg": "Running with dbt=1.7.0"}, "data": {}},
+        {"info": {"name": "ListCmdOut", "level": "info", "msg": '{"name": "customers", "resource_type": "model"}'},
+         "data": {"msg": '{"name": "customers", "resource_type": "model"}'}},
+    ]
+    stdout = "".join(json.dumps(line) + "\n" for line in lines).encode()
+    mock_subprocess.return_value = make_process_mock(stdout, b'', 0)
+    
+    with patch.dict(config, {"dbt_log_format": "json", "isolate_read_only_commands": False, "coalesce_commands": False}):
+        result = await execute_dbt_command(["ls", "--output", "json"])
+    
+    assert mock_subprocess.call_args[0][-2:] == ("--log-format", "json")
+    assert result["success"] is True
+    assert result["output"] == [{"name": "customers", "resource_type": "model"}]
+    assert result["progress"] == {"counts": {}, "nodes": [], "errors": []}
@@ -88,6 +88,25 @@ def test_load_from_env(reset_config, mock_env):
     assert config["mock_mode"] is False
 
 
+def test_load_typed_values_from_env(reset_config, mock_env):
+    """Test that environment values are converted to the type of their default."""
+    os.environ["MAX_CONCURRENT_COMMANDS"] = "8"
+    os.environ["ISOLATE_READ_ONLY_COMMANDS"] = "false"
+    os.environ["COMMAND_TIMEOUTS"] = "run=7200, ls=30"
+    
+    try:
+        load_from_env()
+    finally:
+        for var in ["MAX_CONCURRENT_COMMANDS", "ISOLATE_READ_ONLY_COMMANDS", "COMMAND_TIMEOUTS"]:
+            del os.environ[var]
+    
+    assert config["max_concurrent_commands"] == 8
+    assert config["isolate_read_only_commands"] is False
+    assert config["command_timeouts"]["run"] == 7200.0
+    assert config["command_timeouts"]["ls"] == 30.0
+    assert config["command_timeouts"]["show"] == DEFAULT_CONFIG["command_timeouts"]["show"]
+
+
 def test_get_config(reset_config):
     """Test getting configuration values."""
     # Set a test value
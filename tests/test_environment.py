@@ -0,0 +1,76 @@
+"""
+Tests for the environment module.
+"""
+
+import os
+import pytest
+from unittest.mock import patch
+
+from src.environment import get_environment, clear_environment_cache
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    """Clear cached snapshots around each test."""
+    clear_environment_cache()
+    yield
+    clear_environment_cache()
+
+
+@pytest.fixture
+def project_with_env(tmp_path):
+    """Create a project with a .env file."""
+    (tmp_path / ".env").write_text("PROJECT_VAR=one\nDBT_PROFILES_DIR=/from/env/file\n")
+    return tmp_path
+
+
+def test_snapshot_is_cached_and_read_only(project_with_env):
+    """Test that snapshots are reused and can't be modified."""
+    with patch.dict(os.environ, clear=False):
+        os.environ.pop("DBT_PROFILES_DIR", None)
+        env = get_environment(str(project_with_env))
+
+        assert env["PROJECT_VAR"] == "one"
+        assert env["DBT_PROFILES_DIR"] == "/from/env/file"
+        assert get_environment(str(project_with_env)) is env
+        with pytest.raises(TypeError):
+            env["PROJECT_VAR"] = "two"
+
+        # The global environment is left untouched
+        assert "PROJECT_VAR" not in os.environ
+        assert "DBT_PROFILES_DIR" not in os.environ
+
+
+def test_snapshot_invalidated_when_env_file_changes(project_with_env):
+    """Test that editing the .env file rebuilds the snapshot."""
+    env = get_environment(str(project_with_env))
+    (project_with_env / ".env").write_text("PROJECT_VAR=updated_value\n")
+
+    updated = get_environment(str(project_with_env))
+    assert updated is not env
+    assert updated["PROJECT_VAR"] == "updated_value"
+
+
+def test_projects_do_not_leak_into_each_other(tmp_path):
+    """Test that each project gets its own profiles directory and variables."""
+    project_a = tmp_path / "a"
+    project_b = tmp_path / "b"
+    project_a.mkdir()
+    project_b.mkdir()
+    (project_a / ".env").write_text("ONLY_IN_A=1\n")
+
+    with patch.dict(os.environ, clear=False):
+        os.environ.pop("DBT_PROFILES_DIR", None)
+        env_a = get_environment(str(project_a))
+        env_b = get_environment(str(project_b), profiles_dir=str(tmp_path))
+
+    assert env_a["DBT_PROFILES_DIR"] == str(project_a.resolve())
+    assert env_b["DBT_PROFILES_DIR"] == str(tmp_path.resolve())
+    assert "ONLY_IN_A" not in env_b
+
+
+def test_server_environment_takes_precedence(project_with_env):
+    """Test that variables set for the server win over the .env file."""
+    with patch.dict(os.environ, {"PROJECT_VAR": "from_server"}):
+        env = get_environment(str(project_with_env))
+    assert env["PROJECT_VAR"] == "from_server"
@@ -0,0 +1,106 @@
+"""
+Tests for the events module.
+"""
+
+import json
+
+from src.events import EventParser
+from src.output import OutputCapture
+
+
+def event(name, message="", level="info", **data):
+    """Build a dbt JSON log line."""
+    return json.dumps({"info": {"name": name, "level": level, "msg": message}, "data": data}) + "\n"
+
+
+def node_info(unique_id, status, **extra):
+    """Build the node_info of an event."""
+    return {"unique_id": unique_id, "resource_type": "model", "node_status": status, **extra}
+
+
+def test_node_progress():
+    """Test that node progress is built from start and finish events."""
+    parser = EventParser()
+    parser.feed_line("stdout", event(
+        "NodeStart", "Began running node model.example.customers",
+        node_info=node_info("model.example.customers", "started", node_started_at="2024-01-01T00:00:00")
+    ))
+    assert parser.progress()["nodes"] == [{
+        "unique_id": "model.example.customers",
+        "resource_type": "model",
+        "status": "started",
+        "started_at": "2024-01-01T00:00:00",
+    }]
+
+    parser.feed_line("stdout", event(
+        "NodeFinished", "Finished running node model.example.customers",
+        node_info=node_info("model.example.customers", "success", node_finished_at="2024-01-01T00:00:02"),
+        run_result={"status": "success", "execution_time": 1.23456, "message": "OK"}
+    ))
+    parser.feed_line("stdout", event(
+        "NodeFinished", "Finished running node model.example.orders",
+        node_info=node_info("model.example.orders", "error"),
+        run_result={"status": "error", "execution_time": 0.5, "message": "Database Error"}
+    ))
+    parser.feed_line("stdout", event("RunResultError", "Database Error in model orders", level="error"))
+
+    progress = parser.progress()
+    assert progress["counts"] == {"success": 1, "error": 1}
+    customers, orders = progress["nodes"]
+    assert customers["finished_at"] == "2024-01-01T00:00:02"
+    assert customers["execution_time"] == 1.235
+    assert "message" not in customers
+    assert orders["message"] == "Database Error"
+    assert progress["errors"] == ["Database Error in model orders"]
+
+
+def test_list_payload():
+    """Test that resources printed by ls are collected as they arrive."""
+    parser = EventParser()
+    for name in ("customers", "orders"):
+        resource = json.dumps({"name": name, "resource_type": "model"})
+        parser.feed_line("stdout", event("ListCmdOut", resource, msg=resource))
+
+    assert parser.has_payload
+    assert parser.payload() == [
+        {"name": "customers", "resource_type": "model"},
+        {"name": "orders", "resource_type": "model"},
+    ]
+
+    names = EventParser()
+    names.feed_line("stdout", event("ListCmdOut", "customers", msg="customers"))
+    names.feed_line("stdout", event("ListCmdOut", "orders", msg="orders"))
+    assert names.payload() == "customers\norders"
+
+
+def test_show_payload():
+    """Test that the preview printed by show is decoded from its event."""
+    parser = EventParser()
+    parser.feed_line("stdout", event(
+        "ShowNode", "Previewing node 'customers'",
+        node_name="customers", preview='[{"id": 1}]', output_format="json", is_inline=False
+    ))
+
+    assert parser.payload() == {"node": "customers", "show": [{"id": 1}]}
+
+
+def test_payload_budget():
+    """Test that a payload exceeding the budget is dropped."""
+    parser = EventParser(max_payload_bytes=200)
+    for i in range(10):
+        parser.feed_line("stdout", event("ListCmdOut", f"model_{i}", msg=f"model_{i}"))
+
+    assert parser.payload_truncated
+    assert not parser.has_payload
+
+
+def test_capture_stores_messages():
+    """Test that event lines are stored as their messages and other lines untouched."""
+    parser = EventParser()
+    capture = OutputCapture()
+    capture.add_line_handler(parser.feed_line)
+
+    capture.feed_text("stdout", event("MainReportVersion", "Running with dbt=1.7.0") + "plain text\n", final=True)
+
+    assert capture.stdout.getvalue() == "Running with dbt=1.7.0\nplain text\n"
+    assert parser.event_count == 1
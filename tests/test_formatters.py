@@ -6,7 +6,7 @@ import json
 import pytest
 from unittest.mock import patch, MagicMock
 
-from src.formatters import default_formatter, ls_formatter, show_formatter
+from src.formatters import conflicting_fields, default_formatter, find_json_document, ls_formatter, parse_table, show_formatter
 
 
 def test_default_formatter():
@@ -84,8 +84,8 @@ val1 | val2
 val3 | val4
 """
     result = show_formatter(tabular_data)
-    # Our formatter successfully converts this to JSON
-    assert result.startswith('[{"col1":')
+    # Our formatter successfully converts this to columnar JSON
+    assert result.startswith('{"columns":["col1","col2"],"rows":')
     assert '"val1"' in result
     assert '"val2"' in result
     assert '"val3"' in result
@@ -101,4 +101,101 @@ val3 | val4"""
     with patch("src.formatters.logger") as mock_logger:
         result = show_formatter(tabular_data)
         # In a real scenario, this would be JSON, but our mock doesn't implement the conversion
-        assert isinstance(result, str)
\ No newline at end of file
+        assert isinstance(result, str)
+
+
+def test_ls_formatter_parsed_resources():
+    """Test that resources already parsed from dbt's JSON events are formatted."""
+    output = [
+        {"name": "orders", "resource_type": "model", "depends_on": {"nodes": ["model.example.customers"]}},
+        {"name": "customers", "resource_type": "model"},
+    ]
+
+    result = json.loads(ls_formatter(output))
+
+    assert [item["name"] for item in result] == ["customers", "orders"]
+    assert result[1]["depends_on"]["nodes"] == ["model.example.customers"]
+
+
+def test_ls_formatter_fields_and_encodings():
+    """Test field projection, minified output and the columnar encoding."""
+    output = [
+        {"name": "orders", "resource_type": "model", "unique_id": "model.shop.orders",
+         "config": {"materialized": "table"}, "depends_on": {"nodes": ["model.shop.customers"]}},
+        {"name": "customers", "resource_type": "model", "unique_id": "model.shop.customers",
+         "config": {"materialized": "view"}},
+    ]
+
+    result = ls_formatter(output, fields=["unique_id", "config.materialized"])
+    assert " " not in result
+    assert json.loads(result) == [
+        {"unique_id": "model.shop.customers", "config": {"materialized": "view"}},
+        {"unique_id": "model.shop.orders", "config": {"materialized": "table"}},
+    ]
+
+    result = json.loads(ls_formatter(output, encoding="columnar"))
+    assert result == {
+        "columns": ["name", "resource_type", "depends_on.nodes"],
+        "rows": [["customers", "model", []], ["orders", "model", ["model.shop.customers"]]],
+    }
+
+    result = json.loads(ls_formatter(output, verbose=True, encoding="columnar"))
+    assert result["columns"] == ["name", "resource_type", "unique_id", "config", "depends_on"]
+    assert result["rows"][0][-1] is None
+
+    # Resources of other types are kept as they are, but still projected
+    exposures = [{"name": "weekly", "resource_type": "exposure", "owner": {"name": "finance"}}]
+    assert json.loads(ls_formatter(exposures, fields=["name"])) == [{"name": "weekly"}]
+
+
+def test_conflicting_fields():
+    """Test that fields nested in another requested field are reported."""
+    assert conflicting_fields(["name", "config.materialized", "config.tags"]) is None
+    assert conflicting_fields(["name", "name.x"]) == ("name", "name.x")
+    assert conflicting_fields(["config.meta.owner", "config"]) == ("config", "config.meta.owner")
+
+
+def test_show_formatter_json_with_log_lines():
+    """Test that the first JSON document is extracted from output with log lines around it."""
+    output = (
+        "12:00:00  Running with dbt=1.7.0\n"
+        "12:00:01  Previewing node 'orders' {not json}\n"
+        '{"node": "orders", "show": [{"id": 1, "status": null}, {"id": 2, "status": "shipped"}]}\n'
+        "12:00:02  Done. {\"elapsed\": 1.2}\n"
+    )
+
+    assert json.loads(show_formatter(output)) == {
+        "node": "orders",
+        "columns": ["id", "status"],
+        "rows": [[1, None], [2, "shipped"]],
+    }
+    assert find_json_document("no json {here") is None
+
+
+def test_show_formatter_previews_from_events():
+    """Test that previews collected from dbt's events are converted to the columnar shape."""
+    previews = [{"node": "orders", "show": [{"id": 1}]}, {"show": [{"n": 2}]}]
+
+    assert json.loads(show_formatter(previews)) == [
+        {"node": "orders", "columns": ["id"], "rows": [[1]]},
+        {"columns": ["n"], "rows": [[2]]},
+    ]
+
+
+def test_parse_table_keeps_empty_and_null_cells():
+    """Test that empty and NULL cells keep their column."""
+    output = """Previewing node 'customers':
+| id | first_name | last_order |
+| -- | ---------- | ---------- |
+|  1 | Michael    | 2018-01-09 |
+|  2 |            | NULL       |
+|  3 | Shawn      |            |
+
+Done.
+"""
+
+    assert parse_table(output) == {
+        "columns": ["id", "first_name", "last_order"],
+        "rows": [["1", "Michael", "2018-01-09"], ["2", "", None], ["3", "Shawn", ""]],
+    }
+    assert parse_table("no | table here") is None
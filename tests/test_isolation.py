@@ -0,0 +1,103 @@
+"""
+Tests for the isolation module.
+"""
+
+import os
+import sys
+import pytest
+from unittest.mock import patch
+
+from src.config import config
+from src.command import execute_dbt_command
+from src.isolation import IsolatedInvocation, INVOCATIONS_DIR
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Create a project with canonical artifacts."""
+    target = tmp_path / "target"
+    target.mkdir()
+    (target / "manifest.json").write_text('{"version": 1}')
+    (target / "partial_parse.msgpack").write_bytes(b"cache-v1")
+    return tmp_path
+
+
+def test_prepare_seeds_artifacts(project):
+    """Test that invocation directories are seeded from the canonical target."""
+    invocation = IsolatedInvocation(str(project))
+    invocation.prepare()
+
+    assert invocation.root.parent == project / "target" / INVOCATIONS_DIR
+    assert (invocation.invocation_target / "manifest.json").read_text() == '{"version": 1}'
+    assert (invocation.invocation_target / "partial_parse.msgpack").read_bytes() == b"cache-v1"
+    assert invocation.invocation_logs.is_dir()
+    assert invocation.args() == [
+        "--target-path", str(invocation.invocation_target),
+        "--log-path", str(invocation.invocation_logs)
+    ]
+
+    invocation.cleanup()
+    assert not invocation.root.exists()
+
+
+def test_promote_replaces_canonical_artifacts(project):
+    """Test that refreshed artifacts are moved to the canonical target."""
+    invocation = IsolatedInvocation(str(project))
+    invocation.prepare()
+    (invocation.invocation_target / "manifest.json").write_text('{"version": 2}')
+    (invocation.invocation_target / "partial_parse.msgpack").write_bytes(b"cache-v2")
+    (invocation.invocation_target / "run_results.json").write_text("{}")
+
+    assert invocation.promote() == ["manifest.json", "partial_parse.msgpack"]
+    assert (project / "target" / "manifest.json").read_text() == '{"version": 2}'
+    assert (project / "target" / "partial_parse.msgpack").read_bytes() == b"cache-v2"
+    assert not (project / "target" / "run_results.json").exists()
+    invocation.cleanup()
+
+
+def test_promote_skipped_when_canonical_changed(project):
+    """Test that artifacts aren't promoted over newer canonical ones."""
+    invocation = IsolatedInvocation(str(project))
+    invocation.prepare()
+    (invocation.invocation_target / "manifest.json").write_text('{"version": 2}')
+
+    # Another command rewrote the canonical manifest in the meantime
+    canonical = project / "target" / "manifest.json"
+    canonical.write_text('{"version": 3, "from": "build"}')
+    os.utime(canonical, ns=(0, 1))
+
+    assert invocation.promote() == []
+    assert canonical.read_text() == '{"version": 3, "from": "build"}'
+    invocation.cleanup()
+
+
+def test_target_path_from_project_file(tmp_path):
+    """Test that target-path in dbt_project.yml and DBT_TARGET_PATH are honoured."""
+    (tmp_path / "dbt_project.yml").write_text("name: test\ntarget-path: \"build_output\"\n")
+    assert IsolatedInvocation(str(tmp_path)).target_path == tmp_path.resolve() / "build_output"
+
+    env = {"DBT_TARGET_PATH": "env_target"}
+    assert IsolatedInvocation(str(tmp_path), env).target_path == tmp_path.resolve() / "env_target"
+
+
+@pytest.mark.asyncio
+async def test_compile_keeps_compiled_sql(project):
+    """Test that dbt compile's SQL is left in the canonical target directory."""
+    (project / "dbt_project.yml").write_text("name: shop\n")
+    dbt = project / "fake_dbt.py"
+    dbt.write_text(
+        f"#!{sys.executable}\n"
+        "import sys, pathlib\n"
+        "args = sys.argv[1:]\n"
+        "target = pathlib.Path(args[args.index('--target-path') + 1] if '--target-path' in args else 'target')\n"
+        "compiled = target / 'compiled' / 'shop' / 'models' / 'x.sql'\n"
+        "compiled.parent.mkdir(parents=True, exist_ok=True)\n"
+        "compiled.write_text('select 1')\n"
+    )
+    dbt.chmod(0o755)
+
+    with patch.dict(config, {"dbt_path": str(dbt), "execution_backend": "subprocess", "coalesce_commands": False}):
+        result = await execute_dbt_command(["compile"], str(project))
+
+    assert result["success"], result
+    assert (project / "target" / "compiled" / "shop" / "models" / "x.sql").read_text() == "select 1"
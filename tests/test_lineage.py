@@ -0,0 +1,177 @@
+"""
+Tests for the lineage module.
+"""
+
+import os
+import json
+import time
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.node_store import NodeStore
+from src.lineage import LineageError, find_paths, get_lineage, lineage, traverse
+
+
+def node(unique_id, depends_on=(), **fields):
+    """Build a manifest node."""
+    resource_type, package, name = unique_id.split(".")[0], unique_id.split(".")[1], unique_id.split(".")[-1]
+    return {
+        "name": name, "resource_type": resource_type, "package_name": package,
+        "original_file_path": f"models/{name}.sql", "depends_on": {"nodes": list(depends_on)}, **fields,
+    }
+
+
+#   raw.orders -> stg_orders -> orders -----------> report
+#                      \\-----> order_items -> orders
+#   raw.customers -> stg_customers -> customers -> report
+NODES = {
+    "model.shop.stg_orders": node("model.shop.stg_orders", ["source.shop.raw.orders"]),
+    "model.shop.stg_customers": node("model.shop.stg_customers", ["source.shop.raw.customers"]),
+    "model.shop.order_items": node("model.shop.order_items", ["model.shop.stg_orders"]),
+    "model.shop.orders": node("model.shop.orders", ["model.shop.stg_orders", "model.shop.order_items"]),
+    "model.shop.customers": node("model.shop.customers", ["model.shop.stg_customers"]),
+    "model.shop.report": node("model.shop.report", ["model.shop.orders", "model.shop.customers"]),
+    "test.shop.not_null_orders_id": node("test.shop.not_null_orders_id", ["model.shop.orders"]),
+}
+SOURCES = {
+    f"source.shop.raw.{name}": {
+        "name": name, "resource_type": "source", "package_name": "shop",
+        "source_name": "raw", "original_file_path": "models/sources.yml",
+    }
+    for name in ("orders", "customers")
+}
+MANIFEST = {"metadata": {"project_name": "shop"}, "nodes": NODES, "sources": SOURCES}
+
+
+@pytest.fixture
+def store():
+    """Build a node store for the manifest."""
+    return NodeStore.from_manifest(MANIFEST)
+
+
+def ids(store, node_ids):
+    """Get the unique_ids of node ids."""
+    return sorted(store.unique_ids[node_id] for node_id in node_ids)
+
+
+def test_traverse_with_depth(store):
+    """Test breadth-first traversal and depth limits."""
+    stg_orders = store.node_id("model.shop.stg_orders")
+
+    downstream = traverse(store, stg_orders, "downstream")
+    assert downstream[store.node_id("model.shop.orders")] == 1
+    assert downstream[store.node_id("model.shop.report")] == 2
+    assert ids(store, traverse(store, stg_orders, "downstream", max_depth=1)) == [
+        "model.shop.order_items", "model.shop.orders"
+    ]
+    assert ids(store, traverse(store, stg_orders, "upstream")) == ["source.shop.raw.orders"]
+    assert traverse(store, stg_orders, "upstream", max_depth=0) == {}
+
+
+def test_find_paths(store):
+    """Test path enumeration, limits and unreachable targets."""
+    source = store.node_id("source.shop.raw.orders")
+    report = store.node_id("model.shop.report")
+
+    paths, truncated = find_paths(store, source, report)
+    assert sorted([store.unique_ids[step] for step in path] for path in paths) == [
+        ["source.shop.raw.orders", "model.shop.stg_orders", "model.shop.order_items", "model.shop.orders", "model.shop.report"],
+        ["source.shop.raw.orders", "model.shop.stg_orders", "model.shop.orders", "model.shop.report"],
+    ]
+    assert not truncated
+
+    paths, truncated = find_paths(store, source, report, max_paths=1)
+    assert len(paths) == 1 and truncated
+
+    paths, _ = find_paths(store, source, report, max_depth=3)
+    assert paths == [[source, store.node_id("model.shop.stg_orders"), store.node_id("model.shop.orders"), report]]
+
+    assert find_paths(store, report, source) == ([], False)
+
+
+def test_lineage(store):
+    """Test lineage queries by name, with filters and paths."""
+    result = lineage(store, "orders", resource_types=["model", "source"])
+    assert result["node"] == {"unique_id": "model.shop.orders", "name": "orders", "resource_type": "model"}
+    assert [(entry["name"], entry["depth"]) for entry in result["upstream"]] == [
+        ("order_items", 1), ("stg_orders", 1), ("orders", 2)
+    ]
+    assert result["upstream"][2]["resource_type"] == "source"
+    assert [entry["name"] for entry in result["downstream"]] == ["report"]
+
+    result = lineage(store, "report", direction="upstream", max_depth=1)
+    assert "downstream" not in result
+    assert [entry["name"] for entry in result["upstream"]] == ["customers", "orders"]
+
+    # Paths are listed from the upstream end, whichever node is given first
+    result = lineage(store, "report", direction="upstream", to="stg_customers")
+    assert result["paths"] == [["model.shop.stg_customers", "model.shop.customers", "model.shop.report"]]
+
+
+def test_lineage_errors(store):
+    """Test unknown, ambiguous and invalid queries."""
+    with pytest.raises(LineageError, match="No resource named"):
+        lineage(store, "missing")
+    with pytest.raises(LineageError, match="Invalid direction"):
+        lineage(store, "orders", direction="sideways")
+    for query in ({"max_depth": 0}, {"max_depth": -1}, {"to": "report", "max_paths": 0}, {"to": "report", "max_paths": -1}):
+        with pytest.raises(LineageError, match="must be at least 1"):
+            lineage(store, "orders", **query)
+    with pytest.raises(LineageError, match="max_paths"):
+        find_paths(store, store.node_id("model.shop.orders"), store.node_id("model.shop.report"), max_paths=-1)
+
+    # A model is preferred over a source with the same name
+    assert lineage(store, "customers")["node"]["unique_id"] == "model.shop.customers"
+
+    ambiguous = {**MANIFEST, "nodes": {**NODES, "seed.shop.customers": node("seed.shop.customers")}}
+    ambiguous["nodes"]["model.other.report"] = node("model.other.report")
+    with pytest.raises(LineageError, match="several resources"):
+        lineage(NodeStore.from_manifest(ambiguous), "report")
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Create a project whose manifest is newer than its files."""
+    (tmp_path / "models").mkdir()
+    for item in list(NODES.values()) + list(SOURCES.values()):
+        (tmp_path / item["original_file_path"]).write_text("select 1")
+    manifest_path = tmp_path / "target" / "manifest.json"
+    manifest_path.parent.mkdir()
+    manifest_path.write_text(json.dumps(MANIFEST))
+    future = time.time_ns() + 10_000_000_000
+    os.utime(manifest_path, ns=(future, future))
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_get_lineage_from_manifest(project):
+    """Test that a fresh manifest is used without running dbt."""
+    with patch("src.command.execute_dbt_command", new_callable=AsyncMock) as mock_execute:
+        result = await get_lineage("stg_orders", str(project), direction="downstream", max_depth=1)
+
+    mock_execute.assert_not_called()
+    assert result["success"] is True
+    assert result["backend"] == "manifest"
+    assert [entry["name"] for entry in result["output"]["downstream"]] == ["order_items", "orders"]
+
+    result = await get_lineage("missing", str(project))
+    assert result["success"] is False
+    assert "No resource named" in result["error"]
+
+
+@pytest.mark.asyncio
+async def test_get_lineage_parses_stale_project(project):
+    """Test that dbt parse runs first when the manifest is stale, and its failure is returned."""
+    future = time.time_ns() + 20_000_000_000
+    os.utime(project / "models" / "orders.sql", ns=(future, future))
+
+    failure = {"success": False, "output": "Parsing Error", "error": "Error", "returncode": 2}
+    with patch("src.command.execute_dbt_command", new_callable=AsyncMock, return_value=failure) as mock_execute:
+        result = await get_lineage("orders", str(project))
+
+    mock_execute.assert_called_once_with(["parse"], str(project), None)
+    assert result == failure
+
+    with patch("src.command.execute_dbt_command", new_callable=AsyncMock, return_value={"success": True}):
+        result = await get_lineage("orders", str(project))
+    assert result["success"] is True
@@ -0,0 +1,44 @@
+"""
+Tests for the log_preview module.
+"""
+
+import json
+import logging
+
+from src.log_preview import Preview, preview
+
+
+class Unserializable:
+    """Fails if it is ever converted to a string."""
+
+    def __str__(self):
+        raise AssertionError("serialized past the preview")
+
+
+def test_preview_bounds_values():
+    """Test that previews are cut to their limit."""
+    assert preview("x" * 500) == "x" * 100
+    assert preview("short") == "short"
+    assert preview({"a": [1, 2]}) == json.dumps({"a": [1, 2]})
+    assert preview([{"name": f"model_{i}"} for i in range(1000)], 20) == json.dumps([{"name": "model_0"}])[:20]
+    assert preview(None) == "None"
+
+
+def test_preview_stops_serializing_early():
+    """Test that only the start of a large structure is serialized."""
+    rows = [{"id": i} for i in range(10000)] + [Unserializable()]
+    assert preview(rows).startswith('[{"id": 0}, {"id": 1}')
+
+
+def test_preview_is_lazy(caplog):
+    """Test that nothing is serialized unless the record is emitted."""
+    logger = logging.getLogger("test_log_preview")
+    rows = [Unserializable()]
+
+    with caplog.at_level(logging.WARNING, logger="test_log_preview"):
+        logger.info("Output: %s", Preview(rows))
+    assert caplog.records == []
+
+    with caplog.at_level(logging.INFO, logger="test_log_preview"):
+        logger.info("Output: %s", Preview("x" * 500, 10))
+    assert caplog.records[0].getMessage() == "Output: " + "x" * 10
@@ -0,0 +1,156 @@
+"""
+Tests for the manifest module.
+"""
+
+import os
+import json
+import time
+import pytest
+from unittest.mock import patch
+
+from src.config import config
+from src.manifest import CompactManifest, ManifestCache, ManifestFile, find_nodes_by_name, get_manifest_path
+
+
+def make_manifest(nodes=None, **sections):
+    """Build a minimal manifest.json document."""
+    return {
+        "metadata": {"project_name": "example", "dbt_version": "1.7.0"},
+        "nodes": nodes or {},
+        "sources": {},
+        **sections,
+    }
+
+
+MANIFEST = make_manifest(
+    nodes={
+        "model.example.customers": {
+            "name": "customers", "resource_type": "model", "depends_on": {"nodes": ["source.example.raw.customers"]}
+        },
+        "model.example.orders": {
+            "name": "orders", "resource_type": "model", "depends_on": {"nodes": ["model.example.customers"]}
+        },
+        "test.example.not_null_customers_id": {
+            "name": "customers", "resource_type": "test", "depends_on": {"nodes": ["model.example.customers"]}
+        },
+    },
+    sources={"source.example.raw.customers": {"name": "customers", "resource_type": "source"}},
+)
+
+
+@pytest.fixture
+def manifest_path(tmp_path):
+    """Write a manifest into a project's target directory."""
+    path = tmp_path / "target" / "manifest.json"
+    path.parent.mkdir()
+    path.write_text(json.dumps(MANIFEST))
+    return path
+
+
+def test_cache_reuses_and_invalidates(manifest_path):
+    """Test that a manifest is read once and reloaded when the file changes."""
+    cache = ManifestCache(CompactManifest.load)
+    first = cache.get(manifest_path)
+    assert cache.get(manifest_path) is first
+
+    manifest_path.write_text(json.dumps(make_manifest()))
+    stat = manifest_path.stat()
+    os.utime(manifest_path, ns=(stat.st_atime_ns, first.mtime_ns + 1_000_000_000))
+
+    second = cache.get(manifest_path)
+    assert second is not first
+    assert second.store.node_id("model.example.customers") is None
+
+
+def test_cache_missing_or_invalid(tmp_path):
+    """Test that missing or unparseable manifests aren't cached."""
+    cache = ManifestCache(CompactManifest.load)
+    assert cache.get(tmp_path / "manifest.json") is None
+
+    (tmp_path / "manifest.json").write_text("{not json")
+    assert cache.get(tmp_path / "manifest.json") is None
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Test eviction once the cached manifests exceed the memory budget."""
+    nodes = {
+        f"model.example.model_{i}": {"name": f"model_{i}", "resource_type": "model", "package_name": "example"}
+        for i in range(2000)
+    }
+    paths = []
+    for name in ("a", "b", "c"):
+        path = tmp_path / name / "manifest.json"
+        path.parent.mkdir()
+        path.write_text(json.dumps(make_manifest(nodes=nodes)))
+        paths.append(path)
+
+    cache = ManifestCache(CompactManifest.load)
+    first = cache.get(paths[0])
+    # Room for two of the three manifests
+    budget_mb = 2.5 * first.memory_bytes / (1024 * 1024)
+    with patch.dict(config, {"manifest_cache_max_mb": budget_mb}):
+        cache.get(paths[1])
+        cache.get(paths[0])
+        cache.get(paths[2])
+
+        assert cache.total_bytes <= budget_mb * 1024 * 1024
+        assert cache.get(paths[0]) is first
+
+
+def test_compact_cache_streams_node_store(manifest_path):
+    """Test that the compact cache holds the node store rather than the parsed manifest."""
+    cache = ManifestCache(CompactManifest.load)
+    manifest = cache.get(manifest_path)
+
+    assert isinstance(manifest, CompactManifest)
+    assert cache.get(manifest_path) is manifest
+    assert manifest.project_name == "example"
+    assert manifest.source_paths() == ([], [])
+    store = manifest.store
+    assert [store.unique_ids[i] for i in store.parents(store.node_id("model.example.orders"))] == [
+        "model.example.customers"
+    ]
+    assert cache.total_bytes == store.nbytes
+
+
+def test_manifest_file_is_abstract(manifest_path):
+    """Test that views of a manifest must implement the node store and memory accounting."""
+    with pytest.raises(TypeError):
+        ManifestFile(manifest_path, (0, 0))
+
+
+def test_get_manifest_path_follows_target_path(tmp_path):
+    """Test that the manifest is looked up in the project's target directory."""
+    assert get_manifest_path(str(tmp_path)) == tmp_path.resolve() / "target" / "manifest.json"
+    assert get_manifest_path(str(tmp_path), {"DBT_TARGET_PATH": "build"}) == tmp_path.resolve() / "build" / "manifest.json"
+
+
+@pytest.mark.asyncio
+async def test_find_nodes_by_name(tmp_path):
+    """Test name lookups against a fresh manifest, and fallback when it is stale."""
+    model_path = tmp_path / "models" / "marts" / "customers.sql"
+    model_path.parent.mkdir(parents=True)
+    model_path.write_text("select 1")
+    nodes = {
+        "model.example.customers": {
+            "name": "customers", "resource_type": "model", "package_name": "example",
+            "original_file_path": "models/marts/customers.sql", "fqn": ["example", "marts", "customers"]
+        }
+    }
+    manifest_path = tmp_path / "target" / "manifest.json"
+    manifest_path.parent.mkdir()
+    manifest_path.write_text(json.dumps(make_manifest(nodes=nodes)))
+    future = time.time_ns() + 10_000_000_000
+    os.utime(manifest_path, ns=(future, future))
+
+    assert await find_nodes_by_name("customers", str(tmp_path)) == ["model.example.customers"]
+    assert await find_nodes_by_name("missing", str(tmp_path)) == []
+    assert await find_nodes_by_name("+customers", str(tmp_path)) is None
+
+    # Folders and packages select the nodes inside them, which dbt resolves
+    assert await find_nodes_by_name("marts", str(tmp_path)) is None
+    assert await find_nodes_by_name("example", str(tmp_path)) is None
+
+    # An edited model makes the manifest stale
+    os.utime(model_path, ns=(future + 1, future + 1))
+    assert await find_nodes_by_name("customers", str(tmp_path)) is None
@@ -0,0 +1,171 @@
+"""
+Tests for the manifest_index module.
+"""
+
+import json
+import sqlite3
+import pytest
+from unittest.mock import patch
+
+from src.config import config
+from src.manifest import CompactManifest
+from src.manifest_index import (
+    SCHEMA_VERSION,
+    get_index_path,
+    load_indexed_node_store,
+    open_index,
+)
+from src.manifest_stream import load_node_store
+from src.node_store import STORED_COLUMNS
+from tests.test_manifest_stream import MANIFEST
+
+
+def snapshot(store):
+    """Get a view of a node store that doesn't depend on node ids."""
+    return {
+        "records": sorted((record.to_dict() for record in store.records()), key=lambda record: record["unique_id"]),
+        "parents": {
+            store.unique_ids[node_id]: sorted(store.unique_ids[parent] for parent in store.parents(node_id))
+            for node_id in range(len(store))
+        },
+        "children": {
+            store.unique_ids[node_id]: sorted(store.unique_ids[child] for child in store.children(node_id))
+            for node_id in range(len(store))
+        },
+        "columns": {
+            store.unique_ids[node_id]: [store.value(node_id, column) for column in STORED_COLUMNS]
+            for node_id in range(len(store))
+        },
+        "metadata": store.metadata,
+        "source_files": store.source_files,
+        "default_selectors": store.default_selectors,
+    }
+
+
+@pytest.fixture
+def manifest_path(tmp_path):
+    """Write the test manifest into a target directory."""
+    path = tmp_path / "target" / "manifest.json"
+    path.parent.mkdir()
+    path.write_text(json.dumps(MANIFEST))
+    return path
+
+
+def query(manifest_path, sql):
+    """Run a query against a manifest's index."""
+    connection = sqlite3.connect(str(get_index_path(manifest_path)))
+    try:
+        return connection.execute(sql).fetchall()
+    finally:
+        connection.close()
+
+
+def test_first_load_builds_index(manifest_path):
+    """Test that streaming a manifest fills every table of the index."""
+    store = load_indexed_node_store(manifest_path, ("manifest", 1))
+
+    assert snapshot(store) == snapshot(load_node_store(manifest_path))
+    assert query(manifest_path, "SELECT name, materialized, tags FROM nodes WHERE unique_id = 'model.shop.customers'") == [
+        ("customers", "table", '["nightly"]')
+    ]
+    assert sorted(query(manifest_path, "SELECT parent, child FROM edges")) == [
+        ("model.shop.customers", "model.shop.orders"),
+        ("source.shop.raw.customers", "model.shop.customers"),
+    ]
+    assert query(manifest_path, "SELECT unique_id, source_name FROM sources") == [("source.shop.raw.customers", "raw")]
+    assert len(query(manifest_path, "SELECT * FROM macros")) == 2
+    assert ("model.shop.customers", "models/schema.yml") in query(manifest_path, "SELECT unique_id, path FROM files")
+
+
+def test_unchanged_manifest_loads_from_index(manifest_path):
+    """Test that the manifest isn't read again while the index is up to date."""
+    expected = snapshot(load_indexed_node_store(manifest_path, ("manifest", 1)))
+
+    with patch("src.manifest_index.load_node_store") as load:
+        store = load_indexed_node_store(manifest_path, ("manifest", 1))
+
+    load.assert_not_called()
+    assert snapshot(store) == expected
+
+
+def test_changed_manifest_updates_changed_entries(manifest_path):
+    """Test that only the entries that changed are rewritten, and removed ones are deleted."""
+    load_indexed_node_store(manifest_path, ("manifest", 1))
+
+    manifest = json.loads(json.dumps(MANIFEST))
+    manifest["nodes"]["model.shop.orders"]["config"]["materialized"] = "incremental"
+    del manifest["macros"]["macro.dbt.is_incremental"]
+    manifest_path.write_text(json.dumps(manifest))
+
+    with patch("src.manifest_index.ManifestIndexWriter.finish", autospec=True) as finish:
+        finish.side_effect = lambda writer, *args: setattr(finish, "changed", writer.changed)
+        load_indexed_node_store(manifest_path, ("manifest", 2))
+    assert finish.changed == 1
+
+    store = load_indexed_node_store(manifest_path, ("manifest", 2))
+    assert snapshot(store) == snapshot(load_node_store(manifest_path))
+    assert query(manifest_path, "SELECT materialized FROM nodes WHERE unique_id = 'model.shop.orders'") == [
+        ("incremental",)
+    ]
+    assert query(manifest_path, "SELECT unique_id FROM macros") == [("macro.shop.cents",)]
+
+    with patch("src.manifest_index.load_node_store") as load:
+        load_indexed_node_store(manifest_path, ("manifest", 2))
+    load.assert_not_called()
+
+
+def test_index_keeps_graph_maps(manifest_path):
+    """Test that the graph maps are indexed and preferred to depends_on, as when streaming."""
+    manifest = json.loads(json.dumps(MANIFEST))
+    manifest["parent_map"]["model.shop.orders"].append("source.shop.raw.customers")
+    manifest["child_map"]["source.shop.raw.customers"].append("model.shop.orders")
+    manifest_path.write_text(json.dumps(manifest))
+
+    streamed = snapshot(load_indexed_node_store(manifest_path, ("manifest", 1)))
+    with patch("src.manifest_index.load_node_store") as load:
+        indexed = snapshot(load_indexed_node_store(manifest_path, ("manifest", 1)))
+    load.assert_not_called()
+
+    assert indexed == streamed
+    assert indexed["parents"]["model.shop.orders"] == ["model.shop.customers", "source.shop.raw.customers"]
+    assert indexed["children"]["source.shop.raw.customers"] == ["model.shop.customers", "model.shop.orders"]
+
+
+def test_outdated_schema_is_rebuilt(manifest_path):
+    """Test that an index written with another schema version is recreated."""
+    load_indexed_node_store(manifest_path, ("manifest", 1))
+    connection = sqlite3.connect(str(get_index_path(manifest_path)))
+    connection.execute("UPDATE meta SET value = '0' WHERE key = 'schema_version'")
+    connection.commit()
+    connection.close()
+
+    connection = open_index(get_index_path(manifest_path))
+    try:
+        assert connection.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone() == (SCHEMA_VERSION,)
+        assert connection.execute("SELECT COUNT(*) FROM nodes").fetchone() == (0,)
+    finally:
+        connection.close()
+
+    store = load_indexed_node_store(manifest_path, ("manifest", 1))
+    assert snapshot(store) == snapshot(load_node_store(manifest_path))
+
+
+def test_corrupt_index_falls_back_to_streaming(manifest_path):
+    """Test that an unreadable index doesn't prevent loading the manifest."""
+    get_index_path(manifest_path).write_bytes(b"not a database" * 100)
+
+    store = load_indexed_node_store(manifest_path, ("manifest", 1))
+
+    assert snapshot(store) == snapshot(load_node_store(manifest_path))
+
+
+def test_compact_manifest_uses_index(manifest_path):
+    """Test that compact manifests go through the index unless it is disabled."""
+    CompactManifest.load(manifest_path, ("manifest", 1))
+    assert get_index_path(manifest_path).exists()
+
+    get_index_path(manifest_path).unlink()
+    with patch.dict(config, {"manifest_index": False}):
+        manifest = CompactManifest.load(manifest_path, ("manifest", 1))
+    assert not get_index_path(manifest_path).exists()
+    assert manifest.project_name == "shop"
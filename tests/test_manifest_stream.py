@@ -0,0 +1,109 @@
+"""
+Tests for the manifest_stream module.
+"""
+
+import io
+import json
+import pytest
+
+from src.node_store import NodeStore
+from src.manifest_stream import JSONStreamReader, load_node_store, read_node_store
+
+MANIFEST = {
+    "metadata": {"project_name": "shop", "dbt_version": "1.7.0"},
+    "nodes": {
+        "model.shop.customers": {
+            "name": "customers", "resource_type": "model", "package_name": "shop",
+            "original_file_path": "models/customers.sql", "patch_path": "shop://models/schema.yml",
+            "tags": ["nightly"], "config": {"materialized": "table"}, "raw_code": "select 1.5e3 as x",
+            "depends_on": {"nodes": ["source.shop.raw.customers"]},
+        },
+        "model.shop.orders": {
+            "name": "orders", "resource_type": "model", "package_name": "shop",
+            "original_file_path": "models/orders.sql", "tags": [], "config": {"materialized": "view"},
+            "depends_on": {"nodes": ["model.shop.customers"]},
+        },
+    },
+    "sources": {
+        "source.shop.raw.customers": {
+            "name": "customers", "resource_type": "source", "package_name": "shop",
+            "original_file_path": "models/sources.yml", "source_name": "raw",
+        },
+    },
+    "macros": {
+        "macro.shop.cents": {"name": "cents", "package_name": "shop", "original_file_path": "macros/cents.sql"},
+        "macro.dbt.is_incremental": {"name": "is_incremental", "package_name": "dbt", "original_file_path": "macros/x.sql"},
+    },
+    "disabled": {"model.shop.old": [{"name": "old", "resource_type": "model"}]},
+    "created_at": 1700000000.25,
+    "parent_map": {
+        "model.shop.customers": ["source.shop.raw.customers"],
+        "model.shop.orders": ["model.shop.customers"],
+        "source.shop.raw.customers": [],
+    },
+    "child_map": {
+        "model.shop.customers": ["model.shop.orders"],
+        "model.shop.orders": [],
+        "source.shop.raw.customers": ["model.shop.customers"],
+    },
+}
+
+
+def snapshot(store):
+    """Get a comparable view of a node store."""
+    return {
+        "records": [record.to_dict() for record in store.records()],
+        "parents": [list(store.parents(node_id)) for node_id in range(len(store))],
+        "children": [list(store.children(node_id)) for node_id in range(len(store))],
+        "metadata": store.metadata,
+        "source_files": store.source_files,
+    }
+
+
+def test_reader_walks_objects_across_chunks():
+    """Test that values spanning chunk boundaries are decoded whole."""
+    reader = JSONStreamReader(io.StringIO('{"a": 12345, "b": {"c": [1, 2], "d": "x y"}, "e": true}'), chunk_size=3)
+    keys = reader.keys()
+    assert next(keys) == "a"
+    assert reader.value() == 12345
+    assert next(keys) == "b"
+    assert [(key, reader.value()) for key in reader.keys()] == [("c", [1, 2]), ("d", "x y")]
+    assert next(keys) == "e"
+    reader.skip()
+    assert list(keys) == []
+
+
+@pytest.mark.parametrize("chunk_size", [1, 16, 1024 * 1024])
+def test_read_node_store_matches_parsed_manifest(chunk_size):
+    """Test that streaming builds the same store as parsing the whole manifest."""
+    text = json.dumps(MANIFEST, indent=2)
+    store = read_node_store(io.StringIO(text), chunk_size)
+
+    assert snapshot(store) == snapshot(NodeStore.from_manifest(MANIFEST))
+    assert store.project_name == "shop"
+    assert store.source_files == [
+        "macros/cents.sql", "models/customers.sql", "models/orders.sql", "models/schema.yml", "models/sources.yml"
+    ]
+    assert store.find_by_name("old") == []
+
+
+def test_read_node_store_without_graph_maps():
+    """Test that parents come from depends_on when the manifest has no parent_map."""
+    manifest = {key: value for key, value in MANIFEST.items() if key not in ("parent_map", "child_map")}
+    store = read_node_store(io.StringIO(json.dumps(manifest)), chunk_size=8)
+    customers = store.node_id("model.shop.customers")
+
+    assert [store.unique_ids[i] for i in store.parents(customers)] == ["source.shop.raw.customers"]
+    assert [store.unique_ids[i] for i in store.children(customers)] == ["model.shop.orders"]
+
+
+def test_load_node_store_rejects_invalid_manifests(tmp_path):
+    """Test that truncated or malformed manifests raise ValueError."""
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps(MANIFEST)[:-40])
+    with pytest.raises(ValueError):
+        load_node_store(path)
+
+    path.write_text("[]")
+    with pytest.raises(ValueError):
+        load_node_store(path)
@@ -0,0 +1,109 @@
+"""
+Tests for the node_store module.
+"""
+
+from src.node_store import EdgeList, NodeStore, NodeStoreBuilder, project_node
+
+MANIFEST = {
+    "metadata": {"project_name": "shop"},
+    "nodes": {
+        "model.shop.customers": {
+            "name": "customers", "resource_type": "model", "package_name": "shop",
+            "original_file_path": "models/customers.sql", "schema": "analytics", "alias": "customers",
+            "tags": ["nightly"], "config": {"materialized": "table"}, "columns": {"id": {"name": "id"}},
+        },
+        "model.shop.orders": {
+            "name": "orders", "resource_type": "model", "package_name": "shop",
+            "original_file_path": "models/orders.sql", "schema": "analytics", "alias": "orders",
+            "tags": [], "config": {"materialized": "view"},
+        },
+    },
+    "sources": {
+        "source.shop.raw.customers": {
+            "name": "customers", "resource_type": "source", "package_name": "shop",
+            "source_name": "raw", "schema": "raw", "tags": [], "config": {},
+        },
+    },
+    "parent_map": {
+        "model.shop.customers": ["source.shop.raw.customers"],
+        "model.shop.orders": ["model.shop.customers"],
+        "source.shop.raw.customers": [],
+    },
+    "child_map": {
+        "model.shop.customers": ["model.shop.orders"],
+        "model.shop.orders": [],
+        "source.shop.raw.customers": ["model.shop.customers"],
+    },
+}
+
+
+def test_edge_list_csr():
+    """Test the compressed sparse row layout of collected edges."""
+    edges = EdgeList()
+    edges.add(2, [0])
+    edges.add(0, [2, 1])
+
+    offsets, targets = edges.csr(3)
+    assert list(offsets) == [0, 2, 2, 3]
+    assert list(targets) == [1, 2, 0]
+
+    offsets, targets = edges.csr(3, sort=False)
+    assert list(targets) == [2, 1, 0]
+
+    offsets, targets = edges.csr(3, reverse=True)
+    assert list(offsets) == [0, 1, 2, 3]
+    assert list(targets) == [2, 0, 0]
+
+
+def test_project_node():
+    """Test that only the stored fields are kept."""
+    fields = project_node(MANIFEST["nodes"]["model.shop.customers"])
+    assert fields["materialized"] == "table"
+    assert fields["tags"] == ["nightly"]
+    assert "columns" not in fields
+
+
+def test_records_and_interning():
+    """Test that records are rebuilt from interned columns."""
+    store = NodeStore.from_manifest(MANIFEST)
+    customers = store.get(store.node_id("model.shop.customers"))
+
+    assert len(store) == 3
+    assert customers.to_dict() == {
+        "unique_id": "model.shop.customers", "tags": ["nightly"], "name": "customers",
+        "resource_type": "model", "package_name": "shop", "original_file_path": "models/customers.sql",
+        "database": None, "schema": "analytics", "alias": "customers", "source_name": None,
+        "materialized": "table",
+    }
+    assert store.value(store.node_id("source.shop.raw.customers"), "source_name") == "raw"
+    # Repeated values share one code
+    assert store.columns["package_name"][0] == store.columns["package_name"][1] == store.columns["package_name"][2]
+    assert store.columns["name"][store.node_id("model.shop.customers")] == store.columns["alias"][store.node_id("model.shop.customers")]
+    assert sorted(store.unique_ids[node_id] for node_id in store.find_by_name("customers")) == [
+        "model.shop.customers", "source.shop.raw.customers"
+    ]
+    assert store.find_by_name("missing") == []
+
+
+def test_adjacency():
+    """Test that parents and children are stored as integer arrays."""
+    store = NodeStore.from_manifest(MANIFEST)
+    customers = store.node_id("model.shop.customers")
+
+    assert [store.unique_ids[i] for i in store.parents(customers)] == ["source.shop.raw.customers"]
+    assert [store.unique_ids[i] for i in store.children(customers)] == ["model.shop.orders"]
+    assert store.edge_count == 2
+
+
+def test_builder_derives_children_and_keeps_referenced_nodes():
+    """Test that children are derived without a child map and unknown parents are kept."""
+    builder = NodeStoreBuilder()
+    builder.add_parents("model.shop.orders", ["model.shop.customers", "model.other.unknown"])
+    builder.add_node("model.shop.customers", {"name": "customers", "resource_type": "model"})
+    builder.add_node("model.shop.orders", {"name": "orders", "resource_type": "model"})
+    store = builder.build()
+
+    unknown = store.node_id("model.other.unknown")
+    assert store.value(unknown, "name") is None
+    assert [store.unique_ids[i] for i in store.children(unknown)] == ["model.shop.orders"]
+    assert [store.unique_ids[i] for i in store.children(store.node_id("model.shop.customers"))] == ["model.shop.orders"]
@@ -0,0 +1,78 @@
+"""
+Tests for the output module.
+"""
+
+import asyncio
+import pytest
+
+from src.output import BoundedBuffer, OutputCapture, encoded_size
+
+
+def test_bounded_buffer_unlimited():
+    """Test that a buffer without a budget keeps everything."""
+    buffer = BoundedBuffer()
+    for i in range(100):
+        buffer.append(f"line {i}\n")
+    assert not buffer.truncated
+    assert buffer.getvalue() == "".join(f"line {i}\n" for i in range(100))
+
+
+def test_bounded_buffer_keeps_head_and_tail():
+    """Test that a bounded buffer keeps the first and last lines."""
+    buffer = BoundedBuffer(max_bytes=40)
+    for i in range(100):
+        buffer.append(f"line {i:02d}\n")
+
+    value = buffer.getvalue()
+    assert buffer.truncated
+    assert value.startswith("line 00\nline 01\n")
+    assert value.endswith("line 98\nline 99\n")
+    assert "line 50" not in value
+    assert buffer.head_bytes + buffer.tail_bytes <= 40
+    assert buffer.total_bytes == 800
+    assert buffer.dropped_bytes == 800 - buffer.head_bytes - buffer.tail_bytes
+
+
+def test_bounded_buffer_oversized_piece():
+    """Test that a single piece larger than the budget keeps its end."""
+    buffer = BoundedBuffer(max_bytes=10)
+    buffer.append("a" * 100 + "end")
+    assert buffer.getvalue().endswith("aaend")
+    assert buffer.tail_bytes == 5
+
+
+def test_bounded_buffer_oversized_piece_counts_bytes():
+    """Test that an oversized multi-byte piece is trimmed to the budget in bytes, not characters."""
+    buffer = BoundedBuffer(max_bytes=10)
+    text = "é" * 100
+    buffer.append(text)
+    tail = "".join(buffer.tail)
+    assert tail == "é" * 2
+    assert buffer.tail_bytes == encoded_size(tail) == 4
+    assert buffer.dropped_bytes == encoded_size(text) - 4
+
+
+@pytest.mark.asyncio
+async def test_output_capture_streams_lines():
+    """Test that the capture splits chunks into lines and calls handlers."""
+    capture = OutputCapture()
+    seen = []
+    capture.add_line_handler(lambda stream, line: seen.append((stream, line)))
+
+    reader = asyncio.StreamReader()
+    reader.feed_data(b"first\nsec")
+    reader.feed_data(b"ond\n\xc3")
+    reader.feed_data(b"\xa9 no newline")
+    reader.feed_eof()
+    await capture.consume("stdout", reader)
+
+    assert seen == [("stdout", "first\n"), ("stdout", "second\n"), ("stdout", "é no newline")]
+    assert capture.stdout.getvalue() == "first\nsecond\né no newline"
+
+
+def test_output_capture_detects_unmatched_selector():
+    """Test detection of dbt's message for selectors that match nothing."""
+    capture = OutputCapture(max_bytes=10)
+    capture.feed_text("stdout", "The selection criterion 'x' does not match any enabled nodes\n")
+    capture.feed_text("stdout", "padding\n" * 100, final=True)
+    assert capture.no_nodes_matched
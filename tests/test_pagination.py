@@ -0,0 +1,103 @@
+"""
+Tests for the pagination module.
+"""
+
+import json
+import pytest
+from unittest.mock import AsyncMock
+
+from src.formatters import ls_items
+from src.pagination import PaginationError, ResultSetCache, decode_cursor, encode_cursor, list_page, result_sets
+
+COMMAND = ["ls", "--resource-type", "model", "--output", "json", "--quiet"]
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Create a dbt project with a manifest."""
+    (tmp_path / "dbt_project.yml").write_text("name: shop\n")
+    (tmp_path / "target").mkdir()
+    (tmp_path / "target" / "manifest.json").write_text("{}")
+    result_sets.clear()
+    yield tmp_path
+    result_sets.clear()
+
+
+@pytest.fixture
+def runner():
+    """A command runner standing in for execute_dbt_command, listing 5 models."""
+    output = "\n".join(
+        json.dumps({"name": f"model_{i}", "resource_type": "model", "depends_on": {"nodes": []}})
+        for i in reversed(range(5))
+    )
+    return AsyncMock(return_value={"success": True, "output": output, "error": None, "returncode": 0})
+
+
+def test_cursor_round_trip():
+    """Test that cursors decode to what they were built from, and bad cursors are rejected."""
+    assert decode_cursor(encode_cursor("abc", 40, 20)) == ("abc", 40, 20)
+    for cursor in ("not a cursor", encode_cursor("abc", -1, 20), encode_cursor("abc", 0, 0)):
+        with pytest.raises(PaginationError):
+            decode_cursor(cursor)
+
+
+def test_result_set_cache_evicts_least_recently_used():
+    """Test that the cache keeps the most recently used result sets."""
+    cache = ResultSetCache(max_entries=2)
+    cache.put("a", [1])
+    cache.put("b", [2])
+    assert cache.get("a") == [1]
+    cache.put("c", [3])
+    assert cache.get("b") is None
+    assert cache.get("a") == [1] and cache.get("c") == [3]
+
+
+@pytest.mark.asyncio
+async def test_pages_are_served_from_the_cached_result_set(project, runner):
+    """Test that following pages are sliced from the first page's result set without running dbt."""
+    build = lambda output: ls_items(output, "json", False)
+    names = []
+    cursor = None
+    for _ in range(3):
+        result = await list_page(COMMAND, str(project), None, runner, build, page_size=2, cursor=cursor)
+        assert result["success"]
+        page = result["output"]
+        assert page["total"] == 5
+        names.extend(item["name"] for item in page["items"])
+        cursor = page["next_cursor"]
+
+    assert names == [f"model_{i}" for i in range(5)]
+    assert cursor is None
+    runner.assert_called_once()
+
+    # The same listing with other settings is a different result set
+    await list_page(COMMAND, str(project), None, runner, lambda output: ls_items(output, "json", True),
+                    view=True, page_size=2)
+    assert runner.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cursor_expires_when_the_project_changes(project, runner):
+    """Test that a cursor isn't used for a result set of another project state."""
+    build = lambda output: ls_items(output, "json", False)
+    first = await list_page(COMMAND, str(project), None, runner, build, page_size=2)
+
+    (project / "target" / "manifest.json").write_text('{"nodes": {}}')
+    result = await list_page(COMMAND, str(project), None, runner, build, cursor=first["output"]["next_cursor"])
+    assert not result["success"]
+    assert "expired" in result["error"]
+
+    result = await list_page(COMMAND, str(project), None, runner, build, page_size=0)
+    assert not result["success"]
+    assert runner.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_command_is_returned(project):
+    """Test that a failing dbt command is returned as is and nothing is cached."""
+    failure = {"success": False, "output": "Compilation Error", "error": "Command failed", "returncode": 1}
+    runner = AsyncMock(return_value=failure)
+    build = lambda output: ls_items(output, "json", False)
+    assert await list_page(COMMAND, str(project), None, runner, build, page_size=2) is failure
+    await list_page(COMMAND, str(project), None, runner, build, page_size=2)
+    assert runner.call_count == 2
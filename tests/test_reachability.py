@@ -0,0 +1,134 @@
+"""
+Tests for the reachability module.
+"""
+
+import json
+import time
+import threading
+import pytest
+from unittest.mock import patch
+
+from src.config import config
+from src.manifest import CompactManifest, ManifestCache
+from src.node_store import NodeStore, NodeStoreBuilder
+from src.lineage import lineage, traverse
+from src.reachability import ReachabilityIndex
+from tests.test_lineage import MANIFEST
+
+
+@pytest.fixture
+def store():
+    """Build a node store for the lineage tests' manifest."""
+    return NodeStore.from_manifest(MANIFEST)
+
+
+def test_closures_match_traversal(store):
+    """Test that the bitsets hold exactly the nodes a traversal reaches."""
+    index = ReachabilityIndex(store)
+    for node_id in range(len(store)):
+        assert sorted(index.node_ids(index.ancestors([node_id]))) == sorted(traverse(store, node_id, "upstream"))
+        assert sorted(index.node_ids(index.descendants([node_id]))) == sorted(traverse(store, node_id, "downstream"))
+
+    # Parents come before their children in the topological order
+    positions = {node_id: position for position, node_id in enumerate(index.order)}
+    for node_id in range(len(store)):
+        assert all(positions[parent] < positions[node_id] for parent in store.parents(node_id))
+
+
+def test_set_operations(store):
+    """Test unions, intersections and ancestor checks."""
+    index = ReachabilityIndex(store)
+    node = store.node_id
+
+    shared = index.ancestors([node("model.shop.orders")]) & index.ancestors([node("model.shop.customers")])
+    assert shared == 0
+    upstream_of_report = index.ancestors([node("model.shop.report")])
+    downstream_of_stg = index.descendants([node("model.shop.stg_orders")])
+    assert sorted(store.unique_ids[i] for i in index.node_ids(upstream_of_report & downstream_of_stg)) == [
+        "model.shop.order_items", "model.shop.orders"
+    ]
+    assert index.bits([node("model.shop.orders")]) & upstream_of_report
+
+    assert index.is_ancestor(node("source.shop.raw.orders"), node("model.shop.report"))
+    assert not index.is_ancestor(node("model.shop.report"), node("source.shop.raw.orders"))
+    assert not index.is_ancestor(node("model.shop.orders"), node("model.shop.customers"))
+
+
+def test_cycle_is_rejected():
+    """Test that a cyclic graph can't be indexed."""
+    builder = NodeStoreBuilder()
+    builder.add_parents("model.shop.a", ["model.shop.b"])
+    builder.add_parents("model.shop.b", ["model.shop.a"])
+    with pytest.raises(ValueError):
+        ReachabilityIndex(builder.build())
+
+
+def test_lineage_paths_with_index(store):
+    """Test that path queries give the same answers with the index."""
+    index = ReachabilityIndex(store)
+    for node, to in [("report", "stg_orders"), ("stg_orders", "report"), ("orders", "customers")]:
+        assert lineage(store, node, to=to, index=index)["paths"] == lineage(store, node, to=to)["paths"]
+
+
+def test_manifest_builds_index_lazily(tmp_path):
+    """Test that cached manifests build their index on first use, within the node limit."""
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps(MANIFEST))
+    cache = ManifestCache(CompactManifest.load)
+
+    manifest = cache.get(path)
+    assert manifest._reachability is None
+    with patch.dict(config, {"reachability_max_nodes": 1000}):
+        assert manifest.reachability is manifest.reachability is not None
+    assert manifest.memory_bytes == manifest.store.nbytes + manifest.reachability.nbytes
+
+    with patch.dict(config, {"reachability_max_nodes": 5}):
+        assert ManifestCache(CompactManifest.load).get(path).reachability is None
+    with patch.dict(config, {"reachability_max_nodes": 0}):
+        assert ManifestCache(CompactManifest.load).get(path).reachability is None
+
+
+def test_manifest_builds_index_once(tmp_path):
+    """Test that concurrent callers share a single reachability index."""
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps(MANIFEST))
+    manifest = ManifestCache(CompactManifest.load).get(path)
+
+    def build(store):
+        time.sleep(0.05)
+        return ReachabilityIndex(store)
+
+    with patch.dict(config, {"reachability_max_nodes": 1000}), \
+            patch("src.manifest.ReachabilityIndex", side_effect=build) as index_class:
+        threads = [threading.Thread(target=lambda: manifest.reachability) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    index_class.assert_called_once()
+    assert manifest.reachability is not None
+
+
+def test_index_is_charged_to_cache_budget(tmp_path):
+    """Test that building a reachability index can evict other manifests."""
+    paths = []
+    for name in ("a", "b"):
+        path = tmp_path / name / "manifest.json"
+        path.parent.mkdir()
+        path.write_text(json.dumps(MANIFEST))
+        paths.append(path)
+    cache = ManifestCache(CompactManifest.load)
+
+    first = cache.get(paths[0])
+    # Room for both node stores, but not for an index on top
+    index_bytes = ReachabilityIndex(first.store).nbytes
+    budget_mb = (2 * first.memory_bytes + index_bytes / 2) / (1024 * 1024)
+    with patch.dict(config, {"manifest_cache_max_mb": budget_mb, "reachability_max_nodes": 1000}):
+        second = cache.get(paths[1])
+        assert cache.paths() == [paths[0].resolve(), paths[1].resolve()]
+
+        assert first.reachability is not None
+        assert cache.paths() == [paths[0].resolve()]
+        assert cache.total_bytes == first.memory_bytes
+        assert second.reachability is not None
@@ -0,0 +1,147 @@
+"""
+Tests for the runner module and the dbt worker process.
+"""
+
+import os
+import sys
+import asyncio
+import pytest
+
+from src import dbt_worker
+from src.config import config, set_config
+from src.runner import DbtWorker, WorkerPool, resolve_dbt_python
+
+
+@pytest.fixture
+def reset_config():
+    """Reset the config after each test."""
+    original_config = config.copy()
+    yield
+    config.clear()
+    config.update(original_config)
+
+
+@pytest.fixture
+def fake_dbt(tmp_path, monkeypatch):
+    """Install a fake dbt package whose dbtRunner echoes its arguments."""
+    package = tmp_path / "fake_dbt" / "dbt" / "cli"
+    package.mkdir(parents=True)
+    (package.parent / "__init__.py").write_text("")
+    (package / "__init__.py").write_text("")
+    (package / "main.py").write_text(
+        "import os, sys\n"
+        "class Result:\n"
+        "    def __init__(self, success, exception=None):\n"
+        "        self.success = success\n"
+        "        self.exception = exception\n"
+        "class dbtRunner:\n"
+        "    def invoke(self, args):\n"
+        "        print(' '.join(args))\n"
+        "        print(os.environ.get('FAKE_VAR', ''), file=sys.stderr)\n"
+        "        if args[0] == 'boom':\n"
+        "            return Result(False, RuntimeError('boom'))\n"
+        "        return Result(args[0] != 'fail')\n"
+    )
+    monkeypatch.setenv("PYTHONPATH", str(tmp_path / "fake_dbt"))
+    return tmp_path
+
+
+def test_resolve_dbt_python(reset_config, tmp_path):
+    """Test resolving the dbt interpreter from config and shebang lines."""
+    set_config("dbt_python", "/configured/python")
+    assert resolve_dbt_python("dbt") == "/configured/python"
+
+    set_config("dbt_python", None)
+    dbt_script = tmp_path / "dbt"
+    dbt_script.write_text(f"#!{sys.executable}\nprint('dbt')\n")
+    dbt_script.chmod(0o755)
+    assert resolve_dbt_python(str(dbt_script)) == sys.executable
+
+    # Fall back to the current interpreter when the shebang is unusable
+    dbt_script.write_text("#!/no/such/python\n")
+    assert resolve_dbt_python(str(dbt_script)) == sys.executable
+
+
+def test_run_command_exit_codes():
+    """Test that the worker mirrors the dbt CLI exit codes."""
+    class Result:
+        def __init__(self, success, exception=None):
+            self.success = success
+            self.exception = exception
+
+    class Runner:
+        def invoke(self, args):
+            print("running", args[0])
+            return {
+                "ok": Result(True),
+                "fail": Result(False),
+                "boom": Result(False, RuntimeError("boom"))
+            }[args[0]]
+
+    response = dbt_worker.run_command(Runner, {"id": 1, "args": ["ok"], "cwd": os.getcwd()})
+    assert response["returncode"] == 0
+    assert response["stdout"] == "running ok\n"
+    assert dbt_worker.run_command(Runner, {"id": 2, "args": ["fail"]})["returncode"] == 1
+
+    response = dbt_worker.run_command(Runner, {"id": 3, "args": ["boom"]})
+    assert response["returncode"] == 2
+    assert "RuntimeError: boom" in response["stderr"]
+
+
+@pytest.mark.asyncio
+async def test_worker_round_trip(fake_dbt):
+    """Test running several commands through one long-lived worker."""
+    worker = DbtWorker(sys.executable)
+    try:
+        env = dict(os.environ, FAKE_VAR="from_env")
+        stdout, stderr, returncode = await worker.run(["ls", "--quiet"], str(fake_dbt), env)
+        assert stdout == "ls --quiet\n"
+        assert stderr == "from_env\n"
+        assert returncode == 0
+
+        pid = worker.process.pid
+        _, _, returncode = await worker.run(["fail"], str(fake_dbt), env)
+        assert returncode == 1
+        assert worker.process.pid == pid
+        assert worker.commands_run == 2
+    finally:
+        await worker.close()
+    assert not worker.alive
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_recycles_workers(fake_dbt, reset_config):
+    """Test that pooled workers are reused, recycled and evicted."""
+    set_config("worker_pool_size", 1)
+    set_config("worker_max_commands", 2)
+    pool = WorkerPool(sys.executable)
+    try:
+        env = dict(os.environ)
+        await pool.run(["ls"], str(fake_dbt), env)
+        first_pid = pool.workers[0].process.pid
+        await pool.run(["ls"], str(fake_dbt), env)
+
+        # The worker hit worker_max_commands and was replaced in the background
+        stdout, _, _ = await pool.run(["ls"], str(fake_dbt), env)
+        assert stdout == "ls\n"
+        assert pool.size == 1
+        assert pool.workers[0].process.pid != first_pid
+
+        await pool.evict_idle(idle_timeout=0)
+        assert pool.size == 0
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_runs_commands_concurrently(fake_dbt, reset_config):
+    """Test that a pool dispatches concurrent commands to separate workers."""
+    set_config("worker_pool_size", 2)
+    pool = WorkerPool(sys.executable)
+    try:
+        env = dict(os.environ)
+        results = await asyncio.gather(*(pool.run(["ls", str(i)], str(fake_dbt), env) for i in range(4)))
+        assert [stdout for stdout, _, _ in results] == [f"ls {i}\n" for i in range(4)]
+        assert pool.size == 2
+    finally:
+        await pool.close()
@@ -0,0 +1,188 @@
+"""
+Tests for the scheduler module.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import patch
+
+from src.config import config
+from src.scheduler import CommandScheduler, command_priority, PRIORITY_READ, PRIORITY_BUILD
+
+
+def test_command_priority():
+    """Test that read-only commands are prioritized over builds."""
+    assert command_priority(["ls", "--quiet"]) == PRIORITY_READ
+    assert command_priority(["show", "-s", "model"]) == PRIORITY_READ
+    assert command_priority(["compile"]) == PRIORITY_READ
+    assert command_priority(["run"]) == PRIORITY_BUILD
+    assert command_priority(["build"]) == PRIORITY_BUILD
+
+
+async def run_job(scheduler, project, command, order, hold, exclusive=True):
+    """Run a fake command that records its start and holds its slot."""
+    async with scheduler.slot(project, command, exclusive) as stats:
+        order.append(command[0])
+        await hold.wait()
+        return stats
+
+
+@pytest.mark.asyncio
+async def test_per_project_limit_and_priority(tmp_path):
+    """Test that a busy project queues commands and serves reads first."""
+    scheduler = CommandScheduler()
+    order = []
+    hold = asyncio.Event()
+
+    with patch.dict(config, {"max_concurrent_commands": 4, "max_concurrent_per_project": 1}):
+        first = asyncio.create_task(run_job(scheduler, str(tmp_path), ["build"], order, hold))
+        await asyncio.sleep(0)
+        queued = [
+            asyncio.create_task(run_job(scheduler, str(tmp_path), [name], order, hold))
+            for name in ("run", "compile", "ls")
+        ]
+        await asyncio.sleep(0)
+
+        assert order == ["build"]
+        assert scheduler.queue_depth == 3
+
+        hold.set()
+        stats = await asyncio.gather(first, *queued)
+
+    # Reads were served before the queued run, each in arrival order
+    assert order == ["build", "compile", "ls", "run"]
+    assert stats[0]["queue_depth"] == 0
+    assert stats[3]["queue_depth"] == 2
+    assert stats[3]["priority"] == "read"
+    assert scheduler.stats() == {"running": 0, "running_per_project": {}, "exclusive_projects": [], "queued": 0}
+
+
+@pytest.mark.asyncio
+async def test_busy_project_does_not_block_others(tmp_path):
+    """Test that a queued command for a busy project doesn't hold up other projects."""
+    scheduler = CommandScheduler()
+    order = []
+    hold = asyncio.Event()
+    project_a = tmp_path / "a"
+    project_b = tmp_path / "b"
+
+    with patch.dict(config, {"max_concurrent_commands": 3, "max_concurrent_per_project": 1}):
+        tasks = [asyncio.create_task(run_job(scheduler, str(project_a), ["build"], order, hold))]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(run_job(scheduler, str(project_a), ["run"], order, hold)))
+        tasks.append(asyncio.create_task(run_job(scheduler, str(project_b), ["seed"], order, hold)))
+        await asyncio.sleep(0)
+
+        assert order == ["build", "seed"]
+        assert scheduler.stats()["running"] == 2
+
+        hold.set()
+        await asyncio.gather(*tasks)
+
+    assert order == ["build", "seed", "run"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_is_removed(tmp_path):
+    """Test that cancelling a queued command frees its place in the queue."""
+    scheduler = CommandScheduler()
+    order = []
+    hold = asyncio.Event()
+
+    with patch.dict(config, {"max_concurrent_commands": 1, "max_concurrent_per_project": 1}):
+        first = asyncio.create_task(run_job(scheduler, str(tmp_path), ["run"], order, hold))
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(run_job(scheduler, str(tmp_path), ["ls"], order, hold))
+        await asyncio.sleep(0)
+
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+        hold.set()
+        await first
+
+    assert order == ["run"]
+    assert scheduler.stats()["running"] == 0
+    assert scheduler.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_isolated_commands_run_alongside_exclusive(tmp_path):
+    """Test that non-exclusive commands share a project with an exclusive one."""
+    scheduler = CommandScheduler()
+    order = []
+    hold = asyncio.Event()
+
+    with patch.dict(config, {"max_concurrent_commands": 4, "max_concurrent_per_project": 4}):
+        tasks = [asyncio.create_task(run_job(scheduler, str(tmp_path), ["build"], order, hold))]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(run_job(scheduler, str(tmp_path), ["run"], order, hold)))
+        tasks.append(asyncio.create_task(run_job(scheduler, str(tmp_path), ["ls"], order, hold, exclusive=False)))
+        tasks.append(asyncio.create_task(run_job(scheduler, str(tmp_path), ["show"], order, hold, exclusive=False)))
+        await asyncio.sleep(0)
+
+        # Isolated reads share the project with the build but not with the waiting run
+        assert order == ["build"]
+        tasks.append(asyncio.create_task(run_job(scheduler, str(tmp_path), ["compile"], order, hold, exclusive=False)))
+        await asyncio.sleep(0)
+        assert order == ["build"]
+        assert scheduler.stats()["exclusive_projects"] == [str(tmp_path.resolve())]
+
+        hold.set()
+        await asyncio.gather(*tasks)
+
+    assert order == ["build", "run", "ls", "show", "compile"]
+
+
+@pytest.mark.asyncio
+async def test_isolated_commands_admitted_before_exclusive_waits(tmp_path):
+    """Test that isolated commands run alongside an exclusive one while nothing else waits."""
+    scheduler = CommandScheduler()
+    order = []
+    hold = asyncio.Event()
+
+    with patch.dict(config, {"max_concurrent_commands": 4, "max_concurrent_per_project": 4}):
+        tasks = [asyncio.create_task(run_job(scheduler, str(tmp_path), ["build"], order, hold))]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(run_job(scheduler, str(tmp_path), ["ls"], order, hold, exclusive=False)))
+        tasks.append(asyncio.create_task(run_job(scheduler, str(tmp_path), ["show"], order, hold, exclusive=False)))
+        await asyncio.sleep(0)
+
+        assert order == ["build", "ls", "show"]
+
+        hold.set()
+        await asyncio.gather(*tasks)
+
+
+@pytest.mark.asyncio
+async def test_build_is_not_starved_by_continuous_reads(tmp_path):
+    """Test that reads arriving after a queued build don't overtake it."""
+    scheduler = CommandScheduler()
+    order = []
+    holds = [asyncio.Event() for _ in range(4)]
+    build_hold = asyncio.Event()
+
+    with patch.dict(config, {"max_concurrent_commands": 4, "max_concurrent_per_project": 1}):
+        tasks = [asyncio.create_task(run_job(scheduler, str(tmp_path), ["ls"], order, holds[0], exclusive=False))]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(run_job(scheduler, str(tmp_path), ["build"], order, build_hold)))
+        await asyncio.sleep(0)
+
+        # Each read finishes only once the next one is queued behind the build
+        for hold in holds[1:]:
+            tasks.append(asyncio.create_task(run_job(scheduler, str(tmp_path), ["show"], order, hold, exclusive=False)))
+            await asyncio.sleep(0)
+        holds[0].set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        assert order == ["ls", "build"]
+        assert scheduler.queue_depth == 3
+
+        build_hold.set()
+        for hold in holds:
+            hold.set()
+        await asyncio.gather(*tasks)
+
+    assert order == ["ls", "build", "show", "show", "show"]
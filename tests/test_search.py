@@ -0,0 +1,236 @@
+"""
+Tests for the search module.
+"""
+
+import os
+import json
+import time
+import threading
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.manifest import CompactManifest, ManifestCache
+from src.search import SearchIndex, SearchIndexCache, search_project, tokenize
+
+
+def model(name, description="", columns=None, tags=(), raw_code="select 1", checksum=None):
+    """Build a manifest model."""
+    return {
+        "name": name, "resource_type": "model", "package_name": "shop",
+        "original_file_path": f"models/{name}.sql", "description": description, "tags": list(tags),
+        "columns": {column: {"name": column, "description": text} for column, text in (columns or {}).items()},
+        "raw_code": raw_code, "checksum": {"name": "sha256", "checksum": checksum or name},
+        "depends_on": {"nodes": []},
+    }
+
+
+MANIFEST = {
+    "metadata": {"project_name": "shop"},
+    "nodes": {
+        "model.shop.customers": model(
+            "customers", "One row per customer.",
+            columns={"customer_id": "Primary key", "customer_lifetime_value": "Total revenue of the customer"},
+            tags=["core"],
+        ),
+        "model.shop.orders": model(
+            "orders", "One row per order.", columns={"order_id": "Primary key", "amount": "Order value"},
+            raw_code="select * from {{ ref('stg_orders') }} join {{ ref('customers') }} using (customer_id)",
+        ),
+        "model.shop.stg_payments": model("stg_payments", "Payments, renamed.", tags=["staging"]),
+        "test.shop.not_null_customers_customer_id": {
+            "name": "not_null_customers_customer_id", "resource_type": "test", "package_name": "shop",
+            "original_file_path": "models/schema.yml", "depends_on": {"nodes": ["model.shop.customers"]},
+        },
+    },
+    "sources": {
+        "source.shop.raw.payments": {
+            "name": "payments", "resource_type": "source", "package_name": "shop", "source_name": "raw",
+            "original_file_path": "models/sources.yml", "description": "Raw payments from Stripe.", "columns": {},
+        },
+    },
+    "macros": {"macro.shop.cents": {"name": "cents", "package_name": "shop"}},
+}
+
+CATALOG = {
+    "metadata": {},
+    "nodes": {
+        "model.shop.stg_payments": {
+            "columns": {
+                "PAYMENT_METHOD": {"name": "PAYMENT_METHOD", "type": "TEXT", "index": 1, "comment": "Card or bank transfer"},
+            },
+        },
+    },
+    "sources": {},
+}
+
+
+@pytest.fixture
+def manifest_path(tmp_path):
+    """Write the test manifest into a target directory."""
+    path = tmp_path / "target" / "manifest.json"
+    path.parent.mkdir()
+    path.write_text(json.dumps(MANIFEST))
+    return path
+
+
+def test_tokenize():
+    """Test that identifiers are split and simple plurals folded."""
+    assert tokenize("customer_lifetime_value") == ["customer", "lifetime", "value"]
+    assert tokenize("Customers' Categories, CLASS") == ["customer", "category", "class"]
+    assert tokenize(None) == []
+
+
+def test_search_ranks_fields(manifest_path):
+    """Test that matches are ranked, with the fields and columns that matched."""
+    index = SearchIndex()
+    assert index.update(manifest_path) == (5, 0)
+
+    results = index.search("customer lifetime value")
+    assert results[0]["unique_id"] == "model.shop.customers"
+    assert results[0]["matched"] == ["name", "columns", "description", "column_descriptions"]
+    # Columns matching more of the query come first
+    assert results[0]["columns"] == ["customer_lifetime_value", "customer_id"]
+    assert results[0]["description"] == "One row per customer."
+    # orders only mentions customers in its SQL
+    assert [result["name"] for result in results] == ["customers", "orders"]
+    assert results[1]["matched"] == ["column_descriptions", "code"]
+
+    assert [result["name"] for result in index.search("payments")] == ["payments", "stg_payments"]
+    assert [result["name"] for result in index.search("payments", resource_types=["source"])] == ["payments"]
+    assert [result["name"] for result in index.search("staging")] == ["stg_payments"]
+    assert index.search("nothing matches") == []
+    assert len(index.search("customer", limit=1)) == 1
+
+
+def test_search_excludes_tests_unless_asked(manifest_path):
+    """Test that tests are only returned when their resource type is requested."""
+    index = SearchIndex()
+    index.update(manifest_path)
+
+    assert "test" not in [result["resource_type"] for result in index.search("not null customer")]
+    assert [result["resource_type"] for result in index.search("not null customer", resource_types=["test"])] == [
+        "test"
+    ]
+
+
+def test_search_uses_catalog(manifest_path):
+    """Test that columns of the catalog are searched along with the manifest's."""
+    (manifest_path.parent / "catalog.json").write_text(json.dumps(CATALOG))
+    index = SearchIndex()
+    index.update(manifest_path, manifest_path.parent / "catalog.json")
+
+    results = index.search("payment method")
+    assert results[0]["unique_id"] == "model.shop.stg_payments"
+    assert results[0]["columns"] == ["payment_method"]
+    assert index.search("bank transfer")[0]["name"] == "stg_payments"
+
+
+def test_update_reindexes_changed_resources(manifest_path):
+    """Test that only resources whose checksum or documentation changed are indexed again."""
+    index = SearchIndex()
+    index.update(manifest_path)
+    unchanged = index.documents["model.shop.orders"]
+
+    manifest = json.loads(json.dumps(MANIFEST))
+    manifest["nodes"]["model.shop.customers"]["columns"]["churn_risk"] = {"name": "churn_risk", "description": ""}
+    manifest["nodes"]["model.shop.stg_payments"]["raw_code"] = "select refund_id from refunds"
+    manifest["nodes"]["model.shop.stg_payments"]["checksum"]["checksum"] = "changed"
+    del manifest["sources"]["source.shop.raw.payments"]
+    manifest_path.write_text(json.dumps(manifest))
+
+    assert index.update(manifest_path) == (2, 1)
+    assert index.documents["model.shop.orders"] is unchanged
+    assert index.search("churn")[0]["name"] == "customers"
+    assert index.search("refund")[0]["name"] == "stg_payments"
+    assert [result["name"] for result in index.search("stripe")] == []
+    assert "stripe" not in index.postings
+
+
+def test_cache_updates_when_files_change(manifest_path):
+    """Test that the cached index is updated when the manifest or the catalog changes."""
+    cache = SearchIndexCache()
+    assert cache.search(manifest_path, "lifetime value")[0]["unique_id"] == "model.shop.customers"
+
+    with patch.object(SearchIndex, "update", return_value=(0, 0)) as update:
+        cache.search(manifest_path, "lifetime value")
+        update.assert_not_called()
+
+        (manifest_path.parent / "catalog.json").write_text(json.dumps(CATALOG))
+        cache.search(manifest_path, "lifetime value")
+        update.assert_called_once_with(manifest_path.resolve(), manifest_path.parent.resolve() / "catalog.json")
+
+
+def test_cache_search_waits_for_updates(manifest_path):
+    """Test that a search doesn't run on an index while it is being updated."""
+    cache = SearchIndexCache()
+    cache.search(manifest_path, "customers")
+    calls = []
+    updating = threading.Event()
+
+    def update(index, *args):
+        updating.set()
+        time.sleep(0.1)
+        calls.append("update")
+        return 0, 0
+
+    def search(index, *args):
+        calls.append("search")
+        return []
+
+    with patch.object(SearchIndex, "update", update), patch.object(SearchIndex, "search", search):
+        (manifest_path.parent / "catalog.json").write_text(json.dumps(CATALOG))
+        thread = threading.Thread(target=cache.search, args=(manifest_path, "orders"))
+        thread.start()
+        updating.wait()
+        assert cache.search(manifest_path, "customers") == []
+        thread.join()
+
+    assert calls == ["update", "search", "search"]
+
+
+def test_cache_drops_indexes_of_uncached_manifests(manifest_path, tmp_path):
+    """Test that indexes are only kept while their manifest is in the manifest cache."""
+    manifests = ManifestCache(CompactManifest.load)
+    cache = SearchIndexCache(manifests)
+    other_path = tmp_path / "other" / "manifest.json"
+    other_path.parent.mkdir()
+    other_path.write_text(manifest_path.read_text())
+
+    manifests.get(manifest_path)
+    manifests.get(other_path)
+    cache.search(manifest_path, "customers")
+    cache.search(other_path, "customers")
+    assert set(cache._indexes) == {manifest_path.resolve(), other_path.resolve()}
+
+    manifests.invalidate(manifest_path)
+    cache.search(other_path, "customers")
+    assert set(cache._indexes) == {other_path.resolve()}
+
+
+@pytest.fixture
+def project(manifest_path):
+    """Create a project whose manifest is newer than its files."""
+    project_dir = manifest_path.parent.parent
+    (project_dir / "models").mkdir()
+    for name in ("customers", "orders", "stg_payments"):
+        (project_dir / "models" / f"{name}.sql").write_text("select 1")
+    (project_dir / "models" / "sources.yml").write_text("")
+    (project_dir / "models" / "schema.yml").write_text("")
+    future = time.time_ns() + 10_000_000_000
+    os.utime(manifest_path, ns=(future, future))
+    return project_dir
+
+
+@pytest.mark.asyncio
+async def test_search_project(project):
+    """Test that a fresh project is searched without running dbt."""
+    with patch("src.command.execute_dbt_command", new_callable=AsyncMock) as mock_execute:
+        result = await search_project("lifetime value", str(project))
+
+    mock_execute.assert_not_called()
+    assert result["success"] is True
+    assert result["backend"] == "manifest"
+    assert result["output"][0]["unique_id"] == "model.shop.customers"
+
+    result = await search_project("customers", str(project), limit=0)
+    assert result["success"] is False
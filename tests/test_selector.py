@@ -0,0 +1,263 @@
+"""
+Tests for the selector module.
+"""
+
+import os
+import json
+import time
+import pytest
+from unittest.mock import patch
+
+from src.config import config
+from src.manifest import CompactManifest, ManifestCache
+from src.selector import (
+    SelectorEngine,
+    UnsupportedSelection,
+    list_from_manifest,
+    parse_criterion,
+    parse_list_command,
+)
+from src.command import execute_dbt_command
+
+
+def model(name, path, depends_on=(), tags=(), materialized="view"):
+    """Build a model node."""
+    return {
+        "unique_id": f"model.shop.{name}",
+        "name": name,
+        "alias": name,
+        "resource_type": "model",
+        "package_name": "shop",
+        "original_file_path": path,
+        "fqn": ["shop"] + path[len("models/"):-len(".sql")].split("/"),
+        "tags": list(tags),
+        "config": {"materialized": materialized, "enabled": True},
+        "depends_on": {"nodes": list(depends_on)},
+    }
+
+
+def generic_test(name, tested):
+    """Build a generic test node."""
+    return {
+        "unique_id": f"test.shop.{name}",
+        "name": name,
+        "resource_type": "test",
+        "package_name": "shop",
+        "original_file_path": "models/schema.yml",
+        "fqn": ["shop", name],
+        "tags": [],
+        "config": {"materialized": "test"},
+        "depends_on": {"nodes": [tested]},
+    }
+
+
+NODES = [
+    model("stg_customers", "models/staging/stg_customers.sql", ["source.shop.raw.customers"], tags=["staging"]),
+    model("stg_orders", "models/staging/stg_orders.sql", ["source.shop.raw.orders"], tags=["staging"]),
+    model("customers", "models/marts/customers.sql",
+          ["model.shop.stg_customers", "model.shop.stg_orders"], tags=["nightly"], materialized="table"),
+    model("orders", "models/marts/orders.sql", ["model.shop.stg_orders"], materialized="table"),
+    model("report", "models/marts/report.sql", ["model.shop.customers"]),
+    generic_test("not_null_customers_id", "model.shop.customers"),
+]
+
+SOURCES = [
+    {
+        "unique_id": f"source.shop.raw.{name}",
+        "name": name,
+        "source_name": "raw",
+        "resource_type": "source",
+        "package_name": "shop",
+        "original_file_path": "models/sources.yml",
+        "fqn": ["shop", "raw", name],
+        "tags": [],
+        "config": {"enabled": True},
+    }
+    for name in ("customers", "orders")
+]
+
+
+def build_manifest():
+    """Build a manifest with parent and child maps."""
+    nodes = {node["unique_id"]: node for node in NODES}
+    sources = {source["unique_id"]: source for source in SOURCES}
+    parent_map = {unique_id: node["depends_on"]["nodes"] for unique_id, node in nodes.items()}
+    parent_map.update({unique_id: [] for unique_id in sources})
+    child_map = {unique_id: [] for unique_id in parent_map}
+    for child, parents in parent_map.items():
+        for parent in parents:
+            child_map[parent].append(child)
+    return {
+        "metadata": {"project_name": "shop"},
+        "nodes": nodes,
+        "sources": sources,
+        "macros": {},
+        "parent_map": parent_map,
+        "child_map": child_map,
+        "selectors": {},
+    }
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Create a project whose manifest is newer than its files."""
+    for path in {node["original_file_path"] for node in NODES + SOURCES}:
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text("select 1")
+    (tmp_path / "dbt_project.yml").write_text("name: shop\n")
+
+    manifest_path = tmp_path / "target" / "manifest.json"
+    manifest_path.parent.mkdir()
+    manifest_path.write_text(json.dumps(build_manifest()))
+    future = time.time_ns() + 10_000_000_000
+    os.utime(manifest_path, ns=(future, future))
+    return tmp_path
+
+
+@pytest.fixture
+def engine(project):
+    """Create a selector engine for the project."""
+    return SelectorEngine(ManifestCache(CompactManifest.load).get(project / "target" / "manifest.json"), str(project))
+
+
+def names(engine, select, exclude=()):
+    """Select and return the names of the selected resources."""
+    selected, _ = engine.select(list(select), list(exclude))
+    return sorted(unique_id.split(".", 2)[2] for unique_id in selected)
+
+
+def test_parse_criterion():
+    """Test parsing of graph operators and methods."""
+    criterion = parse_criterion("2+config.materialized:table+1")
+    assert (criterion.method, criterion.value) == ("config.materialized", "table")
+    assert (criterion.parents, criterion.parents_depth) == (True, 2)
+    assert (criterion.children, criterion.children_depth) == (True, 1)
+
+    assert parse_criterion("customers").method == "fqn"
+    assert parse_criterion("models/marts").method == "path"
+    assert parse_criterion("customers.sql").method == "file"
+    assert parse_criterion("@customers").childrens_parents
+
+    with pytest.raises(UnsupportedSelection):
+        parse_criterion("@+customers")
+
+
+def test_select_by_name_and_graph_operators(engine):
+    """Test name selection, graph operators and eager test selection."""
+    assert names(engine, ["customers"]) == ["customers", "not_null_customers_id"]
+    assert names(engine, ["orders"]) == ["orders"]
+    assert names(engine, ["1+orders"]) == ["orders", "stg_orders"]
+    assert names(engine, ["+orders"]) == ["orders", "raw.orders", "stg_orders"]
+    assert names(engine, ["stg_customers+"]) == [
+        "customers", "not_null_customers_id", "report", "stg_customers"
+    ]
+    assert names(engine, ["stg_customers+1"]) == ["customers", "not_null_customers_id", "stg_customers"]
+    assert names(engine, ["@stg_customers"]) == [
+        "customers", "not_null_customers_id", "raw.customers", "raw.orders",
+        "report", "stg_customers", "stg_orders"
+    ]
+
+
+def test_select_by_method(engine):
+    """Test the supported selection methods."""
+    assert names(engine, ["tag:staging"]) == ["stg_customers", "stg_orders"]
+    assert names(engine, ["tag:night*"]) == ["customers", "not_null_customers_id"]
+    assert names(engine, ["path:models/staging"]) == ["stg_customers", "stg_orders"]
+    assert names(engine, ["models/marts/orders.sql"]) == ["orders"]
+    assert names(engine, ["file:report.sql"]) == ["report"]
+    assert names(engine, ["resource_type:source"]) == ["raw.customers", "raw.orders"]
+    assert names(engine, ["config.materialized:table"]) == ["customers", "not_null_customers_id", "orders"]
+    assert names(engine, ["source:raw.orders"]) == ["raw.orders"]
+    assert names(engine, ["package:this"]) == names(engine, [])
+    assert names(engine, ["shop.marts.*"]) == ["customers", "not_null_customers_id", "orders", "report"]
+
+    with pytest.raises(UnsupportedSelection):
+        names(engine, ["state:modified"])
+
+
+def test_graph_operators_without_reachability_index(engine):
+    """Test that unlimited graph operators give the same results by traversal."""
+    selectors = ["+customers", "stg_orders+", "@stg_customers", "+report+", "1+orders+"]
+    with_index = [names(engine, [selector]) for selector in selectors]
+    assert engine.manifest.reachability is not None
+
+    with patch.dict(config, {"reachability_max_nodes": 0}):
+        engine = SelectorEngine(ManifestCache(CompactManifest.load).get(engine.manifest.path), str(engine.project_path))
+        assert engine.manifest.reachability is None
+        assert [names(engine, [selector]) for selector in selectors] == with_index
+
+
+def test_union_intersection_and_exclude(engine):
+    """Test unions, intersections and exclusions."""
+    assert names(engine, ["orders report"]) == ["orders", "report"]
+    assert names(engine, ["orders", "report"]) == ["orders", "report"]
+    assert names(engine, ["config.materialized:table,tag:nightly"]) == ["customers", "not_null_customers_id"]
+    assert names(engine, ["path:models/marts"], ["customers"]) == ["orders", "report"]
+
+    _, unmatched = engine.select(["orders missing"], [])
+    assert unmatched == ["missing"]
+
+
+def test_parse_list_command():
+    """Test parsing of ls options, and rejection of unsupported ones."""
+    request = parse_list_command(
+        ["ls", "-s", "customers", "orders", "--exclude=report", "--resource-type", "model", "--output", "json", "--quiet"]
+    )
+    assert request.select == ["customers", "orders"]
+    assert request.exclude == ["report"]
+    assert request.resource_types == ["model"]
+    assert request.output == "json"
+    assert request.quiet
+
+    with pytest.raises(UnsupportedSelection):
+        parse_list_command(["ls", "--selector", "nightly"])
+    with pytest.raises(UnsupportedSelection):
+        parse_list_command(["ls", "--state", "prod-artifacts"])
+
+
+@pytest.mark.asyncio
+async def test_list_from_manifest(project):
+    """Test that ls is answered from a fresh manifest in dbt's output formats."""
+    result = await list_from_manifest(
+        ["ls", "-s", "+customers", "--resource-type", "model", "--output", "json", "--quiet"], str(project)
+    )
+    assert result["success"] is True
+    assert result["backend"] == "manifest"
+    assert [item["name"] for item in result["output"]] == ["customers", "stg_customers", "stg_orders"]
+    assert set(result["output"][0]) == {
+        "alias", "name", "package_name", "depends_on", "tags", "config",
+        "resource_type", "original_file_path", "unique_id"
+    }
+
+    result = await list_from_manifest(["ls", "-s", "source:raw", "--output", "selector", "--quiet"], str(project))
+    assert result["output"] == "source:shop.raw.customers\nsource:shop.raw.orders\n"
+
+    result = await list_from_manifest(["ls", "-s", "missing"], str(project))
+    assert "does not match any enabled nodes" in result["output"]
+
+
+@pytest.mark.asyncio
+async def test_list_from_manifest_falls_back(project):
+    """Test that stale manifests and unsupported commands fall back to dbt."""
+    assert await list_from_manifest(["ls", "-s", "state:modified"], str(project)) is None
+    assert await list_from_manifest(["ls", "--selector", "nightly"], str(project)) is None
+
+    with patch.dict(config, {"manifest_selection": False}):
+        assert await list_from_manifest(["ls", "-s", "orders"], str(project)) is None
+
+    # A new model makes the manifest stale
+    new_model = project / "models" / "marts" / "new_model.sql"
+    new_model.write_text("select 1")
+    future = time.time_ns() + 20_000_000_000
+    os.utime(new_model.parent, ns=(future, future))
+    assert await list_from_manifest(["ls", "-s", "orders"], str(project)) is None
+
+
+@pytest.mark.asyncio
+@patch("asyncio.create_subprocess_exec")
+async def test_execute_dbt_command_uses_manifest_for_ls(mock_subprocess, project):
+    """Test that execute_dbt_command answers ls without spawning dbt."""
+    result = await execute_dbt_command(["ls", "-s", "orders", "--output", "name", "--quiet"], str(project))
+
+    assert result["output"] == "orders\n"
+    mock_subprocess.assert_not_called()
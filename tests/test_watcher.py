@@ -0,0 +1,128 @@
+"""
+Tests for the watcher module.
+"""
+
+import os
+import time
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src.config import config
+from src.watcher import InotifyMonitor, PollingMonitor, WatcherRegistry, _load_libc
+
+SETTINGS = {"watch_projects": True, "watch_debounce": 0.05, "watch_poll_interval": 0.05}
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Create a dbt project with a model."""
+    (tmp_path / "dbt_project.yml").write_text("name: shop\n")
+    (tmp_path / "models" / "staging").mkdir(parents=True)
+    (tmp_path / "models" / "staging" / "stg_orders.sql").write_text("select 1")
+    return tmp_path
+
+
+@pytest.fixture
+def runner():
+    """A command runner standing in for execute_dbt_command."""
+    return AsyncMock(return_value={"success": True, "output": "", "error": None, "returncode": 0})
+
+
+async def settle(seconds=0.3):
+    """Give the watcher time to notice changes and parse."""
+    await asyncio.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_disabled_by_default(project, runner):
+    """Test that projects aren't watched unless enabled."""
+    registry = WatcherRegistry()
+    assert registry.register(str(project), None, runner) is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(_load_libc() is None, reason="inotify is not available")
+async def test_inotify_parses_once_after_changes_settle(project, runner):
+    """Test that a burst of edits triggers a single background parse."""
+    registry = WatcherRegistry()
+    with patch.dict(config, SETTINGS):
+        watcher = registry.register(str(project), "/profiles", runner)
+        assert registry.register(str(project), "/profiles", runner) is watcher
+    try:
+        assert isinstance(watcher.monitor, InotifyMonitor)
+
+        for i in range(5):
+            (project / "models" / "staging" / "stg_orders.sql").write_text(f"select {i}")
+            await asyncio.sleep(0.01)
+        await settle()
+
+        runner.assert_called_once_with(["parse"], str(project.resolve()), "/profiles")
+    finally:
+        registry.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(_load_libc() is None, reason="inotify is not available")
+async def test_inotify_ignores_unwatched_files(project, runner):
+    """Test that files dbt doesn't parse, and the target directory, don't trigger a parse."""
+    registry = WatcherRegistry()
+    with patch.dict(config, SETTINGS):
+        watcher = registry.register(str(project), None, runner)
+    try:
+        (project / "models" / "staging" / ".stg_orders.sql.swp").write_text("")
+        (project / "target").mkdir()
+        (project / "target" / "manifest.json").write_text("{}")
+        (project / "README.txt").write_text("")
+        await settle()
+        runner.assert_not_called()
+
+        # Directories created later are watched too
+        (project / "models" / "marts").mkdir()
+        await settle()
+        runner.reset_mock()
+        (project / "models" / "marts" / "orders.sql").write_text("select 1")
+        await settle()
+        assert runner.call_count == 1
+        assert watcher.parses >= 1
+    finally:
+        registry.close()
+
+
+@pytest.mark.asyncio
+async def test_polling_fallback(project, runner):
+    """Test that changes are found by polling when inotify isn't available."""
+    registry = WatcherRegistry()
+    with patch.dict(config, SETTINGS), patch("src.watcher._load_libc", return_value=None):
+        watcher = registry.register(str(project), None, runner)
+    try:
+        assert isinstance(watcher.monitor, PollingMonitor)
+        await settle(0.15)
+        runner.assert_not_called()
+
+        (project / "dbt_project.yml").write_text("name: shop\nversion: 2\n")
+        await settle()
+        runner.assert_called_once_with(["parse"], str(project.resolve()), None)
+    finally:
+        registry.close()
+
+
+@pytest.mark.asyncio
+async def test_skips_parse_when_manifest_is_newer(project, runner):
+    """Test that no parse runs when another command already re-parsed the project."""
+    registry = WatcherRegistry()
+    with patch.dict(config, SETTINGS), patch("src.watcher._load_libc", return_value=None):
+        watcher = registry.register(str(project), None, runner)
+    try:
+        (project / "models" / "staging" / "stg_orders.sql").write_text("select 2")
+        manifest = project / "target" / "manifest.json"
+        manifest.parent.mkdir()
+        manifest.write_text("{}")
+        future = time.time_ns() + 10_000_000_000
+        os.utime(manifest, ns=(future, future))
+        await settle()
+
+        runner.assert_not_called()
+        assert watcher.parses == 0
+    finally:
+        registry.close()